@@ -7,12 +7,21 @@ from telegram.ext import Application, CommandHandler, CallbackQueryHandler
 from app.config.settings import settings
 from app.services.auth_service import AuthService
 from app.services.sheets_service import SheetsService
+from app.services.async_sheets_service import AsyncSheetsService
+from app.services.transaction_queue import TransactionQueue
 from app.services.report_service import ReportService
+from app.services.mirror_service import MirrorService
+from app.services.snapshot_service import SnapshotService
+from app.services.cache_service import TransactionCache
+from app.services.summary_service import SummaryStore
+from app.services.warmup_service import WarmupService
+from app.services.bundle_service import BundleService
 from app.services.gemini_service import GeminiService
 from app.services.query_parser_service import QueryParserService
 from app.services.capster_service import CapsterService
 from app.services.config_service import ConfigService
 from app.handlers.start import start_handler
+from app.handlers.report import annual_report_command
 from app.handlers.callback import callback_router
 from app.handlers.customer import add_customer_conv_handler
 from app.handlers.capster import add_capster_conv_handler, edit_capster_conv_handler
@@ -48,37 +57,61 @@ class BarbershopBot:
         # Instantiate services
         sheets_service_instance = SheetsService()
 
-        # Load config from sheets BEFORE other services that read constants
+        # Load config BEFORE other services that read constants: the config sheets in one
+        # batch request, or the local snapshot when Sheets is slow (reconciled by the warm-up)
         config_service_instance = ConfigService(sheets_service=sheets_service_instance)
-        config_service_instance.load_all_config()
-
-        report_service_instance = ReportService(sheets_service=sheets_service_instance)
+        config_service_instance.bootstrap()
+
+        # Local SQLite mirror of the transaction sheets; reports read from here, not from Sheets
+        # (closed months are served from memory-mapped snapshots)
+        self.mirror_service = MirrorService(sheets_service=sheets_service_instance, snapshots=SnapshotService())
+        # Per-month write-through partitions on top of the mirror; writes made through
+        # SheetsService push rows in / bump versions so reports stay fresh without rereads
+        transaction_cache = TransactionCache(self.mirror_service)
+        sheets_service_instance.on_transaction_written = transaction_cache.on_transaction_written
+        sheets_service_instance.on_transactions_edited = transaction_cache.invalidate_sheets
+        sheets_service_instance.on_config_written = transaction_cache.bump_config_version
+        # Closed-month summaries persisted for month-over-month / year-over-year comparisons
+        report_service_instance = ReportService(
+            sheets_service=sheets_service_instance, cache=transaction_cache,
+            summaries=SummaryStore(transaction_cache),
+        )
         gemini_service_instance = GeminiService()
 
         capster_service_instance = CapsterService(sheets_service=sheets_service_instance)
 
         self.app.bot_data['sheets_service'] = sheets_service_instance
+        self.app.bot_data['async_sheets_service'] = AsyncSheetsService(sheets_service_instance)
         self.app.bot_data['config_service'] = config_service_instance
         self.app.bot_data['report_service'] = report_service_instance
+        # Nightly precomputed owner summary (see send_daily_report_to_owners)
+        self.app.bot_data['bundle_service'] = BundleService(report_service_instance)
         self.app.bot_data['gemini_service'] = gemini_service_instance
         self.app.bot_data['capster_service'] = capster_service_instance
 
-        # Merge capsters from Google Sheets into AuthService (on top of .env)
-        capster_service_instance.load_capsters_to_auth()
-
-        # Build capster name list: merge transaction names + CapsterList real names + aliases
-        capster_list_from_transactions = report_service_instance.get_dynamic_capster_list()
-        all_capster_objects = capster_service_instance.get_all_capsters()
-        capster_list_from_sheets = []
-        for c in all_capster_objects:
-            capster_list_from_sheets.extend(c.all_names())  # includes alias
-        # Combine & deduplicate (case-insensitive), preserving original casing
-        seen_lower = set()
+        # Write-behind queue for sales: journal locally, flush to Sheets in batches.
+        # Starting the flusher also replays anything left from the previous run.
+        self.transaction_queue = TransactionQueue(
+            sheets_service=sheets_service_instance,
+            on_enqueue=transaction_cache.push_entry,
+            on_flush=self.mirror_service.confirm_flushed,
+        )
+        self.mirror_service.reconcile_pending(self.transaction_queue.pending_entries())
+        self.transaction_queue.start()
+        self.app.bot_data['transaction_queue'] = self.transaction_queue
+        self.app.bot_data['mirror_service'] = self.mirror_service
+        self.app.bot_data['transaction_cache'] = transaction_cache
+        self.mirror_service.start()
+
+        # Merge capsters from Google Sheets into AuthService (on top of .env);
+        # the CapsterList rows came with the config load
+        all_capster_objects = capster_service_instance.load_capsters_to_auth(config_service_instance.capster_records)
+
+        # Start with CapsterList real names + aliases; names found in transactions are merged
+        # in by the background warm-up (it reads the whole current year)
         capster_list = []
-        for name in capster_list_from_transactions + capster_list_from_sheets:
-            if name and name.lower() not in seen_lower:
-                seen_lower.add(name.lower())
-                capster_list.append(name)
+        for c in all_capster_objects:
+            capster_list.extend(c.all_names())  # includes alias
 
         if not capster_list:
             logger.warning("No capsters found, /tanya entity matching may be limited")
@@ -86,7 +119,7 @@ class BarbershopBot:
             logger.info(f"Query parser capster list: {capster_list}")
 
         # Build alias map for query filtering: name -> [all known names]
-        capster_alias_map = capster_service_instance.get_name_alias_map()
+        capster_alias_map = capster_service_instance.get_name_alias_map(all_capster_objects)
         logger.info(f"Capster alias map: {capster_alias_map}")
 
         # Inject alias map into ReportService for capster report filtering
@@ -99,6 +132,15 @@ class BarbershopBot:
             capster_alias_map=capster_alias_map
         )
 
+        # Partitions, transaction capster names and the common reports load in the background
+        # (JobQueue, see setup_scheduled_jobs) while the bot already accepts updates
+        self.app.bot_data['warmup_service'] = WarmupService(
+            report_service_instance,
+            capster_service=capster_service_instance,
+            config_service=config_service_instance,
+            query_parser=self.app.bot_data['query_parser_service'],
+        )
+
         # Log Gemini status
         if gemini_service_instance.is_available:
             logger.info("Gemini AI is available - /tanya will use AI-powered parsing and response")
@@ -116,6 +158,7 @@ class BarbershopBot:
     def _register_handlers(self):
         """Register all handlers"""
         self.app.add_handler(CommandHandler("start", start_handler))
+        self.app.add_handler(CommandHandler("laporan_tahunan", annual_report_command))
         self.app.add_handler(get_query_handler())
         self.app.add_handler(add_customer_conv_handler)
         self.app.add_handler(add_capster_conv_handler)
@@ -138,7 +181,12 @@ class BarbershopBot:
         logger.info(f"Owners: {len(settings.OWNER_IDS)}")
         logger.info(f"Admins: {len(settings.ADMIN_IDS)}")
 
-        self.app.run_polling(drop_pending_updates=True)
+        try:
+            self.app.run_polling(drop_pending_updates=True)
+        finally:
+            # Push any journaled sales to Sheets before exiting
+            self.transaction_queue.stop()
+            self.mirror_service.stop()
 
         '''
         rule add pyment : app/config/constants.py -> app/models/transaction.py ->
@@ -67,6 +67,8 @@ CB_BRANCH = 'branch'
 CB_CHANGE_BRANCH = 'change_branch'
 CB_MONTHLY_NAV = 'monthly_nav'
 CB_PROFIT_NAV = 'profit_nav'
+CB_REPORT_ANNUAL = 'report_annual'
+CB_ANNUAL_NAV = 'annual_nav'
 
 
 
@@ -185,6 +187,7 @@ REPORT_DAILY_HEADER = "📊 LAPORAN HARIAN - {date}"
 REPORT_WEEKLY_HEADER = "📈 LAPORAN MINGGUAN (7 Hari Terakhir)"
 REPORT_MONTHLY_HEADER = "📅 LAPORAN BULANAN - {month}"
 REPORT_PROFIT_HEADER = "💰 LAPORAN PROFIT BULANAN - {month}"
+REPORT_ANNUAL_HEADER = "📆 LAPORAN PROFIT TAHUNAN - {year}"
 
 REPORT_WEEKLY_BREAKDOWN_HEADER = 'LAPORAN MINGGUAN - {month}'
 REPORT_WEEK_DETAIL_HEADER = 'MINGGU {week_num} - {month}'
@@ -29,6 +29,35 @@ class Settings:
     # Google Sheets
     GOOGLE_SHEET_ID: str = os.getenv('GOOGLE_SHEET_ID', '')
     CREDENTIALS_FILE: str = 'credentials.json'
+    # Max worker threads running Sheets calls off the event loop
+    SHEETS_MAX_WORKERS: int = int(os.getenv('SHEETS_MAX_WORKERS', '4'))
+    # Sheets API request budget (per minute, separate for reads and writes), burst size
+    # and retries of rate-limited (429) or transient server errors
+    SHEETS_READS_PER_MINUTE: int = int(os.getenv('SHEETS_READS_PER_MINUTE', '60'))
+    SHEETS_WRITES_PER_MINUTE: int = int(os.getenv('SHEETS_WRITES_PER_MINUTE', '60'))
+    SHEETS_BURST: int = int(os.getenv('SHEETS_BURST', '10'))
+    SHEETS_MAX_RETRIES: int = int(os.getenv('SHEETS_MAX_RETRIES', '5'))
+    # Startup waits this long for the config sheets before starting from the local snapshot
+    CONFIG_BOOT_TIMEOUT: float = float(os.getenv('CONFIG_BOOT_TIMEOUT', '10'))
+
+    # Local data (write-behind journal, caches)
+    DATA_DIR: str = os.getenv('DATA_DIR', 'data')
+    # Journaled transactions are flushed every N seconds or once M rows are pending
+    WRITE_QUEUE_FLUSH_INTERVAL: int = int(os.getenv('WRITE_QUEUE_FLUSH_INTERVAL', '15'))
+    WRITE_QUEUE_MAX_BATCH: int = int(os.getenv('WRITE_QUEUE_MAX_BATCH', '20'))
+    # Local SQLite mirror of the transaction sheets is reconciled every N seconds
+    MIRROR_SYNC_INTERVAL: int = int(os.getenv('MIRROR_SYNC_INTERVAL', '60'))
+    # Closed (past) months are frozen into snapshots and re-checked against Sheets less often
+    CLOSED_MONTH_SYNC_INTERVAL: int = int(os.getenv('CLOSED_MONTH_SYNC_INTERVAL', '21600'))
+    # Cached month partitions are rebuilt after N seconds even without writes (safety net only)
+    CACHE_TTL: int = int(os.getenv('CACHE_TTL', '1800'))
+    # Past the TTL partitions are served while re-checked in the background, up to this age
+    CACHE_MAX_STALENESS: int = int(os.getenv('CACHE_MAX_STALENESS', '3600'))
+    # Memory budget of the cached month partitions (least recently used evicted; current month pinned)
+    CACHE_MAX_MB: int = int(os.getenv('CACHE_MAX_MB', '256'))
+    # Rendered report texts kept for repeated taps (LRU, capped by entries and total characters)
+    REPORT_CACHE_SIZE: int = int(os.getenv('REPORT_CACHE_SIZE', '128'))
+    REPORT_CACHE_MAX_CHARS: int = int(os.getenv('REPORT_CACHE_MAX_CHARS', '1000000'))
     
     # Authorization
     AUTHORIZED_CAPSTERS: List[int] = _parse_user_ids(os.getenv('AUTHORIZED_CAPSTERS', ''), 'AUTHORIZED_CAPSTERS')
@@ -45,6 +74,12 @@ class Settings:
     # Business
     CURRENCY: str = os.getenv('CURRENCY', 'Rp')
     TIMEZONE: str = os.getenv('TIMEZONE', 'Asia/Jakarta')
+    # Caches are re-warmed WARMUP_LEAD_MINUTES before the shop opens (local time)
+    SHOP_OPEN_HOUR: int = int(os.getenv('SHOP_OPEN_HOUR', '9'))
+    WARMUP_LEAD_MINUTES: int = int(os.getenv('WARMUP_LEAD_MINUTES', '15'))
+    # Nightly owner notification fan-out: parallel sends and overall messages per second
+    NOTIFY_CONCURRENCY: int = int(os.getenv('NOTIFY_CONCURRENCY', '5'))
+    NOTIFY_RATE_PER_SECOND: float = float(os.getenv('NOTIFY_RATE_PER_SECOND', '20'))
     
     def validate(self) -> bool:
         """Validate required settings"""
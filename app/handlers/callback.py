@@ -19,6 +19,7 @@ from app.handlers.report import (
     handle_weekly_report,
     handle_monthly_report,
     handle_profit_report,
+    handle_annual_report,
     handle_capster_weekly_report,
     handle_capster_daily_report,
     handle_capster_monthly_report,
@@ -72,6 +73,7 @@ async def callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
         CB_REPORT_WEEKLY: handle_weekly_report,
         CB_REPORT_MONTHLY: handle_monthly_report,
         CB_REPORT_PROFIT: handle_profit_report,
+        CB_REPORT_ANNUAL: handle_annual_report,
         CB_REPORT_DAILY_CAPSTER: handle_capster_daily_report,
         CB_REPORT_WEEKLY_CAPSTER: handle_capster_weekly_report,
         CB_REPORT_MONTHLY_CAPSTER: handle_capster_monthly_report,
@@ -96,6 +98,7 @@ async def callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
         CB_PAYMENT: lambda u, c, d: handle_payment_selection(u, c, *d.replace(f"{CB_PAYMENT}_", "").split("_", 1)),
         CB_MONTHLY_NAV: lambda u, c, d: handle_monthly_report(u, c, *map(int, d.replace(f"{CB_MONTHLY_NAV}_", "").split("_"))),
         CB_PROFIT_NAV: lambda u, c, d: handle_profit_report(u, c, *map(int, d.replace(f"{CB_PROFIT_NAV}_", "").split("_"))),
+        CB_ANNUAL_NAV: lambda u, c, d: handle_annual_report(u, c, int(d.replace(f"{CB_ANNUAL_NAV}_", ""))),
         CB_WEEK_SELECT: lambda u, c, d: handle_week_detail(u, c, *map(int, d.replace(f"{CB_WEEK_SELECT}_", "").split("_"))),
         CB_REMOVE_CAPSTER: lambda u, c, d: handle_remove_capster(u, c, d),
         CB_CONFIRM_REMOVE_CAPSTER: lambda u, c, d: handle_confirm_remove_capster(u, c, d),
@@ -1,6 +1,7 @@
 """
 Capster Management Handler
 """
+import asyncio
 import logging
 from telegram import Update
 from telegram.ext import (
@@ -14,6 +15,7 @@ from telegram.ext import (
 
 from app.utils.decorators import require_owner, handle_errors, log_command
 from app.utils.keyboards import KeyboardBuilder
+from app.services.async_sheets_service import run_blocking
 from app.config.constants import (
     CB_ADD_CAPSTER,
     CB_REMOVE_CAPSTER,
@@ -61,7 +63,7 @@ async def list_capsters_handler(update: Update, context: ContextTypes.DEFAULT_TY
     await query.answer()
 
     capster_service = context.bot_data.get('capster_service')
-    capsters = capster_service.get_all_capsters()
+    capsters = await run_blocking(capster_service.get_all_capsters)
 
     if not capsters:
         text = MSG_CAPSTER_LIST_EMPTY
@@ -112,7 +114,7 @@ async def get_capster_telegram_id(update: Update, context: ContextTypes.DEFAULT_
 
     # Check duplicate
     capster_service = context.bot_data.get('capster_service')
-    existing = capster_service.get_all_capsters()
+    existing = await run_blocking(capster_service.get_all_capsters)
     for c in existing:
         if c.telegram_id == telegram_id:
             await update.message.reply_text(
@@ -136,7 +138,7 @@ async def get_capster_alias(update: Update, context: ContextTypes.DEFAULT_TYPE)
     telegram_id = context.user_data.get('capster_telegram_id')
     capster_service = context.bot_data.get('capster_service')
 
-    if capster_service.add_capster(capster_name, telegram_id, alias=alias):
+    if await run_blocking(capster_service.add_capster, capster_name, telegram_id, alias=alias):
         # Update query parser so /tanya recognizes the new name + alias
         query_parser = context.bot_data.get('query_parser_service')
         if query_parser:
@@ -203,7 +205,7 @@ async def edit_capster_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return ConversationHandler.END
 
     capster_service = context.bot_data.get('capster_service')
-    capsters = capster_service.get_all_capsters()
+    capsters = await run_blocking(capster_service.get_all_capsters)
     target = None
     for c in capsters:
         if c.telegram_id == telegram_id:
@@ -250,7 +252,7 @@ async def edit_capster_alias(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     if new_name is None and new_alias is None:
         await update.message.reply_text("Tidak ada perubahan.")
-    elif capster_service.update_capster(telegram_id, name=new_name, alias=new_alias):
+    elif await run_blocking(capster_service.update_capster, telegram_id, name=new_name, alias=new_alias):
         # Update query parser
         query_parser = context.bot_data.get('query_parser_service')
         if query_parser:
@@ -323,17 +325,36 @@ async def handle_migrate_names(update: Update, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_text("⏳ Memproses migrasi nama capster di transaksi lama...")
 
     capster_service = context.bot_data.get('capster_service')
-    results = capster_service.migrate_old_transaction_names()
-
-    if not results:
+    loop = asyncio.get_running_loop()
+    updates = []
+
+    async def show_progress(text):
+        try:
+            await query.edit_message_text(text)
+        except Exception as e:
+            logger.debug(f"Migration progress message not updated: {e}")
+
+    def progress(done, total, sheet_name, updated):
+        # Called from the worker thread after each sheet
+        text = f"⏳ Migrasi nama capster: {done}/{total} sheet\n📄 {sheet_name}: {updated} transaksi diperbarui"
+        updates.append(asyncio.run_coroutine_threadsafe(show_progress(text), loop))
+
+    results = await run_blocking(capster_service.migrate_old_transaction_names, progress)
+    # Let the last progress edit land before the final message replaces it
+    await asyncio.gather(*(asyncio.wrap_future(future) for future in updates))
+    interrupted = capster_service.migration_pending()
+
+    if not results and not interrupted:
         text = "ℹ️ Tidak ada transaksi yang perlu dimigrasi.\n\nPastikan kolom Alias di CapsterList sudah terisi."
     else:
-        text = "✅ Migrasi selesai!\n\n"
+        text = "⚠️ Migrasi terhenti sebelum selesai.\n\n" if interrupted else "✅ Migrasi selesai!\n\n"
         total = 0
         for sheet_name, count in results.items():
             text += f"📄 {sheet_name}: {count} transaksi diperbarui\n"
             total += count
         text += f"\nTotal: {total} transaksi"
+        if interrupted:
+            text += "\n\nJalankan migrasi lagi untuk melanjutkan sheet yang tersisa."
 
     keyboard = KeyboardBuilder.capster_menu()
     await query.edit_message_text(text, reply_markup=keyboard)
@@ -355,7 +376,7 @@ async def handle_remove_capster(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     capster_service = context.bot_data.get('capster_service')
-    capsters = capster_service.get_all_capsters()
+    capsters = await run_blocking(capster_service.get_all_capsters)
     capster_name = "Unknown"
     for c in capsters:
         if c.telegram_id == telegram_id:
@@ -387,14 +408,14 @@ async def handle_confirm_remove_capster(update: Update, context: ContextTypes.DE
         return
 
     capster_service = context.bot_data.get('capster_service')
-    capsters = capster_service.get_all_capsters()
+    capsters = await run_blocking(capster_service.get_all_capsters)
     capster_name = "Unknown"
     for c in capsters:
         if c.telegram_id == telegram_id:
             capster_name = c.name
             break
 
-    if capster_service.remove_capster(telegram_id):
+    if await run_blocking(capster_service.remove_capster, telegram_id):
         await query.answer(MSG_CAPSTER_REMOVED.format(name=capster_name))
         await list_capsters_handler(update, context)
     else:
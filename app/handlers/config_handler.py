@@ -14,6 +14,7 @@ from telegram.ext import (
 
 from app.utils.decorators import require_owner, handle_errors, log_command
 from app.utils.keyboards import KeyboardBuilder
+from app.services.async_sheets_service import run_blocking
 from app.config.constants import (
     CB_CONFIG_MENU,
     CB_CONFIG_SERVICES,
@@ -174,7 +175,7 @@ async def handle_confirm_remove_service(update: Update, context: ContextTypes.DE
     service_data = ALL_SERVICES.get(service_id)
     service_name = service_data['name'] if service_data else service_id
 
-    if config_service.remove_service(service_id):
+    if await run_blocking(config_service.remove_service, service_id):
         await query.answer(f"✅ Layanan '{service_name}' dihapus.")
         await config_list_services_handler(update, context)
     else:
@@ -268,7 +269,7 @@ async def add_service_get_price(update: Update, context: ContextTypes.DEFAULT_TY
     category = context.user_data.get('new_svc_category')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.add_service(name, category, price):
+    if await run_blocking(config_service.add_service, name, category, price):
         await update.message.reply_text(
             f"✅ Layanan berhasil ditambahkan!\n\n"
             f"Nama: {name}\n"
@@ -344,7 +345,7 @@ async def edit_service_get_price(update: Update, context: ContextTypes.DEFAULT_T
     service_id = context.user_data.get('edit_svc_id')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.update_service_price(service_id, new_price):
+    if await run_blocking(config_service.update_service_price, service_id, new_price):
         service_data = ALL_SERVICES.get(service_id, {})
         await update.message.reply_text(
             f"✅ Harga berhasil diperbarui!\n\n"
@@ -429,7 +430,7 @@ async def edit_branch_cost_value(update: Update, context: ContextTypes.DEFAULT_T
     cost_key = context.user_data.get('edit_cost_key')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.update_branch_cost(branch_id, cost_key, new_value):
+    if await run_blocking(config_service.update_branch_cost, branch_id, cost_key, new_value):
         branch_data = BRANCHES.get(branch_id, {})
         await update.message.reply_text(
             f"✅ Biaya berhasil diperbarui!\n\n"
@@ -507,7 +508,7 @@ async def edit_branch_commission_value(update: Update, context: ContextTypes.DEF
     branch_id = context.user_data.get('edit_commission_branch_id')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.update_branch_commission(branch_id, rate):
+    if await run_blocking(config_service.update_branch_commission, branch_id, rate):
         branch_data = BRANCHES.get(branch_id, {})
         await update.message.reply_text(
             f"✅ Komisi berhasil diperbarui!\n\n"
@@ -613,7 +614,7 @@ async def handle_confirm_remove_product(update: Update, context: ContextTypes.DE
     product_data = PRODUCTS.get(product_id)
     product_name = product_data['name'] if product_data else product_id
 
-    if config_service.remove_product(product_id):
+    if await run_blocking(config_service.remove_product, product_id):
         await query.answer(f"✅ Produk '{product_name}' dihapus.")
         await config_list_products_handler(update, context)
     else:
@@ -656,7 +657,7 @@ async def add_product_get_price(update: Update, context: ContextTypes.DEFAULT_TY
     name = context.user_data.get('new_prd_name')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.add_product(name, price):
+    if await run_blocking(config_service.add_product, name, price):
         await update.message.reply_text(
             f"✅ Produk berhasil ditambahkan!\n\n"
             f"Nama: {name}\n"
@@ -728,7 +729,7 @@ async def edit_product_get_price(update: Update, context: ContextTypes.DEFAULT_T
     product_id = context.user_data.get('edit_prd_id')
     config_service = context.bot_data.get('config_service')
 
-    if config_service.update_product_price(product_id, new_price):
+    if await run_blocking(config_service.update_product_price, product_id, new_price):
         product_data = PRODUCTS.get(product_id, {})
         await update.message.reply_text(
             f"✅ Harga produk berhasil diperbarui!\n\n"
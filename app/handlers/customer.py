@@ -17,6 +17,7 @@ from app.utils.keyboards import KeyboardBuilder
 from app.config.constants import *
 from app.services.auth_service import AuthService
 from app.services.customer_service import CustomerService
+from app.services.async_sheets_service import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,7 @@ async def get_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     customer_phone = update.message.text
 
     customer_service = CustomerService()
-    if customer_service.add_customer(customer_name, customer_phone):
+    if await run_blocking(customer_service.add_customer, customer_name, customer_phone):
         await update.message.reply_text(MSG_CUSTOMER_ADDED.format(name=customer_name, phone=customer_phone))
     else:
         await update.message.reply_text("❌ Gagal menambahkan pelanggan.")
@@ -94,7 +95,7 @@ async def list_customers_handler(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     customer_service = CustomerService()
-    customers = customer_service.get_all_customers()
+    customers = await run_blocking(customer_service.get_all_customers)
 
     keyboard = KeyboardBuilder.customer_menu(user_id)
 
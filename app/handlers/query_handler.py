@@ -16,6 +16,7 @@ from telegram.constants import ParseMode
 
 from app.services.query_parser_service import QueryParserService
 from app.services.gemini_service import GeminiService
+from app.services.async_sheets_service import run_blocking
 from app.utils.decorators import handle_errors, require_owner_or_admin
 
 logger = logging.getLogger(__name__)
@@ -73,7 +74,7 @@ async def process_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     # 2. RETRIEVE — Get data from ReportService
     try:
         report_service = context.bot_data['report_service']
-        data_context = report_service.generate_report_from_query(query_result)
+        data_context = await run_blocking(report_service.generate_report_from_query, query_result)
     except Exception as e:
         logger.error(f"Failed to retrieve data: {e}", exc_info=True)
         await thinking_msg.edit_text("❌ Terjadi kesalahan saat mengambil data. Silakan coba lagi.")
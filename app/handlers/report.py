@@ -9,7 +9,8 @@ from datetime import datetime
 
 from app.utils.decorators import require_auth, require_owner_or_admin, handle_errors
 from app.utils.keyboards import KeyboardBuilder
-from app.utils.helpers import safe_edit_message
+from app.utils.helpers import safe_edit_message, send_long_message
+from app.services.async_sheets_service import run_blocking
 from app.config.constants import CB_MONTHLY_NAV, CB_PROFIT_NAV, MONTHS_ID # Import new constants
 
 from typing import Optional
@@ -30,7 +31,7 @@ async def handle_weekly_breakdown(update: Update, context: ContextTypes.DEFAULT_
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_weekly_breakdown(is_owner=True)
+        report = await run_blocking(report_service.generate_weekly_breakdown, is_owner=True)
         
         # Show week selection menu
         now = datetime.now()
@@ -59,7 +60,7 @@ async def handle_week_detail(update: Update, context: ContextTypes.DEFAULT_TYPE,
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_week_detail_report(year, month, week_num, is_owner=True)
+        report = await run_blocking(report_service.generate_week_detail_report, year, month, week_num, is_owner=True)
     except Exception as e:
         logger.error(f"Failed to generate week detail: {e}", exc_info=True)
         report = "❌ Gagal membuat laporan detail minggu."
@@ -88,7 +89,7 @@ async def handle_daily_report(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_daily_report()
+        report = await run_blocking(report_service.generate_daily_report)
     except Exception as e:
         logger.error(f"Failed to generate daily report: {e}")
         report = "❌ Gagal membuat laporan. Silakan coba lagi."
@@ -109,7 +110,7 @@ async def handle_weekly_report(update: Update, context: ContextTypes.DEFAULT_TYP
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_weekly_report()
+        report = await run_blocking(report_service.generate_weekly_report)
     except Exception as e:
         logger.error(f"Failed to generate weekly report: {e}")
         report = "❌ Gagal membuat laporan. Silakan coba lagi."
@@ -136,7 +137,7 @@ async def handle_monthly_report(update: Update, context: ContextTypes.DEFAULT_TY
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_monthly_report(year, month)
+        report = await run_blocking(report_service.generate_monthly_report, year, month)
         keyboard = KeyboardBuilder.monthly_navigation_keyboard(year, month, CB_MONTHLY_NAV)
     except Exception as e:
         logger.error(f"Failed to generate monthly report: {e}", exc_info=True)
@@ -164,7 +165,7 @@ async def handle_profit_report(update: Update, context: ContextTypes.DEFAULT_TYP
     
     try:
         report_service = context.bot_data['report_service']
-        report = report_service.generate_monthly_profit_report(year, month)
+        report = await run_blocking(report_service.generate_monthly_profit_report, year, month)
         keyboard = KeyboardBuilder.monthly_navigation_keyboard(year, month, CB_PROFIT_NAV)
     except Exception as e:
         logger.error(f"Failed to generate monthly profit report: {e}", exc_info=True)
@@ -173,6 +174,65 @@ async def handle_profit_report(update: Update, context: ContextTypes.DEFAULT_TYP
         
     await safe_edit_message(query, report, reply_markup=keyboard)
     
+@handle_errors
+@require_owner_or_admin
+async def handle_annual_report(update: Update, context: ContextTypes.DEFAULT_TYPE, year: Optional[int] = None):
+    """Handle annual profit report request with year/month navigation - Owner/Admin only"""
+    
+    query = update.callback_query
+    await query.answer()
+    
+    if year is None:
+        year = datetime.now().year
+    
+    await safe_edit_message(query, f"⏳ Menghitung laporan profit tahunan {year}...")
+    
+    try:
+        report_service = context.bot_data['report_service']
+        report = await run_blocking(report_service.generate_annual_profit_report, year)
+        keyboard = KeyboardBuilder.annual_navigation_keyboard(year)
+    except Exception as e:
+        logger.error(f"Failed to generate annual profit report: {e}", exc_info=True)
+        report = "❌ Gagal membuat laporan tahunan. Silakan coba lagi."
+        keyboard = KeyboardBuilder.back_button()
+    
+    # Many branches × 12 months can pass Telegram's message limit
+    await send_long_message(
+        lambda text, markup: safe_edit_message(query, text, reply_markup=markup),
+        lambda text, markup: query.message.reply_text(text, reply_markup=markup),
+        report, reply_markup=keyboard,
+    )
+
+
+@handle_errors
+@require_owner_or_admin
+async def annual_report_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/laporan_tahunan [tahun] - annual profit report - Owner/Admin only"""
+    year = datetime.now().year
+    if context.args:
+        try:
+            year = int(context.args[0])
+        except ValueError:
+            await update.message.reply_text("❌ Format: /laporan_tahunan [tahun], contoh: /laporan_tahunan 2025")
+            return
+    
+    message = await update.message.reply_text(f"⏳ Menghitung laporan profit tahunan {year}...")
+    
+    try:
+        report_service = context.bot_data['report_service']
+        report = await run_blocking(report_service.generate_annual_profit_report, year)
+        keyboard = KeyboardBuilder.annual_navigation_keyboard(year)
+    except Exception as e:
+        logger.error(f"Failed to generate annual profit report: {e}", exc_info=True)
+        report = "❌ Gagal membuat laporan tahunan. Silakan coba lagi."
+        keyboard = KeyboardBuilder.back_button()
+    
+    await send_long_message(
+        lambda text, markup: message.edit_text(text, reply_markup=markup),
+        lambda text, markup: update.message.reply_text(text, reply_markup=markup),
+        report, reply_markup=keyboard,
+    )
+
 # REPORT FOR CAPSTER 
 @handle_errors
 @require_auth
@@ -188,7 +248,7 @@ async def handle_capster_daily_report(update: Update, context: ContextTypes.DEFA
         capster_service = context.bot_data.get('capster_service')
         capster_name = capster_service.get_real_name(user.id, fallback=user.first_name)
         report_service = context.bot_data['report_service']
-        report = report_service.generate_daily_report(user=capster_name)
+        report = await run_blocking(report_service.generate_daily_report, user=capster_name)
     except Exception as e:
         logger.error(f"Failed to generate daily report: {e}")
         report = "❌ Gagal membuat laporan. Silakan coba lagi."
@@ -211,7 +271,7 @@ async def handle_capster_weekly_report(update: Update, context: ContextTypes.DEF
         capster_service = context.bot_data.get('capster_service')
         capster_name = capster_service.get_real_name(user.id, fallback=user.first_name)
         report_service = context.bot_data['report_service']
-        report = report_service.generate_weekly_report(user=capster_name)
+        report = await run_blocking(report_service.generate_weekly_report, user=capster_name)
     except Exception as e:
         logger.error(f"Failed to generate weekly report: {e}")
         report = "❌ Gagal membuat laporan. Silakan coba lagi."
@@ -235,7 +295,8 @@ async def handle_capster_monthly_report(update: Update, context: ContextTypes.DE
         capster_service = context.bot_data.get('capster_service')
         capster_name = capster_service.get_real_name(user.id, fallback=user.first_name)
         report_service = context.bot_data['report_service']
-        report = report_service.generate_monthly_report(
+        report = await run_blocking(
+            report_service.generate_monthly_report,
             user=capster_name,
             year=now.year,
             month=now.month
@@ -1,35 +1,78 @@
 """
 Scheduled Jobs - Daily notification and other automated tasks
 """
+import asyncio
 import logging
-from datetime import time
+from datetime import datetime, time, timedelta
 
 import pytz
 from telegram.ext import ContextTypes
 
 from app.config.settings import settings
+from app.services.async_sheets_service import run_blocking
 
 logger = logging.getLogger(__name__)
 
 TIMEZONE = pytz.timezone(settings.TIMEZONE)
 
 
+class _RateLimiter:
+    """Spaces out sends to at most `rate` per second across concurrent tasks."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def _send_to_owner(bot, owner_id: int, message: str, limiter: _RateLimiter, semaphore: asyncio.Semaphore) -> bool:
+    """Send one notification (falling back to plain text if Markdown parsing fails)."""
+    async with semaphore:
+        await limiter.wait()
+        try:
+            await bot.send_message(chat_id=owner_id, text=message, parse_mode="Markdown")
+            logger.info(f"Daily report sent to owner {owner_id}")
+            return True
+        except Exception:
+            # Retry without Markdown if parsing fails
+            try:
+                await limiter.wait()
+                await bot.send_message(chat_id=owner_id, text=message)
+                return True
+            except Exception as retry_err:
+                logger.error(f"Failed to send daily report to owner {owner_id}: {retry_err}")
+                return False
+
+
 async def send_daily_report_to_owners(context: ContextTypes.DEFAULT_TYPE):
     """
-    Scheduled job: sends daily summary report to all owners every night.
-    Triggered by JobQueue.run_daily().
+    Scheduled job: builds the nightly report bundle (daily, week-to-date, month-to-date,
+    profit-to-date and per-capster summaries in one pass), stores its snapshot and sends
+    it to all owners concurrently, rate limited. Triggered by JobQueue.run_daily().
     """
     logger.info("Running scheduled daily report notification...")
 
+    bundle_service = context.bot_data.get('bundle_service')
     report_service = context.bot_data.get('report_service')
-    if not report_service:
-        logger.error("ReportService not found in bot_data, skipping daily notification")
+    if not bundle_service and not report_service:
+        logger.error("BundleService/ReportService not found in bot_data, skipping daily notification")
         return
 
     try:
-        report = report_service.generate_daily_report()
+        if bundle_service:
+            report = (await run_blocking(bundle_service.build_and_save)).text
+        else:
+            report = await run_blocking(report_service.generate_daily_report)
     except Exception as e:
-        logger.error(f"Failed to generate daily report for notification: {e}", exc_info=True)
+        logger.error(f"Failed to build report bundle for notification: {e}", exc_info=True)
         report = None
 
     if not report:
@@ -38,27 +81,40 @@ async def send_daily_report_to_owners(context: ContextTypes.DEFAULT_TYPE):
     header = "🔔 *Ringkasan Harian Otomatis*\n\n"
     message = header + report
 
-    sent_count = 0
-    for owner_id in settings.OWNER_IDS:
-        try:
-            await context.bot.send_message(
-                chat_id=owner_id,
-                text=message,
-                parse_mode="Markdown"
-            )
-            sent_count += 1
-            logger.info(f"Daily report sent to owner {owner_id}")
-        except Exception as e:
-            # Retry without Markdown if parsing fails
-            try:
-                await context.bot.send_message(chat_id=owner_id, text=message)
-                sent_count += 1
-            except Exception as retry_err:
-                logger.error(f"Failed to send daily report to owner {owner_id}: {retry_err}")
+    limiter = _RateLimiter(settings.NOTIFY_RATE_PER_SECOND)
+    semaphore = asyncio.Semaphore(max(settings.NOTIFY_CONCURRENCY, 1))
+    results = await asyncio.gather(*(
+        _send_to_owner(context.bot, owner_id, message, limiter, semaphore) for owner_id in settings.OWNER_IDS
+    ))
+    sent_count = sum(results)
 
     logger.info(f"Daily report notification completed. Sent to {sent_count}/{len(settings.OWNER_IDS)} owners.")
 
 
+async def warm_caches(context: ContextTypes.DEFAULT_TYPE):
+    """
+    Scheduled job: fills the report caches in a worker thread.
+    Runs once at startup and daily shortly before opening hours (config is reloaded then).
+    """
+    warmup_service = context.bot_data.get('warmup_service')
+    if not warmup_service:
+        logger.error("WarmupService not found in bot_data, skipping cache warm-up")
+        return
+
+    reload_config = bool(context.job and context.job.data and context.job.data.get('reload_config'))
+    logger.info(f"Running cache warm-up (reload_config={reload_config})...")
+    try:
+        await run_blocking(warmup_service.warm, reload_config)
+    except Exception as e:
+        logger.error(f"Cache warm-up failed: {e}", exc_info=True)
+
+
+def _warmup_time() -> time:
+    """Local time WARMUP_LEAD_MINUTES before SHOP_OPEN_HOUR."""
+    opening = datetime.combine(datetime.now().date(), time(hour=settings.SHOP_OPEN_HOUR))
+    return (opening - timedelta(minutes=settings.WARMUP_LEAD_MINUTES)).time().replace(tzinfo=TIMEZONE)
+
+
 def setup_scheduled_jobs(application):
     """
     Register all scheduled jobs to the application's JobQueue.
@@ -70,6 +126,24 @@ def setup_scheduled_jobs(application):
         logger.error("JobQueue is not available. Scheduled jobs will NOT run.")
         return
 
+    # Cache warm-up: right after start (polling does not wait for it) and before opening hours.
+    # When the bot started from the config snapshot the startup run reconciles the config too.
+    config_service = application.bot_data.get('config_service')
+    job_queue.run_once(
+        callback=warm_caches,
+        when=0,
+        data={'reload_config': bool(config_service and config_service.from_snapshot)},
+        name="startup_warmup"
+    )
+    warmup_at = _warmup_time()
+    job_queue.run_daily(
+        callback=warm_caches,
+        time=warmup_at,
+        data={'reload_config': True},
+        name="opening_warmup"
+    )
+    logger.info(f"Scheduled cache warm-up at startup and daily at {warmup_at.strftime('%H:%M')} {settings.TIMEZONE}")
+
     if not settings.OWNER_IDS:
         logger.warning("No OWNER_IDS configured. Daily notification will not be scheduled.")
         return
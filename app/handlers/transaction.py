@@ -1,6 +1,7 @@
 """
 Transaction Handlers
 """
+import asyncio
 import logging
 from datetime import datetime
 from telegram import Update
@@ -100,8 +101,9 @@ async def handle_payment_selection(update: Update, context: ContextTypes.DEFAULT
     # Save
     try:
         logger.info(f"Saving transaction: {transaction}")
-        sheets_service = context.bot_data['sheets_service'] # Retrieve the SheetsService instance
-        success = sheets_service.add_transaction(transaction)
+        transaction_queue = context.bot_data['transaction_queue']
+        # Local journal write: kept off the Sheets pool so it never waits behind API calls
+        success = await asyncio.to_thread(transaction_queue.enqueue, transaction)
         logger.info(f"Save result: {success}")
     except Exception as e:
         logger.error(f"Failed to save: {e}", exc_info=True)
@@ -221,8 +223,9 @@ async def handle_product_payment(update: Update, context: ContextTypes.DEFAULT_T
     loading_msg = await query.edit_message_text("⏳ Menyimpan penjualan produk...")
 
     try:
-        sheets_service = context.bot_data['sheets_service']
-        success = sheets_service.add_transaction(transaction)
+        transaction_queue = context.bot_data['transaction_queue']
+        # Local journal write: kept off the Sheets pool so it never waits behind API calls
+        success = await asyncio.to_thread(transaction_queue.enqueue, transaction)
         logger.info(f"Product sale saved: {success} — {transaction}")
     except Exception as e:
         logger.error(f"Failed to save product sale: {e}", exc_info=True)
@@ -0,0 +1,53 @@
+"""
+Async Sheets Facade — runs blocking gspread calls off the asyncio event loop.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared bounded pool: keeps concurrent Sheets round-trips (and therefore
+# quota usage) capped no matter how many updates arrive at once.
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.SHEETS_MAX_WORKERS),
+    thread_name_prefix='sheets',
+)
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the Sheets worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+class AsyncSheetsService:
+    """Awaitable view of a service whose methods do blocking Sheets I/O.
+
+    Every public method of the wrapped instance becomes a coroutine that runs
+    on the shared worker pool, e.g. ``await async_sheets.add_transaction(t)``.
+    Attributes that are not callable are returned as-is.
+    """
+
+    def __init__(self, sheets_service):
+        self._sync = sheets_service
+
+    @property
+    def sync(self):
+        """The wrapped synchronous service (for code already running in a worker)."""
+        return self._sync
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._sync, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await run_blocking(attr, *args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,162 @@
+"""
+Bundle Service — the nightly owner summary, precomputed in one data pass.
+
+The rollup cells of every month touched by the current week and month are
+read once; the daily, week-to-date, month-to-date and per-capster summaries
+are slices of those cells, and profit-to-date comes from the profit engine
+over the same cached month. The rendered bundle is written to DATA_DIR/bundles
+as a JSON snapshot. The standard owner reports are rendered alongside it as of
+the next opening hour, with the same render cache keys the morning's report
+requests look up, so those requests are served from what was built overnight.
+"""
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.config.constants import MONTHS_ID
+from app.config.settings import settings
+from app.services.report_service import ReportService
+from app.services.sheets_governor import PRIORITY_BACKGROUND, request_priority
+from app.utils.formatters import Formatter
+from app.utils.slice_aggregator import SliceAggregator, SliceSummary
+from app.utils.time_slicer import TimeSlicer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReportBundle:
+    """One night's precomputed owner summary."""
+    date: str
+    built_at: str
+    text: str
+    # (year, month, data version) of every month the bundle read
+    versions: List[List[int]] = field(default_factory=list)
+    # Standard reports rendered with the bundle for the next opening (reports_for), by kind
+    reports: Dict[str, str] = field(default_factory=dict)
+    reports_for: str = ''
+
+
+
+class BundleService:
+    """Builds and stores the nightly report bundle."""
+
+    KEEP_DAYS = 7
+
+    def __init__(self, report_service: ReportService, base_dir: Optional[str] = None):
+        self.reports = report_service
+        self.base_dir = base_dir or os.path.join(settings.DATA_DIR, 'bundles')
+
+    def build(self, now: Optional[datetime] = None) -> ReportBundle:
+        """Compute the bundle for the day of `now` and render its text."""
+        now = now or datetime.now()
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        monday = day_start - timedelta(days=day_start.weekday())
+        day_end = day_start + timedelta(days=1, microseconds=-1)
+
+        # One read of the cells behind every section
+        months = sorted(set(self.reports._months_between(monday, day_end)) | {(now.year, now.month)})
+        versions = [[y, m, self.reports.cache.version(y, m)] for y, m in months]
+        cells = self.reports.cache.get_rollup(months)
+
+        if cells.empty:
+            daily = week = month = SliceSummary()
+        else:
+            daily = SliceAggregator.summarize(TimeSlicer.day(cells, day_start))
+            week = SliceAggregator.summarize(TimeSlicer.between(cells, monday, day_end))
+            month = SliceAggregator.summarize(TimeSlicer.between(TimeSlicer.month(cells, now.year, now.month),
+                                                                 datetime(now.year, now.month, 1), day_end))
+        profit = self.reports.generate_monthly_profit_dataframe(now.year, now.month)
+
+        text = self._render(now, monday, daily, week, month, profit)
+
+        # Rendered as of the next opening, so the keys (week, running month and its day)
+        # are the ones the morning's requests look up
+        morning = day_start + timedelta(days=1, hours=settings.SHOP_OPEN_HOUR)
+        reports = {
+            'weekly': self.reports.generate_weekly_report(now=morning),
+            'monthly': self.reports.generate_monthly_report(morning.year, morning.month, now=morning),
+            'profit': self.reports.generate_monthly_profit_report(morning.year, morning.month),
+            'weekly_breakdown': self.reports.generate_weekly_breakdown(morning.year, morning.month, is_owner=True),
+        }
+        return ReportBundle(
+            date=day_start.strftime('%Y-%m-%d'),
+            built_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            text=text,
+            versions=versions,
+            reports=reports,
+            reports_for=morning.strftime('%Y-%m-%d %H:%M'),
+        )
+
+    def build_and_save(self, now: Optional[datetime] = None) -> ReportBundle:
+        """Build the bundle and store it as a snapshot (a failed write only logs)."""
+        with request_priority(PRIORITY_BACKGROUND):
+            bundle = self.build(now)
+        self.save(bundle)
+        return bundle
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.base_dir, f"bundle_{date}.json")
+
+    def save(self, bundle: ReportBundle):
+        """Write the bundle snapshot and drop snapshots older than KEEP_DAYS."""
+        try:
+            os.makedirs(self.base_dir, exist_ok=True)
+            path = self._path(bundle.date)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(bundle), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+            snapshots = sorted(name for name in os.listdir(self.base_dir)
+                               if name.startswith('bundle_') and name.endswith('.json'))
+            for name in snapshots[:-self.KEEP_DAYS]:
+                os.remove(os.path.join(self.base_dir, name))
+            logger.info(f"Saved report bundle snapshot {path}")
+        except Exception as e:
+            logger.error(f"Failed to save report bundle for {bundle.date}: {e}")
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _totals(summary: SliceSummary) -> str:
+        return f"{summary.count} transaksi, {Formatter.format_currency(summary.total)}"
+
+    def _render(self, now: datetime, monday: datetime, daily: SliceSummary, week: SliceSummary,
+                month: SliceSummary, profit, capster_limit: int = 10) -> str:
+        text = f"📊 HARI INI ({Formatter.format_date(now)})\n"
+        text += f"  {self._totals(daily)}\n"
+        if daily.branch:
+            for branch, amount, count, _ in daily.branch.rows('sum'):
+                text += f"  🏢 {branch}: {count} transaksi ({Formatter.format_currency(amount)})\n"
+
+        text += f"\n📈 MINGGU INI ({monday.strftime('%d %b')} - {now.strftime('%d %b')})\n"
+        text += f"  {self._totals(week)}\n"
+        if week.days:
+            text += f"  Rata-rata/hari: {Formatter.format_currency(week.total / week.days)}\n"
+
+        text += f"\n📅 BULAN INI ({MONTHS_ID[now.month]} s.d. tanggal {now.day})\n"
+        text += f"  {self._totals(month)}\n"
+        if month.payment:
+            for method, amount, _, share in month.payment.rows('sum'):
+                text += f"  {method}: {Formatter.format_currency(amount)} ({share * 100:.1f}%)\n"
+
+        if not profit.empty:
+            net = profit.loc['Overall', 'Net Profit']
+            text += "\n💰 PROFIT BULAN INI\n"
+            text += f"  Pendapatan: {Formatter.format_currency(profit.loc['Overall', 'Revenue'])}\n"
+            text += f"  Biaya Operasional: {Formatter.format_currency(profit.loc['Overall', 'Operational Cost'])}\n"
+            text += f"  {'✅' if net >= 0 else '❌'} Profit Bersih: {Formatter.format_currency(net)}\n"
+
+        if month.capster:
+            text += "\n✂️ PER CAPSTER (hari ini | bulan ini)\n"
+            for capster, amount, count, _ in month.capster.rows('sum', limit=capster_limit):
+                today = daily.capster.sum_of(capster) if daily.capster else 0
+                text += (f"  {capster}: {Formatter.format_currency(today)} | "
+                         f"{count} layanan ({Formatter.format_currency(amount)})\n")
+        return text
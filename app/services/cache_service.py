@@ -0,0 +1,307 @@
+"""
+Transaction Cache Service — per-(year, month) partitions of transaction DataFrames.
+
+Each partition remembers the mirror data version it was built from. New sales
+are written through: the row goes into the mirror and straight into the cached
+partition, so reports see it immediately without rebuilding anything. The TTL
+is only a safety net for changes that bypass the bot (manual sheet edits).
+
+Each partition also carries a rollup cube of its month, built on first use and
+updated in place on write-through. Aggregate reports read the cube cells; a
+partition rebuilt after a manual edit starts with a fresh cube.
+
+Concurrent misses for the same month share one load (single-flight). A
+partition past its TTL is still served while the mirror re-checks its sheet
+in the background (stale-while-revalidate); only past CACHE_MAX_STALENESS
+does a reader wait for a synchronous re-check.
+
+Partitions are kept in LRU order under a memory budget (CACHE_MAX_MB),
+measured with DataFrame.memory_usage(deep=True). The current month is pinned
+and never evicted.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config.constants import MONTHS_ID
+from app.config.settings import settings
+from app.services.mirror_service import MirrorService
+from app.services.rollup_cube import RollupCube
+from app.utils.time_slicer import TimeSlicer
+from app.utils.transaction_schema import TransactionSchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Partition:
+    """Cached transactions of one month."""
+    df: pd.DataFrame
+    version: int
+    loaded_at: datetime = field(default_factory=datetime.now)
+    cube: Optional[RollupCube] = None
+    # A background re-check of the sheet was requested after the TTL ran out
+    revalidating: bool = False
+    # Measured memory footprint of the rows and of the materialized cube
+    df_bytes: int = 0
+    cube_bytes: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.df_bytes + self.cube_bytes
+
+
+class TransactionCache:
+    """Versioned, write-through cache of monthly transaction partitions."""
+
+    def __init__(self, mirror: MirrorService, ttl: Optional[int] = None, max_staleness: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.mirror = mirror
+        self.ttl = ttl or settings.CACHE_TTL
+        self.max_staleness = max(max_staleness or settings.CACHE_MAX_STALENESS, self.ttl)
+        self.max_bytes = max_bytes or settings.CACHE_MAX_MB * 1024 * 1024
+        # Least recently used first
+        self._partitions: 'OrderedDict[Tuple[int, int], Partition]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        # Month loads in progress: later readers of the same month wait for the event
+        self._inflight: Dict[Tuple[int, int], threading.Event] = {}
+        # Bumped by config writers (services, branches, capsters); derived reports depend on it
+        self.config_version = 0
+
+    @staticmethod
+    def _month_of(sheet_name: str) -> Optional[Tuple[int, int]]:
+        month_name, year = sheet_name.rsplit(' ', 1)
+        month = next((m for m, name in MONTHS_ID.items() if name == month_name), None)
+        return (int(year), month) if month else None
+
+    @staticmethod
+    def _frame_bytes(df: pd.DataFrame) -> int:
+        return int(df.memory_usage(deep=True).sum()) if not df.empty else 0
+
+    def _resize(self, partition: Partition, df_bytes: Optional[int] = None, cube_bytes: Optional[int] = None):
+        """Update a partition's measured size and the cache total. Caller holds _lock."""
+        before = partition.nbytes
+        if df_bytes is not None:
+            partition.df_bytes = df_bytes
+        if cube_bytes is not None:
+            partition.cube_bytes = cube_bytes
+        self._bytes += partition.nbytes - before
+
+    def _store(self, key: Tuple[int, int], partition: Partition):
+        """Insert a partition as most recently used and evict down to the budget. Caller holds _lock."""
+        self._drop(key)
+        self._partitions[key] = partition
+        self._resize(partition, df_bytes=self._frame_bytes(partition.df))
+        self._evict(keep=key)
+
+    def _drop(self, key: Tuple[int, int]):
+        """Remove a partition (if cached). Caller holds _lock."""
+        partition = self._partitions.pop(key, None)
+        if partition is not None:
+            self._bytes -= partition.nbytes
+
+    def _evict(self, keep: Optional[Tuple[int, int]] = None):
+        """Evict least recently used partitions until the cache fits its memory budget.
+        The current month and `keep` (the partition just used) are never evicted. Caller holds _lock."""
+        if self._bytes <= self.max_bytes:
+            return
+        now = datetime.now()
+        pinned = {(now.year, now.month), keep}
+        for key in [key for key in self._partitions if key not in pinned]:
+            if self._bytes <= self.max_bytes:
+                break
+            nbytes = self._partitions[key].nbytes
+            self._drop(key)
+            self.evictions += 1
+            logger.debug(f"Evicted partition {key[1]}/{key[0]} ({nbytes / 1024:.0f} KiB); "
+                         f"cache now {self._bytes / 1024 / 1024:.1f} MiB")
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and memory use of the partition cache."""
+        with self._lock:
+            return {
+                'partitions': len(self._partitions),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def version(self, year: int, month: int) -> int:
+        """Data version of a month partition."""
+        return self.mirror.sheet_version(self.mirror._sheet_name(year, month))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _age(self, partition: Partition, sheet_name: str) -> float:
+        """Seconds since the sheet was last verified in full against the spreadsheet (rebuilds
+        after write-through or tail syncs do not count: they cannot see manual edits)."""
+        checked = self.mirror.synced_at(sheet_name) or partition.loaded_at
+        return (datetime.now() - checked).total_seconds()
+
+    def get_month(self, year: int, month: int) -> pd.DataFrame:
+        """Transactions of one month, rebuilt from the mirror only if its version changed.
+
+        Past the TTL the cached partition is served as is while its sheet is re-checked in
+        the background; past max_staleness the re-check runs before returning. Only one
+        thread loads a given month at a time; the others wait for its result.
+        """
+        key = (year, month)
+        sheet_name = self.mirror._sheet_name(year, month)
+        # The first sync of a year bumps its versions: run it before reading one
+        self.mirror.ensure_year(year)
+        while True:
+            with self._lock:
+                version = self.mirror.sheet_version(sheet_name)
+                partition = self._partitions.get(key)
+                expired = False
+                if partition and partition.version == version:
+                    age = self._age(partition, sheet_name)
+                    if age < self.ttl:
+                        partition.revalidating = False
+                        self.hits += 1
+                        self._partitions.move_to_end(key)
+                        return partition.df
+                    if age < self.max_staleness:
+                        # Safety net for edits made outside the bot: full check in the background
+                        if not partition.revalidating:
+                            partition.revalidating = True
+                            self.mirror.notify_written([sheet_name], full=True)
+                            logger.debug(f"Serving {month}/{year} stale ({age:.0f}s), revalidating")
+                        self.hits += 1
+                        self._partitions.move_to_end(key)
+                        return partition.df
+                    expired = True
+                flight = self._inflight.get(key)
+                if flight is None:
+                    flight = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Someone else is loading this month: wait, then re-check
+            flight.wait()
+
+        try:
+            if expired:
+                logger.info(f"{month}/{year} exceeded max staleness. Re-checking its sheet now.")
+                self.mirror.sync_sheets([sheet_name], full=True)
+                if self.mirror.sheet_version(sheet_name) == version:
+                    with self._lock:
+                        partition.loaded_at = datetime.now()
+                        partition.revalidating = False
+                    return partition.df
+                version = self.mirror.sheet_version(sheet_name)
+
+            # Version read before the query: a concurrent change makes the partition stale, never wrong
+            df = TimeSlicer.index_by_date(self.mirror.get_transactions_for_months([key]))
+            with self._lock:
+                self._store(key, Partition(df=df, version=version))
+            return df
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.set()
+
+    def get_months(self, months: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Transactions of several months, one partition each. Partitions are sorted on a
+        DatetimeIndex and concatenated in month order, so the result stays sorted."""
+        months = sorted(set(months))
+        for year in sorted({year for year, _ in months}):
+            self.mirror.ensure_year(year)
+        dfs = [df for df in (self.get_month(year, month) for year, month in months) if not df.empty]
+        if not dfs:
+            return pd.DataFrame()
+        return TimeSlicer.index_by_date(TransactionSchema.concat(dfs))
+
+    def get_year(self, year: int) -> pd.DataFrame:
+        """Transactions of a whole year."""
+        return self.get_months([(year, month) for month in range(1, 13)])
+
+    def get_rollup_month(self, year: int, month: int) -> pd.DataFrame:
+        """Rollup cube cells of one month (see RollupCube), built from the partition on first use."""
+        df = self.get_month(year, month)
+        with self._lock:
+            partition = self._partitions.get((year, month))
+            if partition is None or partition.df is not df:
+                # Replaced since it was read: build a one-off cube for the rows we have
+                return RollupCube.build(df).frame()
+            if partition.cube is None:
+                partition.cube = RollupCube.build(df)
+                logger.debug(f"Built rollup cube for {month}/{year}: {len(df)} rows -> {len(partition.cube)} cells")
+            cells = partition.cube.frame()
+            if not partition.cube_bytes:
+                self._resize(partition, cube_bytes=self._frame_bytes(cells))
+                self._evict(keep=(year, month))
+            return cells
+
+    def get_rollup(self, months: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Rollup cube cells of several months, sorted by date."""
+        months = sorted(set(months))
+        for year in sorted({year for year, _ in months}):
+            self.mirror.ensure_year(year)
+        dfs = [df for df in (self.get_rollup_month(year, month) for year, month in months) if not df.empty]
+        if not dfs:
+            return pd.DataFrame()
+        return TimeSlicer.index_by_date(TransactionSchema.concat(dfs))
+
+    def get_rollup_year(self, year: int) -> pd.DataFrame:
+        """Rollup cube cells of a whole year."""
+        return self.get_rollup([(year, month) for month in range(1, 13)])
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def push_entry(self, entry: Dict, flushed: bool = False):
+        """Write a new transaction row through to the mirror and its cached partition."""
+        key = self._month_of(entry['sheet'])
+        with self._lock:
+            row_df, version = self.mirror.add_pending(entry['id'], entry['sheet'], entry['row'], flushed=flushed)
+            partition = self._partitions.get(key)
+            if partition is None or row_df.empty:
+                return
+            if partition.version == version - 1:
+                # Nothing else changed in between: append instead of rebuilding
+                partition.df = TimeSlicer.index_by_date(
+                    TransactionSchema.concat([partition.df, TimeSlicer.index_by_date(row_df)])
+                )
+                if partition.cube is not None:
+                    partition.cube.add(row_df)
+                partition.version = version
+                self._resize(partition, df_bytes=self._frame_bytes(partition.df))
+                self._evict(keep=key)
+            else:
+                self._drop(key)
+
+    def on_transaction_written(self, sheet_name: str, row: list):
+        """Hook for direct SheetsService.add_transaction writes (row already in Sheets)."""
+        self.push_entry({'id': uuid.uuid4().hex, 'sheet': sheet_name, 'row': row}, flushed=True)
+
+    def invalidate_sheets(self, sheet_names: List[str]):
+        """Transaction rows were edited in place (e.g. capster rename): resync those sheets.
+        A tail sync cannot see edited rows, so they get the full value check, run before the
+        partitions are dropped so they are not rebuilt from the old mirror rows."""
+        if not self.mirror.sync_sheets(sheet_names, full=True):
+            self.mirror.notify_written(sheet_names, full=True)
+        with self._lock:
+            for name in sheet_names:
+                key = self._month_of(name)
+                if key:
+                    self._drop(key)
+
+    def bump_config_version(self):
+        """Called after config writes (services, branches, products, capsters)."""
+        with self._lock:
+            self.config_version += 1
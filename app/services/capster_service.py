@@ -60,10 +60,11 @@ class CapsterService:
             return self._name_cache[telegram_id]
         return fallback or str(telegram_id)
 
-    def get_all_capsters(self) -> List[Capster]:
-        """Get all capsters from sheets."""
+    def get_all_capsters(self, records: Optional[List[dict]] = None) -> List[Capster]:
+        """Get all capsters from sheets (or from CapsterList records already read)."""
         try:
-            records = self.sheets.get_all_capsters()
+            if records is None:
+                records = self.sheets.get_all_capsters()
             return [
                 Capster(
                     name=rec['Name'],
@@ -76,11 +77,12 @@ class CapsterService:
             logger.error(f"Failed to get capsters: {e}", exc_info=True)
             return []
 
-    def get_name_alias_map(self) -> Dict[str, List[str]]:
+    def get_name_alias_map(self, capsters: Optional[List[Capster]] = None) -> Dict[str, List[str]]:
         """Build a map: name_lower -> [all known names for this capster].
         Used by report filtering so 'Zidan' also matches 'timingemma' in old transactions."""
         alias_map: Dict[str, List[str]] = {}
-        capsters = self.get_all_capsters()
+        if capsters is None:
+            capsters = self.get_all_capsters()
         for c in capsters:
             all_names = c.all_names()  # [real_name] or [real_name, alias]
             all_lower = [n.lower() for n in all_names]
@@ -88,8 +90,9 @@ class CapsterService:
                 alias_map[name_lower] = all_lower
         return alias_map
 
-    def migrate_old_transaction_names(self) -> dict:
-        """Batch update old transaction capster names from alias to real name."""
+    def migrate_old_transaction_names(self, progress=None) -> dict:
+        """Batch update old transaction capster names from alias to real name.
+        progress: optional callback (sheets_done, sheets_total, sheet_name, updated)."""
         capsters = self.get_all_capsters()
         alias_to_real = {}
         for c in capsters:
@@ -97,12 +100,18 @@ class CapsterService:
                 alias_to_real[c.alias.lower()] = c.name
         if not alias_to_real:
             return {}
-        return self.sheets.migrate_capster_names(alias_to_real)
+        return self.sheets.migrate_capster_names(alias_to_real, progress=progress)
 
-    def load_capsters_to_auth(self):
-        """Load all capsters from sheets into AuthService (merge with .env) and populate name cache."""
+    def migration_pending(self) -> bool:
+        """True when the last name migration was interrupted and can be resumed."""
+        return self.sheets.capster_migration_pending()
+
+    def load_capsters_to_auth(self, records: Optional[List[dict]] = None) -> List[Capster]:
+        """Load all capsters from sheets (or given CapsterList records) into AuthService
+        (merge with .env) and populate name cache. Returns the capsters read."""
+        capsters = []
         try:
-            capsters = self.get_all_capsters()
+            capsters = self.get_all_capsters(records)
             count = 0
             for capster in capsters:
                 self._name_cache[capster.telegram_id] = capster.name
@@ -112,3 +121,4 @@ class CapsterService:
             logger.info(f"Name cache populated with {len(self._name_cache)} capster(s)")
         except Exception as e:
             logger.error(f"Failed to load capsters to auth: {e}", exc_info=True)
+        return capsters
@@ -1,10 +1,23 @@
 """
 Config Service — Manages services and branch config via Google Sheets.
 Loads config at startup and updates constants dicts in-place.
+
+The config sheets (services, branches, products, capsters) are read in one
+batch request and kept as a local versioned snapshot. When Sheets does not
+answer in time at startup the bot starts from the snapshot, and the pending
+read is applied by the next reload (the startup warm-up).
 """
+import hashlib
+import json
 import logging
+import os
 import re
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.config.constants import SHEET_BRANCHES, SHEET_CAPSTERS, SHEET_PRODUCTS, SHEET_SERVICES
+from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,22 +45,129 @@ def _parse_int(value, default=0):
 class ConfigService:
     """Business logic for config CRUD (services + branches)."""
 
-    def __init__(self, sheets_service):
+    SNAPSHOT_FILENAME = 'config_snapshot.json'
+
+    def __init__(self, sheets_service, snapshot_path: Optional[str] = None):
         self.sheets = sheets_service
+        self.snapshot_path = snapshot_path or os.path.join(settings.DATA_DIR, self.SNAPSHOT_FILENAME)
+        # True while the config in use came from the snapshot (not yet reconciled with Sheets)
+        self.from_snapshot = False
+        # CapsterList rows of the last load (for CapsterService.load_capsters_to_auth)
+        self.capster_records: List[Dict[str, Any]] = []
+        self._snapshot_meta: Optional[tuple] = None   # (version, content hash)
+        self._pending_fetch = None                    # startup read that timed out
 
     # ------------------------------------------------------------------
     # Load all config from sheets → update constants dicts in-place
     # ------------------------------------------------------------------
 
-    def load_all_config(self):
-        """Load all config from sheets, update constants in-place."""
-        self._load_services()
-        self._load_branches()
-        self._load_products()
+    def load_all_config(self) -> bool:
+        """Load all config from sheets (one batch request), update constants in-place and
+        store it as the local snapshot. False when Sheets could not be read (config unchanged)."""
+        future, self._pending_fetch = self._pending_fetch, None
+        try:
+            values = future.result() if future else self.sheets.get_config_values()
+        except Exception as e:
+            logger.error(f"Failed to load config from sheets: {e}")
+            values = None
+        if values is None:
+            logger.warning("Config not loaded from sheets, keeping current values.")
+            return False
+
+        self._apply(values)
+        self._save_snapshot(values)
+        self.from_snapshot = False
+        return True
+
+    def bootstrap(self, timeout: Optional[float] = None) -> bool:
+        """Startup load: from Sheets when it answers within `timeout` seconds, otherwise from
+        the local snapshot (the read keeps running; load_all_config applies it later).
+        Without a snapshot it waits for Sheets. Returns True when the config came from Sheets."""
+        timeout = settings.CONFIG_BOOT_TIMEOUT if timeout is None else timeout
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='config-boot')
+        self._pending_fetch = executor.submit(self.sheets.get_config_values)
+        executor.shutdown(wait=False)
+        try:
+            if self._pending_fetch.result(timeout=timeout) is not None:
+                return self.load_all_config()
+            self._pending_fetch = None   # failed: the next reload reads again
+        except FutureTimeout:
+            logger.warning(f"Config sheets did not answer within {timeout:.0f}s")
+
+        snapshot = self._load_snapshot()
+        if snapshot is None:
+            logger.warning("No config snapshot yet, waiting for sheets...")
+            return self.load_all_config()
+
+        self._apply(snapshot['sheets'])
+        self.from_snapshot = True
+        logger.info(f"Started from config snapshot v{snapshot['version']} ({snapshot['saved_at']}); "
+                    "reconciling with sheets in the background.")
+        return False
+
+    def _apply(self, values: Dict[str, List[List[str]]]):
+        """Parse the config sheets' values and update the constants."""
+        records = self.sheets._values_to_records
+        self._load_services(records(values.get(SHEET_SERVICES, [])))
+        self._load_branches(records(values.get(SHEET_BRANCHES, [])))
+        self._load_products(records(values.get(SHEET_PRODUCTS, [])))
+        self.capster_records = records(values.get(SHEET_CAPSTERS, []))
+
+    # ------------------------------------------------------------------
+    # Local snapshot
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _content_hash(values: Dict[str, List[List[str]]]) -> str:
+        return hashlib.sha1(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """The stored snapshot {version, saved_at, content_hash, sheets}, or None."""
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._snapshot_meta = (snapshot['version'], snapshot['content_hash'])
+            return snapshot
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to read config snapshot {self.snapshot_path}: {e}")
+            return None
+
+    def _save_snapshot(self, values: Dict[str, List[List[str]]]):
+        """Store the values as a new snapshot version (skipped when nothing changed)."""
+        try:
+            if self._snapshot_meta is None:
+                self._load_snapshot()
+            version, previous_hash = self._snapshot_meta or (0, None)
+            content_hash = self._content_hash(values)
+            if content_hash == previous_hash:
+                return
+
+            snapshot = {
+                'version': version + 1,
+                'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'content_hash': content_hash,
+                'sheets': values,
+            }
+            os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+            self._snapshot_meta = (snapshot['version'], content_hash)
+            logger.info(f"Saved config snapshot v{snapshot['version']}")
+        except Exception as e:
+            logger.error(f"Failed to save config snapshot: {e}")
+
+    # ------------------------------------------------------------------
+    # Apply parsed sheet records to the constants
+    # ------------------------------------------------------------------
 
-    def _load_services(self):
-        """Load services from sheet → update SERVICES_MAIN, SERVICES_COLORING, ALL_SERVICES."""
-        records = self.sheets.get_all_services()
+    def _load_services(self, records: Optional[List[Dict]] = None):
+        """Load services from sheet (or given records) → update SERVICES_MAIN, SERVICES_COLORING, ALL_SERVICES."""
+        if records is None:
+            records = self.sheets.get_all_services()
         if not records:
             logger.info("No services in sheet, keeping hardcoded defaults.")
             return
@@ -74,9 +194,10 @@ class ConfigService:
         ALL_SERVICES.update({**main, **coloring})
         logger.info(f"Loaded {len(main)} main + {len(coloring)} coloring services from sheet.")
 
-    def _load_branches(self):
-        """Load branches from sheet → update BRANCHES in-place."""
-        records = self.sheets.get_all_branches_config()
+    def _load_branches(self, records: Optional[List[Dict]] = None):
+        """Load branches from sheet (or given records) → update BRANCHES in-place."""
+        if records is None:
+            records = self.sheets.get_all_branches_config()
         if not records:
             logger.info("No branches in sheet, keeping hardcoded defaults.")
             return
@@ -105,9 +226,10 @@ class ConfigService:
         BRANCHES.update(branches)
         logger.info(f"Loaded {len(branches)} branches from sheet.")
 
-    def _load_products(self):
-        """Load products from sheet → update PRODUCTS in-place."""
-        records = self.sheets.get_all_products()
+    def _load_products(self, records: Optional[List[Dict]] = None):
+        """Load products from sheet (or given records) → update PRODUCTS in-place."""
+        if records is None:
+            records = self.sheets.get_all_products()
         if not records:
             logger.info("No products in sheet, keeping hardcoded defaults.")
             return
@@ -0,0 +1,658 @@
+"""
+Transaction Mirror Service — local SQLite copy of the monthly transaction sheets.
+
+Google Sheets stays the source of truth. The mirror is kept in sync in the
+background (periodically, and right after the write queue flushes) and serves
+all report reads with indexed local queries. Closed months are additionally
+frozen into memory-mapped snapshots (see SnapshotService) and only re-checked
+against the spreadsheet every CLOSED_MONTH_SYNC_INTERVAL seconds.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config.constants import DATETIME_FORMAT, MONTHS_ID
+from app.config.settings import settings
+from app.services.sheets_governor import PRIORITY_BACKGROUND, request_priority
+from app.services.snapshot_service import SnapshotService
+from app.utils.transaction_schema import TransactionSchema
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet TEXT NOT NULL,
+    date TEXT NOT NULL,
+    capster TEXT,
+    service TEXT,
+    price INTEGER,
+    payment_method TEXT,
+    branch TEXT,
+    pending_id TEXT,     -- write-queue entry id while the row is not yet confirmed by a sync
+    flushed_at REAL      -- when the pending row was written to Sheets
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
+CREATE INDEX IF NOT EXISTS idx_transactions_branch ON transactions(branch, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_capster ON transactions(capster COLLATE NOCASE, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_sheet ON transactions(sheet);
+
+CREATE TABLE IF NOT EXISTS sheet_state (
+    sheet TEXT PRIMARY KEY,
+    year INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    head TEXT NOT NULL,
+    anchor TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    content_hash TEXT,
+    sheet_hash TEXT      -- chained hash of the ingested sheet values, as read from Sheets
+);
+"""
+
+
+class MirrorService:
+    """SQLite mirror of the monthly transaction sheets."""
+
+    DB_FILENAME = 'transactions.db'
+
+    def __init__(self, sheets_service, db_path: Optional[str] = None, sync_interval: Optional[int] = None,
+                 snapshots: Optional[SnapshotService] = None):
+        self.sheets = sheets_service
+        self.db_path = db_path or os.path.join(settings.DATA_DIR, self.DB_FILENAME)
+        self.sync_interval = sync_interval or settings.MIRROR_SYNC_INTERVAL
+        self.closed_sync_interval = settings.CLOSED_MONTH_SYNC_INTERVAL
+        # Without a snapshot store closed months are simply read from SQLite
+        self.snapshots = snapshots
+
+        self._lock = threading.RLock()       # guards the connection
+        self._sync_lock = threading.Lock()   # only one sync at a time
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._dirty_sheets = set()
+        self._full_check_sheets = set()
+        self._ensured_years = set()
+        self._year_locks: Dict[int, threading.Lock] = {}
+        # When each sheet was last verified in full against the spreadsheet (full check or
+        # full load; a tail-only sync does not count, it cannot see edits in between)
+        self._synced_at: Dict[str, datetime] = {}
+        # Bumped whenever mirrored rows change; lets readers cache query results
+        self.data_version = 0
+        self._sheet_versions: Dict[str, int] = {}
+
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            if self.db_path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            self._add_missing_column('sheet_state', 'content_hash', 'TEXT')
+            self._add_missing_column('sheet_state', 'sheet_hash', 'TEXT')
+            self._add_missing_column('transactions', 'pending_id', 'TEXT')
+            self._add_missing_column('transactions', 'flushed_at', 'REAL')
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_pending "
+                "ON transactions(pending_id) WHERE pending_id IS NOT NULL"
+            )
+            self._conn.commit()
+
+    def _add_missing_column(self, table: str, column: str, ddl_type: str):
+        """Upgrade databases created by older versions. Caller holds _lock."""
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+        if column not in columns:
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_rows(rows: list) -> list:
+        """Strip trailing empty cells so rows compare equal however the API trimmed them."""
+        normalized = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] == '':
+                row.pop()
+            normalized.append(row)
+        return normalized
+
+    @staticmethod
+    def _sheet_name(year: int, month: int) -> str:
+        return f"{MONTHS_ID[month]} {year}"
+
+    @staticmethod
+    def _is_closed(sheet_name: str, now: Optional[datetime] = None) -> bool:
+        """A month is closed once the calendar has moved past it."""
+        now = now or datetime.now()
+        month_name, year = sheet_name.rsplit(' ', 1)
+        month = next((m for m, name in MONTHS_ID.items() if name == month_name), None)
+        if month is None:
+            return False
+        return (int(year), month) < (now.year, now.month)
+
+    @staticmethod
+    def _chain_hash(rows: list, previous: str = '') -> str:
+        """Hash of sheet rows, chained row by row so appended rows extend it without
+        re-reading the rows before them."""
+        digest = previous
+        for row in rows:
+            digest = hashlib.sha1((digest + json.dumps(row, ensure_ascii=False)).encode('utf-8')).hexdigest()
+        return digest
+
+    def _content_hash(self, sheet_name: str) -> str:
+        """Hash of a sheet's content: the hash of its values as read from Sheets plus the rows
+        still waiting in the write queue. Sheets mirrored before sheet hashes existed fall back
+        to the mirrored rows. Caller holds _lock."""
+        row = self._conn.execute("SELECT sheet_hash FROM sheet_state WHERE sheet = ?", (sheet_name,)).fetchone()
+        sheet_hash = row[0] if row else None
+        digest = hashlib.sha1((sheet_hash or '').encode('utf-8'))
+        cursor = self._conn.execute(
+            "SELECT date, capster, service, price, payment_method, branch FROM transactions "
+            f"WHERE sheet = ? {'AND pending_id IS NOT NULL ' if sheet_hash else ''}ORDER BY id",
+            (sheet_name,),
+        )
+        for row in cursor:
+            digest.update(json.dumps(row, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _update_hashes(self, sheet_names: List[str]):
+        """Recompute content hashes of changed closed sheets and re-freeze them.
+        Open months keep a NULL hash; it is computed lazily once the month closes."""
+        for name in sheet_names:
+            if not self._is_closed(name):
+                continue
+            with self._lock:
+                content_hash = self._content_hash(name)
+                self._conn.execute("UPDATE sheet_state SET content_hash = ? WHERE sheet = ?", (content_hash, name))
+                self._conn.commit()
+            if self.snapshots and not self.snapshots.has(name, content_hash):
+                self.snapshots.freeze(name, content_hash, self._query_sheet(name))
+
+    def _load_states(self, sheet_names: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT sheet, rows, header, head, anchor, sheet_hash FROM sheet_state "
+                f"WHERE sheet IN ({','.join('?' * len(sheet_names))})",
+                sheet_names,
+            )
+            return {
+                sheet: {'rows': rows, 'header': json.loads(header),
+                        'head': json.loads(head), 'anchor': json.loads(anchor), 'sheet_hash': sheet_hash}
+                for sheet, rows, header, head, anchor, sheet_hash in cursor.fetchall()
+            }
+
+    def _insert_rows(self, sheet_name: str, header: list, rows: list, first_row: int = 2,
+                     pending_id: Optional[str] = None, flushed_at: Optional[float] = None) -> pd.DataFrame:
+        """Parse raw rows through the Sheets parsing path and insert them. Caller holds _lock.
+        first_row is the sheet row number of rows[0] (0 for rows not in the sheet yet).
+        Returns the parsed rows."""
+        df = self.sheets._values_to_dataframe([header] + rows, sheet_name, first_row)
+        if df.empty:
+            return df
+        records = [
+            (
+                sheet_name,
+                date.strftime(DATETIME_FORMAT),
+                capster, service, int(price), payment_method, branch,
+                pending_id, flushed_at,
+            )
+            for date, capster, service, price, payment_method, branch in zip(
+                df['Date'],
+                *(df[col].astype(object).fillna('') if col in df.columns else [''] * len(df) for col in COLUMNS[1:]),
+            )
+        ]
+        self._conn.executemany(
+            "INSERT INTO transactions "
+            "(sheet, date, capster, service, price, payment_method, branch, pending_id, flushed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            records,
+        )
+        return df.reset_index(drop=True)
+
+    def _save_state(self, sheet_name: str, state: Dict):
+        """Persist the ingest state of a sheet (content hash is set by _update_hashes). Caller holds _lock."""
+        year = int(sheet_name.rsplit(' ', 1)[1])
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sheet_state "
+            "(sheet, year, rows, header, head, anchor, synced_at, content_hash, sheet_hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+            (sheet_name, year, state['rows'], json.dumps(state['header']), json.dumps(state['head']),
+             json.dumps(state['anchor']), datetime.now().strftime(DATETIME_FORMAT), state.get('sheet_hash')),
+        )
+
+    def _replace_sheet(self, sheet_name: str, values: list, read_started: float):
+        """Replace all mirrored rows of a sheet with its full values, keeping rows still
+        waiting in the write queue. Caller holds _lock."""
+        values = self._normalize_rows(values)
+        self._conn.execute("DELETE FROM transactions WHERE sheet = ? AND pending_id IS NULL", (sheet_name,))
+        self._drop_flushed_pending(sheet_name, read_started)
+        header = values[0] if values else []
+        if values:
+            self._insert_rows(sheet_name, header, values[1:])
+        self._save_state(sheet_name, {
+            'rows': len(values),          # sheet rows ingested, header included
+            'header': header,
+            'head': values[:2],           # header + first data row
+            'anchor': values[-1:],        # last ingested row
+            'sheet_hash': self._chain_hash(values),
+        })
+
+    def _append_tail(self, sheet_name: str, state: Dict, new_rows: list, read_started: float) -> bool:
+        """Insert rows appended after the ingested ones and advance the sheet state.
+        Returns True when mirrored rows changed. Caller holds _lock."""
+        if not new_rows:
+            return self._drop_flushed_pending(sheet_name, read_started) > 0
+        self._drop_flushed_pending(sheet_name, read_started)
+        self._insert_rows(sheet_name, state['header'], new_rows, first_row=state['rows'] + 1)
+        state['rows'] += len(new_rows)
+        state['anchor'] = new_rows[-1:]
+        if len(state['head']) < 2:
+            state['head'] = (state['head'] + new_rows)[:2]
+        if state.get('sheet_hash') is not None:
+            state['sheet_hash'] = self._chain_hash(new_rows, state['sheet_hash'])
+        self._save_state(sheet_name, state)
+        return True
+
+    def synced_at(self, sheet_name: str) -> Optional[datetime]:
+        """When a sheet was last read in full and found to match (or reloaded) the mirror."""
+        with self._lock:
+            return self._synced_at.get(sheet_name)
+
+    def sheet_version(self, sheet_name: str) -> int:
+        """Data version of one monthly sheet; changes whenever its mirrored rows change."""
+        with self._lock:
+            return self._sheet_versions.get(sheet_name, 0)
+
+    def _bump(self, sheet_names: List[str]):
+        with self._lock:
+            for name in sheet_names:
+                self._sheet_versions[name] = self._sheet_versions.get(name, 0) + 1
+            self.data_version += 1
+
+    # ------------------------------------------------------------------
+    # Write-through
+    # ------------------------------------------------------------------
+
+    def add_pending(self, entry_id: str, sheet_name: str, row: list, flushed: bool = False):
+        """Insert a row that was just written (or queued for writing) before any sync sees it.
+        The row is replaced by its Sheets copy on the first sync after it was flushed.
+        Returns (parsed row DataFrame, new sheet version)."""
+        with self._lock:
+            cursor = self._conn.execute("SELECT 1 FROM transactions WHERE pending_id = ?", (entry_id,))
+            if cursor.fetchone():
+                return pd.DataFrame(), self.sheet_version(sheet_name)
+            df = self._insert_rows(sheet_name, COLUMNS, [row], first_row=0, pending_id=entry_id,
+                                   flushed_at=time.time() if flushed else None)
+            self._conn.commit()
+        self._update_hashes([sheet_name])
+        self._bump([sheet_name])
+        return df, self.sheet_version(sheet_name)
+
+    def confirm_flushed(self, entries: List[Dict]):
+        """Mark queued rows as written to Sheets and schedule a sync of their sheets."""
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE transactions SET flushed_at = ? WHERE pending_id = ?",
+                [(now, e['id']) for e in entries],
+            )
+            self._conn.commit()
+        self.notify_written(sorted({e['sheet'] for e in entries}))
+
+    def reconcile_pending(self, entries: List[Dict]):
+        """Align pending rows with the write-queue journal after a restart: journaled rows are
+        (re)inserted, pending rows no longer journaled were flushed and get dropped by the next sync."""
+        for entry in entries:
+            self.add_pending(entry['id'], entry['sheet'], entry['row'])
+        ids = {e['id'] for e in entries}
+        with self._lock:
+            orphans = [
+                (pending_id, sheet) for pending_id, sheet in self._conn.execute(
+                    "SELECT pending_id, sheet FROM transactions WHERE pending_id IS NOT NULL AND flushed_at IS NULL"
+                ) if pending_id not in ids
+            ]
+            self._conn.executemany("UPDATE transactions SET flushed_at = 0 WHERE pending_id = ?",
+                                   [(pending_id,) for pending_id, _ in orphans])
+            self._conn.commit()
+        if orphans:
+            self.notify_written(sorted({sheet for _, sheet in orphans}))
+
+    def _drop_flushed_pending(self, sheet_name: str, read_started: float) -> int:
+        """Delete pending rows that were flushed before the sheet was read: the read already
+        contains their Sheets copy. Caller holds _lock."""
+        cursor = self._conn.execute(
+            "DELETE FROM transactions WHERE sheet = ? AND pending_id IS NOT NULL AND flushed_at < ?",
+            (sheet_name, read_started),
+        )
+        return cursor.rowcount
+
+    def sync_sheets(self, sheet_names: List[str], full: bool = False) -> bool:
+        """Reconcile the given monthly sheets with the spreadsheet.
+
+        Sheets already mirrored are refreshed by fetching only rows after the ingested row count,
+        after checking the header/first row and the last ingested row. If either changed
+        (rows edited or deleted by hand) the sheet is fully reloaded. New sheets are loaded in full.
+
+        A quick sync cannot see edits to rows in between. With full=True every sheet is read
+        in full instead and the hash of its ingested rows is compared with the stored sheet
+        hash: a mismatch reloads the sheet, otherwise only the new rows are inserted.
+        Returns False if the spreadsheet could not be read."""
+        with self._sync_lock:
+            # Pending rows flushed before this point are contained in what we are about to read
+            read_started = time.time()
+            existing = self.sheets._existing_sheet_names(sheet_names)
+            states = self._load_states(sheet_names)
+            changed_sheets = []
+
+            # Forget sheets that were deleted
+            deleted = [name for name in states if name not in existing]
+            if deleted:
+                with self._lock:
+                    for name in deleted:
+                        self._conn.execute("DELETE FROM transactions WHERE sheet = ?", (name,))
+                        self._conn.execute("DELETE FROM sheet_state WHERE sheet = ?", (name,))
+                    self._conn.commit()
+                changed_sheets.extend(deleted)
+
+            if full:
+                ok = self._full_check(existing, states, read_started, changed_sheets)
+                verified = sheet_names if ok else []
+            else:
+                ok, verified = self._quick_sync(existing, states, read_started, changed_sheets)
+
+            self._update_hashes([name for name in changed_sheets if name not in deleted])
+            if changed_sheets:
+                self._bump(changed_sheets)
+            checked_at = datetime.fromtimestamp(read_started)
+            with self._lock:
+                for name in verified:
+                    self._synced_at[name] = checked_at
+            return ok
+
+    def _quick_sync(self, existing: List[str], states: Dict[str, Dict], read_started: float,
+                    changed_sheets: List[str]) -> Tuple[bool, List[str]]:
+        """Tail-only refresh of mirrored sheets (full reload of new or visibly edited ones).
+        Returns (success, sheets that were reloaded in full)."""
+        to_reload = [name for name in existing if name not in states or states[name]['rows'] == 0]
+        offsets = {name: states[name]['rows'] for name in existing if name not in to_reload}
+
+        tails = self.sheets.get_monthly_tails(offsets)
+        if tails is None:
+            to_reload.extend(offsets)
+            tails = {}
+
+        appended = 0
+        with self._lock:
+            for name, tail in tails.items():
+                state = states[name]
+                if (self._normalize_rows(tail['head']) != state['head']
+                        or self._normalize_rows(tail['anchor']) != state['anchor']):
+                    logger.warning(f"Sheet '{name}' was edited since last sync. Reloading it in full.")
+                    to_reload.append(name)
+                    continue
+
+                new_rows = self._normalize_rows(tail['tail'])
+                if self._append_tail(name, state, new_rows, read_started):
+                    appended += len(new_rows)
+                    changed_sheets.append(name)
+            self._conn.commit()
+
+        if offsets:
+            logger.info(f"Mirror sync: {appended} new row(s) across {len(offsets)} mirrored sheet(s).")
+
+        ok = True
+        if to_reload:
+            values_by_sheet = self.sheets.get_monthly_values(to_reload)
+            if values_by_sheet is None:
+                logger.error(f"Failed to reload {len(to_reload)} sheet(s) into the mirror. Keeping mirrored data.")
+                ok = False
+            else:
+                with self._lock:
+                    for name in to_reload:
+                        self._replace_sheet(name, values_by_sheet.get(name, []), read_started)
+                    self._conn.commit()
+                logger.info(f"Mirror reloaded {len(to_reload)} sheet(s) in full.")
+                changed_sheets.extend(to_reload)
+                return ok, to_reload
+        return ok, []
+
+    def _full_check(self, existing: List[str], states: Dict[str, Dict], read_started: float,
+                    changed_sheets: List[str]) -> bool:
+        """Read the sheets in full and reload those whose ingested rows no longer hash to the
+        stored sheet hash (edited anywhere, including rows in between)."""
+        if not existing:
+            return True
+        values_by_sheet = self.sheets.get_monthly_values(existing)
+        if values_by_sheet is None:
+            logger.error(f"Failed to check {len(existing)} sheet(s) against the mirror. Keeping mirrored data.")
+            return False
+
+        reloaded = 0
+        with self._lock:
+            for name in existing:
+                values = self._normalize_rows(values_by_sheet.get(name, []))
+                state = states.get(name)
+                if (state and state['rows'] and len(values) >= state['rows']
+                        and self._chain_hash(values[:state['rows']]) == state['sheet_hash']):
+                    if self._append_tail(name, state, values[state['rows']:], read_started):
+                        changed_sheets.append(name)
+                    continue
+                if state:
+                    logger.warning(f"Sheet '{name}' differs from the mirror. Reloading it in full.")
+                self._replace_sheet(name, values, read_started)
+                changed_sheets.append(name)
+                reloaded += 1
+            self._conn.commit()
+        logger.info(f"Mirror full check: {len(existing)} sheet(s) read, {reloaded} reloaded.")
+        return True
+
+    def sync_year(self, year: int, full: bool = False) -> bool:
+        """Reconcile every monthly sheet of a year (see sync_sheets for `full`)."""
+        return self.sync_sheets([self._sheet_name(year, month) for month in range(1, 13)], full=full)
+
+    def synced_years(self) -> List[int]:
+        """Years that have been mirrored at least once."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT year FROM sheet_state ORDER BY year")]
+
+    def ensure_year(self, year: int):
+        """Run a first sync for a year that has never been mirrored (once per process).
+        Concurrent callers for the same year share one sync instead of each fetching it."""
+        if year in self._ensured_years:
+            return
+        with self._lock:
+            year_lock = self._year_locks.setdefault(year, threading.Lock())
+        with year_lock:
+            if year in self._ensured_years:
+                return
+            if year not in self.synced_years():
+                logger.info(f"Year {year} not mirrored yet. Syncing from Google Sheets.")
+                if not self.sync_year(year):
+                    return
+            self._ensured_years.add(year)
+
+    def notify_written(self, sheet_names: List[str], full: bool = False):
+        """Called after rows were written to Sheets; schedules a quick sync of those sheets.
+        With full=True the sheets get a full value check instead (catches edits made by hand)."""
+        with self._lock:
+            (self._full_check_sheets if full else self._dirty_sheets).update(sheet_names)
+        self._wakeup.set()
+
+    def _run(self):
+        """Background loop: sync written sheets right away, the open month every sync_interval
+        seconds and every mirrored year with a full value check every closed_sync_interval
+        seconds (and once at start), so edits made by hand anywhere in a sheet are picked up."""
+        last_open_sync = None
+        last_closed_sync = None
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.sync_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                # Background reads yield to transaction writes in the Sheets governor
+                with request_priority(PRIORITY_BACKGROUND):
+                    with self._lock:
+                        dirty, self._dirty_sheets = list(self._dirty_sheets), set()
+                        full, self._full_check_sheets = list(self._full_check_sheets), set()
+                    if full:
+                        self.sync_sheets(full, full=True)
+                    dirty = [name for name in dirty if name not in full]
+                    if dirty:
+                        self.sync_sheets(dirty)
+
+                    now = datetime.now()
+                    if last_closed_sync is None or (now - last_closed_sync).total_seconds() >= self.closed_sync_interval:
+                        for year in sorted(set(self.synced_years()) | {now.year}):
+                            self.sync_year(year, full=True)
+                        last_closed_sync = last_open_sync = now
+                    elif (now - last_open_sync).total_seconds() >= self.sync_interval:
+                        self.sync_sheets([self._sheet_name(now.year, now.month)])
+                        last_open_sync = now
+            except Exception as e:
+                logger.error(f"Mirror sync failed: {e}", exc_info=True)
+
+    def start(self):
+        """Start the background sync loop (syncs right away)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='mirror-sync', daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+        logger.info(f"Mirror sync started (open month every {self.sync_interval}s, "
+                    f"closed months every {self.closed_sync_interval}s, and after each write)")
+
+    def stop(self):
+        """Stop the background sync loop."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=30)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, where: str, params: tuple) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, capster, service, price, payment_method, branch FROM transactions "
+                f"WHERE {where} ORDER BY date, id",
+                params,
+            ).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'], format=DATETIME_FORMAT)
+        return TransactionSchema.compact(df)
+
+    def get_transactions_by_range(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Transactions with start <= Date <= end, served from the date index."""
+        self.ensure_year(start.year)
+        if end.year != start.year:
+            self.ensure_year(end.year)
+        return self._query("date >= ? AND date <= ?",
+                           (start.strftime(DATETIME_FORMAT), end.strftime(DATETIME_FORMAT)))
+
+    def _query_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """All mirrored rows of one sheet, in sheet order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, capster, service, price, payment_method, branch FROM transactions "
+                "WHERE sheet = ? ORDER BY id",
+                (sheet_name,),
+            ).fetchall()
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'], format=DATETIME_FORMAT)
+        return TransactionSchema.compact(df)
+
+    def _ensure_hash(self, sheet_name: str, content_hash: Optional[str]) -> str:
+        """Stored hash of a closed sheet, computed now if the month closed since its last sync."""
+        if content_hash is not None:
+            return content_hash
+        with self._lock:
+            content_hash = self._content_hash(sheet_name)
+            self._conn.execute("UPDATE sheet_state SET content_hash = ? WHERE sheet = ?",
+                               (content_hash, sheet_name))
+            self._conn.commit()
+        return content_hash
+
+    def month_content_hash(self, year: int, month: int) -> Optional[str]:
+        """Content hash of a closed, mirrored month; None for open or never-synced months.
+        Lets derived data about a closed month be persisted and reused until it is edited."""
+        sheet_name = self._sheet_name(year, month)
+        if not self._is_closed(sheet_name):
+            return None
+        self.ensure_year(year)
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM sheet_state WHERE sheet = ?",
+                                     (sheet_name,)).fetchone()
+        if row is None:
+            return None
+        return self._ensure_hash(sheet_name, row[0])
+
+    def _load_sheet(self, sheet_name: str, content_hash: Optional[str]) -> pd.DataFrame:
+        """Load a sheet from its snapshot when it is a closed month, otherwise from SQLite."""
+        if not self.snapshots or not self._is_closed(sheet_name):
+            return self._query_sheet(sheet_name)
+
+        content_hash = self._ensure_hash(sheet_name, content_hash)
+        df = self.snapshots.load(sheet_name, content_hash)
+        if df is None:
+            df = self._query_sheet(sheet_name)
+            self.snapshots.freeze(sheet_name, content_hash, df)
+        return df
+
+    def get_transactions_for_months(self, months: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Transactions of several (year, month) sheets. Closed months come from snapshots."""
+        for year in sorted({year for year, _ in months}):
+            self.ensure_year(year)
+
+        sheet_names = [self._sheet_name(year, month) for year, month in months]
+        with self._lock:
+            hashes = dict(self._conn.execute(
+                f"SELECT sheet, content_hash FROM sheet_state "
+                f"WHERE sheet IN ({','.join('?' * len(sheet_names))})",
+                sheet_names,
+            ).fetchall())
+
+        dfs = []
+        for name in sheet_names:
+            if name in hashes:
+                df = self._load_sheet(name, hashes[name])
+            else:
+                # Not synced yet, but may already hold write-through rows
+                df = self._query_sheet(name)
+            if not df.empty:
+                dfs.append(df)
+        if not dfs:
+            return pd.DataFrame()
+        if len(dfs) == 1:
+            return dfs[0]   # a snapshot keeps its memory-mapped columns
+        return pd.concat([TransactionSchema.align(df.copy(deep=False)) for df in dfs], ignore_index=True)
+
+    def get_transactions_by_year(self, year: int) -> pd.DataFrame:
+        """All mirrored transactions of a year (every monthly sheet of that year)."""
+        return self.get_transactions_for_months([(year, month) for month in range(1, 13)])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,112 @@
+"""
+Profit Service — revenue, costs and net profit per (month, branch).
+
+Revenue of any list of months is grouped by (month, branch) in one pass over
+the rollup cube cells and joined against a branch cost table, giving one tidy
+row per month × branch. Yearly, quarterly and trend views are slices of that
+frame instead of one call per month.
+
+Revenue per branch is cached per month together with the month's data
+version, so repeated yearly views only regroup the months that changed.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config.constants import BRANCHES
+from app.services.cache_service import TransactionCache
+
+logger = logging.getLogger(__name__)
+
+REVENUE_COLUMNS = ['Year', 'Month', 'Branch', 'Revenue']
+COST_COLUMNS = ['BranchID', 'Branch', 'Fixed Cost', 'Commission Rate']
+PROFIT_COLUMNS = [
+    'Year', 'Month', 'BranchID', 'Branch', 'Revenue', 'Fixed Cost', 'Commission Rate',
+    'Commission Cost', 'Operational Cost', 'Net Profit',
+]
+
+
+class ProfitService:
+    """Vectorized profit engine over the transaction cache."""
+
+    def __init__(self, cache: TransactionCache):
+        self.cache = cache
+        # (year, month) -> (data version, revenue per branch of that month)
+        self._monthly: Dict[Tuple[int, int], Tuple[int, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cost_table(branches: Optional[Dict] = None) -> pd.DataFrame:
+        """Snapshot the branch config (BRANCHES by default) as one row per branch:
+        fixed monthly cost and commission rate, keyed by the branch short name."""
+        branches = dict(BRANCHES if branches is None else branches)
+        rows = [
+            (
+                branch_id,
+                config.get('short', branch_id),
+                sum(config.get('operational_cost', {}).values()),
+                config.get('commission_rate', 0),
+            )
+            for branch_id, config in branches.items()
+        ]
+        return pd.DataFrame(rows, columns=COST_COLUMNS)
+
+    @staticmethod
+    def _group_revenue(cells: pd.DataFrame) -> pd.DataFrame:
+        if cells.empty:
+            return pd.DataFrame(columns=REVENUE_COLUMNS)
+        revenue = cells.groupby(
+            [cells['Date'].dt.year.rename('Year'), cells['Date'].dt.month.rename('Month'), 'Branch'],
+            observed=True,
+        )['Price'].sum().rename('Revenue').reset_index()
+        revenue['Branch'] = revenue['Branch'].astype(str)
+        return revenue
+
+    def revenue_by_month(self, months: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Revenue per (Year, Month, Branch) for the given months. Months whose data version
+        changed since they were cached are regrouped together in one pass over the cube."""
+        months = sorted(set(months))
+        # Versions are read before the data: a concurrent write makes an entry stale, never wrong
+        versions = {key: self.cache.version(*key) for key in months}
+        with self._lock:
+            stale = [key for key in months if key not in self._monthly or self._monthly[key][0] != versions[key]]
+
+        if stale:
+            fresh = self._group_revenue(self.cache.get_rollup(stale))
+            parts = {key: part for key, part in fresh.groupby(['Year', 'Month'])} if not fresh.empty else {}
+            with self._lock:
+                for key in stale:
+                    part = parts.get(key, fresh.iloc[0:0])
+                    self._monthly[key] = (versions[key], part.reset_index(drop=True))
+
+        with self._lock:
+            frames = [self._monthly[key][1] for key in months]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=REVENUE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def profit_frame(self, months: List[Tuple[int, int]], costs: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Profit of every branch in every month that has transactions, as a tidy frame.
+
+        Each month with sales carries the full fixed cost of every branch in the cost
+        table; revenue of branches missing from the table is left out.
+        """
+        return self.join_costs(self.revenue_by_month(months), costs)
+
+    @classmethod
+    def join_costs(cls, revenue: pd.DataFrame, costs: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Profit rows for revenue already grouped per (Year, Month, Branch), e.g. from stored summaries."""
+        if revenue.empty:
+            return pd.DataFrame(columns=PROFIT_COLUMNS)
+        costs = cls.cost_table() if costs is None else costs
+
+        periods = revenue[['Year', 'Month']].drop_duplicates()
+        df = periods.merge(costs, how='cross').merge(revenue, on=['Year', 'Month', 'Branch'], how='left')
+        df['Revenue'] = df['Revenue'].fillna(0).astype('int64')
+        df['Commission Cost'] = df['Revenue'] * df['Commission Rate']
+        df['Operational Cost'] = df['Fixed Cost'] + df['Commission Cost']
+        df['Net Profit'] = df['Revenue'] - df['Operational Cost']
+        return df.sort_values(['Year', 'Month'], kind='mergesort').reset_index(drop=True)[PROFIT_COLUMNS]
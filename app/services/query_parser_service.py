@@ -33,10 +33,12 @@ class QueryParserService:
             'cabang b': 'Cabang Sumput',
         }
 
-    def update_capster_list(self, capster_list: List[str]):
-        """Update capster list dynamically."""
+    def update_capster_list(self, capster_list: List[str], capster_alias_map: dict = None):
+        """Update capster list (and alias map) dynamically."""
         self._capster_list = capster_list
         self._capster_list_lower = [name.lower() for name in capster_list]
+        if capster_alias_map is not None:
+            self._capster_alias_map = capster_alias_map
 
     async def parse_query(self, user_query: str) -> QueryResult:
         """
@@ -0,0 +1,72 @@
+"""
+Render Cache — finished report texts keyed by what they were rendered from.
+
+A key holds the report kind, its period, the capster filter and the data
+versions of every month the report reads (plus the config version), so an
+entry is never invalidated explicitly: a new sale bumps the month's version,
+the next request builds a new key and the old text ages out of the LRU.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """LRU of rendered report strings, capped by entry count and total characters."""
+
+    def __init__(self, max_entries: Optional[int] = None, max_chars: Optional[int] = None):
+        self.max_entries = max_entries or settings.REPORT_CACHE_SIZE
+        self.max_chars = max_chars or settings.REPORT_CACHE_MAX_CHARS
+        self._entries: 'OrderedDict[Hashable, str]' = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Cached text for key (marked most recently used), or None."""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: Hashable, text: str):
+        """Store a rendered text, evicting least recently used entries over the caps."""
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old)
+            self._entries[key] = text
+            self._chars += len(text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                'entries': len(self._entries), 'chars': self._chars,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            }
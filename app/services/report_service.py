@@ -2,18 +2,34 @@
 Report Generation Service
 """
 import logging
+import re
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import pandas as pd
 
 from app.services.sheets_service import SheetsService
+from app.services.mirror_service import MirrorService
+from app.services.cache_service import TransactionCache
+from app.services.profit_service import REVENUE_COLUMNS, ProfitService
+from app.services.summary_service import MonthSummary, SummaryStore
+from app.services.render_cache import RenderCache
 from app.utils.formatters import Formatter
 from app.utils.week_calculator import WeekCalculator
+from app.utils.time_slicer import TimeSlicer
+from app.utils.slice_aggregator import SliceAggregator, SliceSummary
+from app.utils.sheet_ingest import QUARANTINE
+from app.utils.transaction_schema import CAPSTER_KEY, TransactionSchema
 from app.config.constants import *
 from app.models.query import QueryResult # Import QueryResult
 
 logger = logging.getLogger(__name__)
 
+# Columns of the per-month profit DataFrame (rows: branches + 'Overall')
+PROFIT_SUMMARY_COLUMNS = ['Revenue', 'Fixed Cost', 'Commission Cost', 'Operational Cost', 'Net Profit']
+
+# Placeholder for the "Generated" time in rendered texts (see ReportService._generated)
+_GENERATED_AT = re.compile(r'\{generated:([^}]*)\}')
+
 """
 Saat ini, setiap permintaan laporan (/monthly_report, /profit_report) memicu panggilan ke get_transactions_dataframe() yang membaca semua data dari Google Sheets. Ini lambat.
 
@@ -31,17 +47,21 @@ Saat ini, setiap permintaan laporan (/monthly_report, /profit_report) memicu pan
 class ReportService:
     """Generate reports"""
     
-    def __init__(self, sheets_service: SheetsService):
+    def __init__(self, sheets_service: SheetsService, cache: Optional[TransactionCache] = None,
+                 summaries: Optional[SummaryStore] = None):
         try:
             logger.info("Initializing ReportService...")
             self.sheets = sheets_service
+            # All report reads are served from per-month cached partitions over the
+            # local mirror, not from Sheets
+            self.cache = cache or TransactionCache(MirrorService(sheets_service, db_path=':memory:'))
+            self.mirror = self.cache.mirror
+            self.profit = ProfitService(self.cache)
+            # Per-month summaries of earlier months for month/year comparisons
+            self.summaries = summaries or SummaryStore(self.cache, db_path=':memory:')
+            # Finished report texts, reused until a month they read gets new data
+            self.rendered = RenderCache()
             self.week_calc = WeekCalculator()
-            
-            # --- CACHE ---
-            self._transactions_cache = {}  # Dict to hold cache per year
-            self._cache_timestamp = {}   # Dict to hold timestamp per year
-            self.CACHE_DURATION = timedelta(minutes=5)
-            # --- END CACHE ---
 
             # Capster alias map: name_lower -> [all known names_lower]
             self._capster_alias_map = {}
@@ -58,37 +78,84 @@ class ReportService:
         # Expand aliases: e.g. "Zidan" also matches "timingemma"
         for alias in self._capster_alias_map.get(name_lower, []):
             names_to_match.add(alias)
-        return df[df['Capster'].str.lower().isin(names_to_match)]
+        return self._filter_by_capster_names(df, names_to_match)
+
+    @staticmethod
+    def _filter_by_capster_names(df: pd.DataFrame, names_lower: set) -> pd.DataFrame:
+        """Keep rows whose capster (lowercase) is in names_lower."""
+        if CAPSTER_KEY in df.columns:
+            # Compact frames: match on the integer codes of the normalized capster key
+            codes = TransactionSchema.capster_codes(names_lower)
+            return df[df[CAPSTER_KEY].cat.codes.isin(codes)]
+        return df[df['Capster'].str.lower().isin(names_lower)]
 
     def _get_or_fetch_transactions(self, year: int) -> pd.DataFrame:
         """
-        Fetches the transactions DataFrame from cache if available and not expired for a specific year,
-        otherwise fetches from the source and updates the cache for that year.
+        Fetches the transactions DataFrame for a specific year from the month partitions
+        of the transaction cache. Partitions are only rebuilt when their data version changes.
+        """
+        return self.cache.get_year(year)
+
+    def _get_transactions_between(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Get transactions with start <= Date <= end, sliced from the cached month partitions.
+        Only the months the range touches are loaded.
+        """
+        return TimeSlicer.between(self.cache.get_months(self._months_between(start, end)), start, end)
+
+    @staticmethod
+    def _months_between(start: datetime, end: datetime) -> list:
+        """(year, month) of every month touched by start..end."""
+        months = []
+        current = datetime(start.year, start.month, 1)
+        while current <= end:
+            months.append((current.year, current.month))
+            current = datetime(current.year + current.month // 12, current.month % 12 + 1, 1)
+        return months
+
+    def _rendered(self, kind: str, period: tuple, user: Optional[str], months: list, render) -> str:
         """
+        Return the cached text of a report, rendering it on a miss. The key carries the
+        data version of every month the report reads plus the config version, so a new
+        transaction in any of those months makes the next request render afresh. Reports
+        whose text depends on today's date (not only on the data) put it in their period.
+        Error texts are not cached.
+        """
+        months = sorted(set(months))
+        # First sync of a year bumps its versions: do it before they are read
+        for year in sorted({year for year, _ in months}):
+            self.mirror.ensure_year(year)
+        versions = tuple((y, m, self.cache.version(y, m)) for y, m in months)
+        key = (kind, period, user.lower() if user else None, versions, self.cache.config_version)
+        text = self.rendered.get(key)
+        if text is not None:
+            logger.debug(f"Serving cached {kind} report for {period}")
+            return self._stamp(text)
+        text = render()
+        if text and not text.startswith("❌"):
+            self.rendered.put(key, text)
+        return self._stamp(text)
+
+    @staticmethod
+    def _generated(fmt: str) -> str:
+        """The "Generated" line of a report. Cached texts keep a placeholder; the time of
+        the request is filled in by _stamp after the cache lookup."""
+        return f"⏰ Generated: {{generated:{fmt}}}"
+
+    @staticmethod
+    def _stamp(text: str) -> str:
+        """Fill in the "Generated" time placeholders of a rendered text."""
+        if not text:
+            return text
         now = datetime.now()
-        
-        # Check if cache is valid for the given year
-        if year in self._transactions_cache and year in self._cache_timestamp:
-            if now - self._cache_timestamp[year] < self.CACHE_DURATION:
-                logger.info(f"Fetching transactions for year {year} from CACHE.")
-                return self._transactions_cache[year]
-
-        # Fetch from source if cache is invalid or expired
-        logger.info(f"Cache for year {year} expired or empty. Fetching from Google Sheets.")
-        df = self.sheets.get_transactions_dataframe(year=year)
-        
-        # Update cache for the specific year
-        self._transactions_cache[year] = df
-        self._cache_timestamp[year] = now
-        
-        return df
+        return _GENERATED_AT.sub(lambda m: now.strftime(m.group(1)), text)
     
-    def _get_week_range(self) -> tuple:
+    def _get_week_range(self, now: Optional[datetime] = None) -> tuple:
         """
         Get start and end date of current week (Monday to Sunday)
         Returns: (start_date, end_date)
         """
-        today = datetime.now()
+        today = now or datetime.now()
         
         # Get Monday of current week (weekday: 0=Monday, 6=Sunday)
         days_since_monday = today.weekday()  # 0=Monday, 1=Tuesday, ..., 6=Sunday
@@ -111,14 +178,17 @@ class ReportService:
         Generate weekly breakdown report for a month
         Shows Week 1, Week 2, Week 3, Week 4 with totals
         """
+        if year is None or month is None:
+            now = datetime.now()
+            year = now.year
+            month = now.month
+        return self._rendered('weekly_breakdown', (year, month, is_owner), None, [(year, month)],
+                              lambda: self._render_weekly_breakdown(year, month, is_owner))
+
+    def _render_weekly_breakdown(self, year: int, month: int, is_owner: bool) -> str:
         logger.info(f"Generating weekly breakdown, owner={is_owner}")
         
         try:
-            if year is None or month is None:
-                now = datetime.now()
-                year = now.year
-                month = now.month
-            
             month_name = datetime(year, month, 1).strftime('%B %Y')
             
             # Get all weeks in month
@@ -127,22 +197,15 @@ class ReportService:
             if not weeks:
                 return f"📊 Tidak ada data minggu untuk {month_name}"
             
-            # Get all transactions for the year
-            df = self._get_or_fetch_transactions(year=year)
-            
-            if df.empty:
-                return f"📊 Tidak ada transaksi pada {month_name}"
-            
-            # Filter by month
-            month_str = f"{year:04d}-{month:02d}"
-            monthly = df[df['Date'].dt.strftime('%Y-%m') == month_str]
+            # Rollup cube cells of the month (one row per day/branch/capster/service/payment)
+            monthly = self.cache.get_rollup([(year, month)])
             
             if monthly.empty:
                 return f"📊 Tidak ada transaksi pada {month_name}"
             
             # Generate report
             report = f"{REPORT_WEEKLY_BREAKDOWN_HEADER.format(month=month_name)}\n"
-            report += f"⏰ Generated: {datetime.now().strftime('%d %b %Y, %H:%M')}\n\n"
+            report += f"{self._generated('%d %b %Y, %H:%M')}\n\n"
             
             total_month_revenue = 0
             total_month_transactions = 0
@@ -153,15 +216,10 @@ class ReportService:
                 start_date = week['start_date']
                 end_date = week['end_date']
                 
-                # Filter transactions for this week
-                week_df = monthly[
-                    (monthly['Date'] >= start_date) & 
-                    (monthly['Date'] <= end_date)
-                ]
-                
-                
-                week_revenue = week_df['Price'].sum() if not week_df.empty else 0
-                week_count = len(week_df)
+                # Aggregate transactions for this week
+                week_summary = SliceAggregator.summarize(TimeSlicer.between(monthly, start_date, end_date))
+                week_revenue = week_summary.total
+                week_count = week_summary.count
                 
                 total_month_revenue += week_revenue
                 total_month_transactions += week_count
@@ -170,7 +228,7 @@ class ReportService:
                 report += f"📅 MINGGU {week_num} ({week['start_str']} - {week['end_str']})\n"
                 report += f"{'─' * 40}\n"
                 
-                if week_df.empty:
+                if week_count == 0:
                     report += "Tidak ada transaksi\n\n"
                     continue
                 
@@ -178,10 +236,9 @@ class ReportService:
                 
                 
                 # Per branch
-                if 'Branch' in week_df.columns:
-                    by_branch = week_df.groupby('Branch')['Price'].sum()
+                if week_summary.branch is not None:
                     report += "\nPer Cabang:\n"
-                    for branch, amount in by_branch.items():
+                    for branch, amount, _, _ in week_summary.branch.rows():
                         report += f"  🏢 {branch}: {Formatter.format_currency(amount)}\n"
                 
                 report += "\n"
@@ -202,6 +259,14 @@ class ReportService:
         """
         Generate detailed report for specific week
         """
+        start_date, end_date = self.week_calc.get_week_range(year, month, week_num)
+        if start_date is None:
+            return self._stamp(self._render_week_detail_report(year, month, week_num, is_owner))
+        return self._rendered('week_detail', (year, month, week_num, is_owner), None,
+                              self._months_between(start_date, end_date),
+                              lambda: self._render_week_detail_report(year, month, week_num, is_owner))
+
+    def _render_week_detail_report(self, year: int, month: int, week_num: int, is_owner: bool) -> str:
         logger.info(f"Generating week {week_num} detail for {year}-{month}")
         
         try:
@@ -214,77 +279,53 @@ class ReportService:
                 return f"❌ Minggu {week_num} tidak valid untuk {month_name}"
             
             # Get transactions
-            df = self.sheets.get_transactions_by_range(start_date, end_date)
+            df = self._get_transactions_between(start_date, end_date)
             
             if df.empty:
                 return f"📈 Tidak ada transaksi pada Minggu {week_num}\n({start_date.strftime('%d %b')} - {end_date.strftime('%d %b')})"
             
-            gross_profit = df['Price'].sum()
-            count = len(df)
+            summary = SliceAggregator.summarize(df)
+            count = summary.count
             
             # Generate report
             report = f"{REPORT_WEEK_DETAIL_HEADER.format(week_num=week_num, month=month_name)}\n"
             report += f"📅 Periode: {start_date.strftime('%d %b')} - {end_date.strftime('%d %b %Y')}\n"
-            report += f"⏰ Generated: {datetime.now().strftime('%H:%M:%S')}\n\n"
+            report += f"{self._generated('%H:%M:%S')}\n\n"
             
             report += f"Total Transaksi: {count}\n"
             
             # Per branch
-            if 'Branch' in df.columns:
-                by_branch = df.groupby('Branch')['Price'].agg(['sum', 'count']).sort_values('sum', ascending=False)
+            if summary.branch is not None:
                 report += "Per Cabang:\n"
                 
-                for branch, row in by_branch.iterrows():
-                    count_branch = int(row['count'])
-                    sum_branch = row['sum']
+                for branch, sum_branch, count_branch, _ in summary.branch.rows('sum'):
                     report += f"  🏢 {branch}: {count_branch} transaksi ({Formatter.format_currency(sum_branch)})\n"
                 
                 report += "\n"
             
             # Top capsters
-            
-            top_capsters = df.groupby('Capster')['Price'].sum().sort_values(ascending=False).head(5)
             report += "Top Capster:\n"
-            for idx, (capster, amount) in enumerate(top_capsters.items(), 1):
-                capster_count = df[df['Capster'] == capster].shape[0]
+            for idx, (capster, amount, capster_count, _) in enumerate(summary.capster.rows('sum', limit=5), 1):
                 report += f"  {idx}. {capster}: {capster_count} layanan ({Formatter.format_currency(amount)})\n"
             
             # Top services
-            top_services = df['Service'].value_counts().head(5)
             report += "\nLayanan Terpopuler:\n"
-            for idx, (service, count) in enumerate(top_services.items(), 1):
-                report += f"  {idx}. {service}: {count}x\n"
+            for idx, (service, _, svc_count, _) in enumerate(summary.service.rows('count', limit=5), 1):
+                report += f"  {idx}. {service}: {svc_count}x\n"
             
-            # Daily breakdown
+            # Daily breakdown, with the per-day capster totals from the same pass
             report += "\nPer Hari:\n"
-            
-            # --- OPTIMIZATION START ---
-            # Group by both date and capster once to get all aggregates.
-            daily_capster_agg = df.groupby([df['Date'].dt.date, 'Capster'])['Price'].agg(['sum', 'count']).sort_values(by=['Date', 'sum'], ascending=[True, False])
-            
-            # Group by just date to get daily totals.
-            daily_totals = df.groupby(df['Date'].dt.date)['Price'].agg(['sum', 'count'])
-
-            # Iterate through the daily totals to build the report string.
-            for date, row in daily_totals.iterrows():
+            for date, sum_day, count_day, _ in summary.daily.rows():
                 day_name = pd.Timestamp(date).strftime('%A')
                 day_name_id = self._translate_day(day_name)
-                count_day = int(row['count'])
-                sum_day = row['sum']
                 
                 report += f"  📅 {day_name_id}, {pd.Timestamp(date).strftime('%d %b')}: {count_day} transaksi ({Formatter.format_currency(sum_day)})\n"
                 
-                # Filter the pre-aggregated data for the current day.
-                # This is much faster than grouping inside a loop.
-                if date in daily_capster_agg.index:
-                    day_capster_data = daily_capster_agg.loc[date]
-                    
-                    for capster, capster_row in day_capster_data.iterrows():
-                        capster_count = int(capster_row['count'])
-                        capster_sum = capster_row['sum']
+                day_capsters = summary.daily_capster.get(date)
+                if day_capsters:
+                    for capster, capster_sum, capster_count, _ in day_capsters.rows('sum'):
                         report += f"  - {capster}: {capster_count} layanan ({Formatter.format_currency(capster_sum)})\n"
                     report += "\n"
-            # --- OPTIMIZATION END ---
             
             logger.info("Weekly report generated successfully")
             return report
@@ -297,11 +338,15 @@ class ReportService:
         """Generate daily report for all or a specific capster."""
         if date is None:
             date = datetime.now()
+        return self._rendered('daily', (date.date(),), user, [(date.year, date.month)],
+                              lambda: self._render_daily_report(date, user))
 
+    def _render_daily_report(self, date: datetime, user: Optional[str]) -> str:
         logger.info(f"Generating daily report for {date.strftime('%Y-%m-%d')}, user: {user}")
 
         try:
-            df = self.sheets.get_transactions_by_date(date)
+            day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            df = self._get_transactions_between(day_start, day_start + timedelta(days=1, microseconds=-1))
 
             if user:
                 df = self._filter_by_capster(df, user)
@@ -310,54 +355,43 @@ class ReportService:
                 user_msg = f" untuk {user}" if user else ""
                 return f"📊 Tidak ada transaksi{user_msg} pada {Formatter.format_date(date)}"
             
-            total = df['Price'].sum()
-            count = len(df)
+            summary = SliceAggregator.summarize(df)
+            total = summary.total
+            count = summary.count
             
             # Generate report header
-            now = datetime.now()
             if user:
                 report = f"{REPORT_DAILY_HEADERS_CAPSTER.format(date=Formatter.format_date(date), username=user)}\n\n"
                 report += f"Capster: {user}\n"
             else:
                 report = f"{REPORT_DAILY_HEADER.format(date=Formatter.format_date(date))}\n"
-                report += f"⏰ Generated: {now.strftime('%H:%M:%S')}\n\n"
+                report += f"{self._generated('%H:%M:%S')}\n\n"
 
             report += f"Total Transaksi: {count}\n"
             report += f"Total Pendapatan: {Formatter.format_currency(total)}\n\n"
             
             if not user:
                 # Per branch breakdown (if column exists)
-                if 'Branch' in df.columns:
-                    logger.debug("Generating per-branch breakdown...")
-                    by_branch = df.groupby('Branch')['Price'].agg(['sum', 'count'])
+                if summary.branch is not None:
                     report += "Per Cabang:\n"
-                    for branch, row in by_branch.iterrows():
-                        count_branch = int(row['count'])
-                        sum_branch = row['sum']
+                    for branch, sum_branch, count_branch, _ in summary.branch.rows():
                         report += f"  🏢 {branch}: {count_branch} transaksi ({Formatter.format_currency(sum_branch)})\n"
                     report += "\n"
                 
                 # Per capster breakdown
-                logger.debug("Generating per-capster breakdown...")
-                by_capster = df.groupby('Capster')['Price'].agg(['sum', 'count'])
                 report += "Per Capster:\n"
-                for capster, row in by_capster.iterrows():
-                    count_capster = int(row['count'])
-                    sum_capster = row['sum']
+                for capster, sum_capster, count_capster, _ in summary.capster.rows():
                     report += f"  ✂️ {capster}: {count_capster} layanan ({Formatter.format_currency(sum_capster)})\n"
 
             # Top services
-            logger.debug("Finding top services...")
-            top_services = df['Service'].value_counts().head(3)
-            if not top_services.empty:
+            if summary.service:
                 report += "\nLayanan Terpopuler:\n"
-                for service, svc_count in top_services.items():
+                for service, _, svc_count, _ in summary.service.rows('count', limit=3):
                     report += f"  • {service}: {svc_count}x\n"
             
-            if not user and 'Payment_Method' in df.columns:
-                payment_breakdown = df.groupby('Payment_Method')['Price'].sum()
+            if not user and summary.payment is not None:
                 report += "\nMetode Pembayaran:\n"
-                for method, amount in payment_breakdown.items():
+                for method, amount, _, _ in summary.payment.rows():
                     report += f"  {method}: {Formatter.format_currency(amount)}\n"
             
             logger.info("Daily report generated successfully")
@@ -371,16 +405,22 @@ class ReportService:
             logger.error(f"Failed to generate daily report: {e}", exc_info=True)
             return f"❌ Gagal membuat laporan harian: {str(e)}"
     
-    def generate_weekly_report(self, user: Optional[str] = None) -> str:
-        """Generate weekly report (Monday to Sunday of current week) for all or a specific capster."""
+    def generate_weekly_report(self, user: Optional[str] = None, now: Optional[datetime] = None) -> str:
+        """Generate weekly report (Monday to Sunday of current week) for all or a specific capster.
+        `now` picks the week (default: the current time)."""
+        monday, sunday = self._get_week_range(now)
+        return self._rendered('weekly', (monday.date(),), user, self._months_between(monday, sunday),
+                              lambda: self._render_weekly_report(user, now))
+
+    def _render_weekly_report(self, user: Optional[str], now: Optional[datetime] = None) -> str:
         logger.info(f"Generating weekly report, user: {user}")
 
         try:
             # Get current week range (Monday to Sunday)
-            monday, sunday = self._get_week_range()
+            monday, sunday = self._get_week_range(now)
 
             logger.info(f"Fetching transactions from {monday} to {sunday}")
-            df = self.sheets.get_transactions_by_range(monday, sunday)
+            df = self._get_transactions_between(monday, sunday)
             logger.info(f"Fetched {len(df)} transactions")
 
             if user:
@@ -391,22 +431,22 @@ class ReportService:
                 week_str = f"{monday.strftime('%d %b')} - {sunday.strftime('%d %b %Y')}"
                 return f"📈 Tidak ada transaksi minggu ini{user_msg}\n({week_str})"
             
-            total = df['Price'].sum()
-            count = len(df)
+            summary = SliceAggregator.summarize(df)
+            total = summary.total
+            count = summary.count
             
             # Calculate days with transactions
-            unique_days = df['Date'].dt.date.nunique()
+            unique_days = summary.days
             avg_per_day = total / unique_days if unique_days > 0 else 0
             
             # Week info
             week_str = f"{monday.strftime('%d %b')} - {sunday.strftime('%d %b %Y')}"
-            now = datetime.now()
             
             report = f"{REPORT_WEEKLY_HEADER}\n"
             report += f"📅 Periode: {week_str}\n"
             if user:
                 report += f"👤 Capster: {user}\n"
-            report += f"⏰ Generated: {now.strftime('%H:%M:%S')}\n\n"
+            report += f"{self._generated('%H:%M:%S')}\n\n"
             
             report += f"Total Transaksi: {count}\n"
             report += f"Total Pendapatan: {Formatter.format_currency(total)}\n"
@@ -415,37 +455,28 @@ class ReportService:
             
             if not user:
                 # Per branch breakdown (if exists)
-                if 'Branch' in df.columns:
-                    by_branch = df.groupby('Branch')['Price'].agg(['sum', 'count']).sort_values('sum', ascending=False)
+                if summary.branch is not None:
                     report += "Per Cabang:\n"
-                    for branch, row in by_branch.iterrows():
-                        count_branch = int(row['count'])
-                        sum_branch = row['sum']
+                    for branch, sum_branch, count_branch, _ in summary.branch.rows('sum'):
                         report += f"  🏢 {branch}: {count_branch} transaksi ({Formatter.format_currency(sum_branch)})\n"
                     report += "\n"
 
             # Top services
-            top_services = df['Service'].value_counts().head(5)
             report += "Layanan Terpopuler:\n"
-            for idx, (service, svc_count) in enumerate(top_services.items(), 1):
+            for idx, (service, _, svc_count, _) in enumerate(summary.service.rows('count', limit=5), 1):
                 report += f"  {idx}. {service}: {svc_count}x\n"
             
             if not user:
-                # Top capsters
-                top_capsters = df.groupby('Capster')['Price'].sum().sort_values(ascending=False).head(5)
+                # Top capsters (counts come from the same pass, not a filter per capster)
                 report += "\nTop Capster:\n"
-                for idx, (capster, amount) in enumerate(top_capsters.items(), 1):
-                    capster_count = df[df['Capster'] == capster].shape[0]
+                for idx, (capster, amount, capster_count, _) in enumerate(summary.capster.rows('sum', limit=5), 1):
                     report += f"  {idx}. {capster}: {capster_count} layanan ({Formatter.format_currency(amount)})\n"
             
             # Daily breakdown
-            daily_totals = df.groupby(df['Date'].dt.date)['Price'].agg(['sum', 'count'])
             report += "\nPer Hari:\n"
-            for date, row in daily_totals.iterrows():
+            for date, sum_day, count_day, _ in summary.daily.rows():
                 day_name = pd.Timestamp(date).strftime('%A')
                 day_name_id = self._translate_day(day_name)
-                count_day = int(row['count'])
-                sum_day = row['sum']
                 report += f"  📅 {day_name_id}, {pd.Timestamp(date).strftime('%d %b')}: {count_day} transaksi ({Formatter.format_currency(sum_day)})\n"
             
             logger.info("Weekly report generated successfully")
@@ -469,33 +500,35 @@ class ReportService:
         return translation.get(english_day, english_day)
 
     
-    def generate_monthly_report(self, year: Optional[int] = None, month: Optional[int] = None, user: Optional[str] = None) -> str:
-        """Generate monthly report for a specific month and year, for all or a specific capster."""
+    def generate_monthly_report(self, year: Optional[int] = None, month: Optional[int] = None, user: Optional[str] = None,
+                                now: Optional[datetime] = None) -> str:
+        """Generate monthly report for a specific month and year, for all or a specific capster.
+        `now` is the time the report is for (default: the current time)."""
+        now = now or datetime.now()
+        year = now.year if year is None else year
+        month = now.month if month is None else month
+        months = [(year, month)]
+        if not user:
+            months += [(y, m) for _, y, m in self._comparison_periods(year, month)]
+        # Average per day of the running month depends on how many days have passed
+        period = (year, month, now.date()) if (year, month) == (now.year, now.month) else (year, month)
+        return self._rendered('monthly', period, user, months,
+                              lambda: self._render_monthly_report(year, month, user, now))
+
+    def _render_monthly_report(self, year: int, month: int, user: Optional[str], now: datetime) -> str:
         logger.info(f"Generating monthly report for {month}/{year}, user: {user}")
         
         try:
-            current_date = datetime.now()
-            if year is None:
-                year = current_date.year
-            if month is None:
-                month = current_date.month
+            current_date = now
 
             report_date = datetime(year, month, 1)
             month_str = report_date.strftime('%Y-%m')
             month_display = report_date.strftime('%B %Y')
             
-            logger.debug(f"Fetching transactions for year {year}...")
-            df = self._get_or_fetch_transactions(year=year)
-            logger.info(f"Total transactions in sheet: {len(df)}")
-            
-            if df.empty:
-                logger.info("No transactions found in sheet")
-                return f"📅 Tidak ada transaksi pada {month_display}"
-            
-            # Filter by specific month and year
-            logger.debug(f"Filtering for month: {month_str}")
-            monthly = df[df['Date'].dt.strftime('%Y-%m') == month_str]
-            logger.info(f"Transactions this month: {len(monthly)}")
+            # Answered from the month's rollup cube, not from the raw rows
+            logger.debug(f"Fetching rollup for month: {month_str}")
+            monthly = self.cache.get_rollup([(year, month)])
+            logger.info(f"Rollup cells this month: {len(monthly)}")
 
             if user:
                 monthly = self._filter_by_capster(monthly, user)
@@ -504,8 +537,9 @@ class ReportService:
                 user_msg = f" untuk {user}" if user else ""
                 return f"📅 Tidak ada transaksi{user_msg} pada {month_display}"
             
-            total = monthly['Price'].sum()
-            count = len(monthly)
+            summary = SliceAggregator.summarize(monthly)
+            total = summary.total
+            count = summary.count
             
             # Calculate days for the given month, up to the current day if it's the current month
             if year == current_date.year and month == current_date.month:
@@ -520,7 +554,7 @@ class ReportService:
                 report += f"Capster: {user}\n"
             else:
                 report = f"{REPORT_MONTHLY_HEADER.format(month=month_display)}\n"
-                report += f"⏰ Generated: {current_date.strftime('%d %b %Y, %H:%M:%S')}\n\n"
+                report += f"{self._generated('%d %b %Y, %H:%M:%S')}\n\n"
 
             report += f"Total Transaksi: {count}\n"
             report += f"Total Pendapatan: {Formatter.format_currency(total)}\n"
@@ -528,46 +562,31 @@ class ReportService:
             
             if not user:
                 # Per branch (if exists)
-                if 'Branch' in monthly.columns:
-                    by_branch = monthly.groupby('Branch')['Price'].agg(['sum', 'count']).sort_values('sum', ascending=False)
+                if summary.branch is not None:
                     report += "Per Cabang:\n"
-                    for branch, row in by_branch.iterrows():
-                        count_branch = int(row['count'])
-                        sum_branch = row['sum']
-                        pct = (sum_branch / total * 100) if total > 0 else 0
-                        report += f"  🏢 {branch}: {count_branch} transaksi ({Formatter.format_currency(sum_branch)}) - {pct:.1f}%\n"
+                    for branch, sum_branch, count_branch, share in summary.branch.rows('sum'):
+                        report += f"  🏢 {branch}: {count_branch} transaksi ({Formatter.format_currency(sum_branch)}) - {share * 100:.1f}%\n"
                     report += "\n"
             
             # Ranking capster
-            by_capster = monthly.groupby('Capster').agg({
-                'Price': 'sum',
-                'Service': 'count'
-            }).sort_values('Price', ascending=False)
-            
             if not user:
                 report += "Ranking Capster:\n"
-                for idx, (capster_name, row) in enumerate(by_capster.iterrows(), 1):
-                    amount = row['Price']
-                    count_capster = int(row['Service'])
+                for idx, (capster_name, amount, count_capster, _) in enumerate(summary.capster.rows('sum'), 1):
                     report += f"  {idx}. {capster_name}: {count_capster} layanan ({Formatter.format_currency(amount)})\n"
             
             # Service breakdown
-            service_breakdown = monthly.groupby('Service').agg({
-                'Price': ['sum', 'count']
-            }).sort_values(('Price', 'sum'), ascending=False)
-            
             report += "\nBreakdown Layanan:\n"
-            for service, row in service_breakdown.iterrows():
-                total_service = row[('Price', 'sum')]
-                count_service = int(row[('Price', 'count')])
+            for service, total_service, count_service, _ in summary.service.rows('sum'):
                 report += f"  • {service}: {count_service}x ({Formatter.format_currency(total_service)})\n"
             
-            if not user and 'Payment_Method' in monthly.columns:
-                payment_breakdown = monthly.groupby('Payment_Method')['Price'].sum().sort_values(ascending=False)
+            if not user and summary.payment is not None:
                 report += "\nMetode Pembayaran:\n"
-                for method, amount in payment_breakdown.items():
-                    pct = (amount / total * 100) if total > 0 else 0
-                    report += f"  {method}: {Formatter.format_currency(amount)} ({pct:.1f}%)\n"
+                for method, amount, _, share in summary.payment.rows('sum'):
+                    report += f"  {method}: {Formatter.format_currency(amount)} ({share * 100:.1f}%)\n"
+
+            if not user:
+                report += self._build_period_comparison(MonthSummary.from_slice(year, month, summary))
+                report += self._build_quarantine_note(year, month)
             
             logger.info(f"Monthly report for {month_display} generated successfully")
             return report
@@ -579,15 +598,17 @@ class ReportService:
     
     def generate_monthly_profit_report(self, year: Optional[int] = None, month: Optional[int] = None) -> str:
         """Generate monthly profit report with per-branch breakdown for a specific month and year."""
+        now = datetime.now()
+        year = now.year if year is None else year
+        month = now.month if month is None else month
+        months = [(year, month)] + [(y, m) for _, y, m in self._comparison_periods(year, month)]
+        return self._rendered('profit', (year, month), None, months,
+                              lambda: self._render_monthly_profit_report(year, month))
+
+    def _render_monthly_profit_report(self, year: int, month: int) -> str:
         logger.info(f"Generating monthly profit report with per-branch breakdown for {month}/{year}")
         
         try:
-            now = datetime.now()
-            if year is None:
-                year = now.year
-            if month is None:
-                month = now.month
-
             report_date = datetime(year, month, 1)
             month_display = report_date.strftime('%B %Y')
             
@@ -603,7 +624,7 @@ class ReportService:
 
             # --- Report Formatting ---
             report = f"{REPORT_PROFIT_HEADER.format(month=month_display)}\n"
-            report += f"⏰ Generated: {now.strftime('%d %b %Y, %H:%M:%S')}\n"
+            report += f"{self._generated('%d %b %Y, %H:%M:%S')}\n"
 
             # Overall Summary
             report += "\n" + "="*40 + "\n"
@@ -641,6 +662,8 @@ class ReportService:
                 profit_emoji_b = "✅" if net_profit >= 0 else "❌"
                 report += f"  {profit_emoji_b} Profit Bersih {branch_short}: {Formatter.format_currency(net_profit)}\n"
 
+            report += self._build_profit_comparison(year, month, total_revenue, total_net_profit)
+
             logger.info("Monthly profit report with breakdown generated successfully")
             return report
 
@@ -648,6 +671,187 @@ class ReportService:
             logger.error(f"Failed to generate monthly profit report: {e}", exc_info=True)
             return f"❌ Gagal membuat laporan profit bulanan: {str(e)}"
     
+    def generate_annual_profit_report(self, year: Optional[int] = None, compare: bool = True) -> str:
+        """
+        Generate the annual profit report: revenue, fixed cost, commission and net profit
+        per branch per month, yearly totals, best/worst month and (optionally) a
+        year-over-year comparison with the previous year. Both years come from one
+        call to the profit engine, which reuses its cached per-month aggregates.
+        """
+        if year is None:
+            year = datetime.now().year
+        years = [year - 1, year] if compare else [year]
+        return self._rendered('annual', (year, compare), None, [(y, m) for y in years for m in range(1, 13)],
+                              lambda: self._render_annual_profit_report(year, compare))
+
+    def _render_annual_profit_report(self, year: int, compare: bool) -> str:
+        logger.info(f"Generating annual profit report for {year}, compare={compare}")
+
+        try:
+            years = [year - 1, year] if compare else [year]
+            profit = self.profit.profit_frame([(y, m) for y in years for m in range(1, 13)])
+            current = profit[profit['Year'] == year]
+
+            if current.empty:
+                return f"📆 Tidak ada transaksi pada tahun {year}"
+
+            monthly = current.groupby('Month')[PROFIT_SUMMARY_COLUMNS].sum()
+
+            report = f"{REPORT_ANNUAL_HEADER.format(year=year)}\n"
+            report += f"{self._generated('%d %b %Y, %H:%M:%S')}\n"
+
+            # Per month, per branch
+            report += "\n" + "="*40 + "\n"
+            report += "PER BULAN\n"
+            report += "="*40 + "\n"
+            for month, rows in current.groupby('Month', sort=True):
+                total = monthly.loc[month]
+                emoji = "✅" if total['Net Profit'] >= 0 else "❌"
+                report += (f"{emoji} {MONTHS_ID[month]}: {Formatter.format_currency(total['Revenue'])} "
+                           f"→ profit {Formatter.format_currency(total['Net Profit'])}\n")
+                for _, row in rows.iterrows():
+                    report += (f"   • {row['Branch']}: {Formatter.format_currency(row['Revenue'])}"
+                               f" - tetap {Formatter.format_currency(row['Fixed Cost'])}"
+                               f" - komisi {Formatter.format_currency(row['Commission Cost'])}"
+                               f" = {Formatter.format_currency(row['Net Profit'])}\n")
+
+            # Yearly totals per branch
+            by_branch = current.groupby('Branch', sort=False)[PROFIT_SUMMARY_COLUMNS].sum()
+            totals = monthly.sum()
+            report += "\n" + "="*40 + "\n"
+            report += f"TOTAL {year} ({len(monthly)} bulan)\n"
+            report += "="*40 + "\n"
+            for branch, row in by_branch.iterrows():
+                report += f"🏢 {branch}: {Formatter.format_currency(row['Revenue'])} → profit {Formatter.format_currency(row['Net Profit'])}\n"
+            report += f"Total Pendapatan: {Formatter.format_currency(totals['Revenue'])}\n"
+            report += f"Total Biaya Tetap: {Formatter.format_currency(totals['Fixed Cost'])}\n"
+            report += f"Total Komisi: {Formatter.format_currency(totals['Commission Cost'])}\n"
+            profit_emoji = "✅" if totals['Net Profit'] >= 0 else "❌"
+            report += f"{profit_emoji} Profit Bersih: {Formatter.format_currency(totals['Net Profit'])}\n"
+
+            best, worst = monthly['Net Profit'].idxmax(), monthly['Net Profit'].idxmin()
+            report += f"\n🏆 Bulan terbaik: {MONTHS_ID[best]} ({Formatter.format_currency(monthly.loc[best, 'Net Profit'])})\n"
+            report += f"📉 Bulan terburuk: {MONTHS_ID[worst]} ({Formatter.format_currency(monthly.loc[worst, 'Net Profit'])})\n"
+
+            # Year over year, month by month
+            previous = profit[profit['Year'] == year - 1]
+            if compare and not previous.empty:
+                prev_monthly = previous.groupby('Month')[PROFIT_SUMMARY_COLUMNS].sum()
+                report += "\n" + "="*40 + "\n"
+                report += f"PERBANDINGAN {year - 1} → {year}\n"
+                report += "="*40 + "\n"
+                for month in sorted(set(monthly.index) | set(prev_monthly.index)):
+                    before = prev_monthly['Revenue'].get(month, 0)
+                    after = monthly['Revenue'].get(month, 0)
+                    report += f"  {MONTHS_ID[month][:3]}: {Formatter.format_currency(before)} → {Formatter.format_currency(after)}{self._format_change(before, after)}\n"
+                # Same months only, so a partial year is not compared with a full one
+                common = monthly.index.intersection(prev_monthly.index)
+                if len(common):
+                    for label, column in [('Pendapatan', 'Revenue'), ('Profit Bersih', 'Net Profit')]:
+                        before = prev_monthly.loc[common, column].sum()
+                        after = monthly.loc[common, column].sum()
+                        report += f"{label} ({len(common)} bulan sama): {Formatter.format_currency(before)} → {Formatter.format_currency(after)}{self._format_change(before, after)}\n"
+
+            logger.info(f"Annual profit report for {year} generated successfully")
+            return report
+
+        except Exception as e:
+            logger.error(f"Failed to generate annual profit report for {year}: {e}", exc_info=True)
+            return f"❌ Gagal membuat laporan profit tahunan: {str(e)}"
+
+    @staticmethod
+    def _comparison_periods(year: int, month: int) -> list:
+        """(label, year, month) of the previous month and the same month last year."""
+        prev_year, prev_month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return [
+            (f"vs Bulan Lalu ({MONTHS_ID[prev_month]} {prev_year})", prev_year, prev_month),
+            (f"vs Tahun Lalu ({MONTHS_ID[month]} {year - 1})", year - 1, month),
+        ]
+
+    def _build_period_comparison(self, current: MonthSummary, limit: int = 10) -> str:
+        """Month-over-month and year-over-year deltas of totals, branches and capsters.
+        Earlier months are read from the summary store, not recomputed from transactions."""
+        text = ""
+        for label, year, month in self._comparison_periods(current.year, current.month):
+            text += "\n" + "-"*40 + "\n"
+            text += f"📊 {label}\n"
+            text += "-"*40 + "\n"
+            try:
+                prior = self.summaries.get(year, month)
+            except Exception as e:
+                logger.error(f"Failed to load summary of {month}/{year}: {e}")
+                text += "  Data tidak tersedia\n"
+                continue
+            if not prior.count:
+                text += "  Tidak ada data\n"
+                continue
+
+            for name, before, after, currency in [
+                ('Pendapatan', prior.total, current.total, True),
+                ('Transaksi', prior.count, current.count, False),
+                ('Rata-rata/transaksi', prior.avg_ticket, current.avg_ticket, True),
+            ]:
+                values = (f"{Formatter.format_currency(before)} → {Formatter.format_currency(after)}"
+                          if currency else f"{before} → {after}")
+                text += f"  {name}: {values}{self._format_change(before, after)}\n"
+
+            for title, emoji, dimension in [('Per Cabang', '🏢', 'branch'), ('Per Capster', '✂️', 'capster')]:
+                now_values, prior_values = getattr(current, dimension), getattr(prior, dimension)
+                # Current month's order (by revenue), then labels only seen in the earlier month
+                labels = sorted(now_values, key=lambda k: -now_values[k][0])
+                labels += sorted(set(prior_values) - set(now_values), key=lambda k: -prior_values[k][0])
+                if not labels:
+                    continue
+                text += f"  {title}:\n"
+                for key in labels[:limit]:
+                    before = prior_values.get(key, (0, 0))[0]
+                    after = now_values.get(key, (0, 0))[0]
+                    text += f"    {emoji} {key}: {Formatter.format_currency(before)} → {Formatter.format_currency(after)}{self._format_change(before, after)}\n"
+        return text
+
+    def _build_quarantine_note(self, year: int, month: int, limit: int = 10) -> str:
+        """Warn about rows of the month's sheet left out because their date could not be parsed."""
+        quarantined = QUARANTINE.entries(self.mirror._sheet_name(year, month))
+        if not quarantined:
+            return ""
+        rows = ", ".join(str(row) for _, row, _ in quarantined[:limit])
+        more = f" (+{len(quarantined) - limit} lainnya)" if len(quarantined) > limit else ""
+        return f"\n⚠️ {len(quarantined)} baris diabaikan karena tanggal tidak valid: baris {rows}{more}\n"
+
+    def _build_profit_comparison(self, year: int, month: int, revenue: float, net_profit: float) -> str:
+        """Revenue and net profit against the previous month and the same month last year,
+        with the earlier months' branch revenue taken from the summary store."""
+        text = "\n" + "="*40 + "\n"
+        text += "PERBANDINGAN\n"
+        text += "="*40 + "\n"
+        for label, prior_year, prior_month in self._comparison_periods(year, month):
+            try:
+                prior = self.summaries.get(prior_year, prior_month)
+            except Exception as e:
+                logger.error(f"Failed to load summary of {prior_month}/{prior_year}: {e}")
+                prior = MonthSummary(prior_year, prior_month)
+            text += f"📊 {label}:\n"
+            if not prior.count:
+                text += "  Tidak ada data\n"
+                continue
+            revenue_df = pd.DataFrame(
+                [(prior_year, prior_month, branch, amount) for branch, (amount, _) in prior.branch.items()],
+                columns=REVENUE_COLUMNS,
+            )
+            prior_frame = self.profit.join_costs(revenue_df)
+            prior_revenue, prior_profit = prior_frame['Revenue'].sum(), prior_frame['Net Profit'].sum()
+            text += f"  Pendapatan: {Formatter.format_currency(prior_revenue)} → {Formatter.format_currency(revenue)}{self._format_change(prior_revenue, revenue)}\n"
+            text += f"  Profit Bersih: {Formatter.format_currency(prior_profit)} → {Formatter.format_currency(net_profit)}{self._format_change(prior_profit, net_profit)}\n"
+        return text
+
+    @staticmethod
+    def _format_change(before: float, after: float) -> str:
+        """' (+12.3%)' relative change, empty when there is no base to compare with."""
+        if not before:
+            return ""
+        change = (after - before) / abs(before) * 100
+        return f" ({change:+.1f}%)"
+
     def generate_monthly_profit_dataframe(self, year: int, month: int) -> pd.DataFrame:
         """
         Generate monthly profit data as a pandas DataFrame for a specific year and month.
@@ -656,58 +860,16 @@ class ReportService:
         logger.info(f"Generating monthly profit DataFrame for {month}/{year}")
 
         try:
-            # Get all transactions for the specified year
-            df = self._get_or_fetch_transactions(year=year)
-            
-            # Filter for the specific month and year
             month_str = f"{year:04d}-{month:02d}"
-            monthly_df = df[df['Date'].dt.strftime('%Y-%m') == month_str]
+            profit = self.profit.profit_frame([(year, month)])
 
-            if monthly_df.empty or 'Branch' not in monthly_df.columns:
-                logger.info(f"No transactions or 'Branch' column missing for {month_str}. Returning empty DataFrame.")
+            if profit.empty:
+                logger.info(f"No transactions for {month_str}. Returning empty DataFrame.")
                 return pd.DataFrame()
 
-            # Prepare results dictionary — loop all branches dynamically
-            results = {}
-            overall_revenue = 0
-            overall_fixed = 0
-            overall_commission = 0
-
-            for branch_id, branch_config in BRANCHES.items():
-                branch_short = branch_config.get('short', branch_id)
-                branch_df = monthly_df[monthly_df['Branch'] == branch_short]
-                revenue = branch_df['Price'].sum()
-
-                costs_config = branch_config.get('operational_cost', {})
-                fixed_costs = sum(costs_config.values())
-                commission_rate = branch_config.get('commission_rate', 0)
-                commission_cost = revenue * commission_rate
-                total_costs = fixed_costs + commission_cost
-                net_profit = revenue - total_costs
-
-                results[branch_short] = {
-                    'Revenue': revenue,
-                    'Fixed Cost': fixed_costs,
-                    'Commission Cost': commission_cost,
-                    'Operational Cost': total_costs,
-                    'Net Profit': net_profit,
-                }
-
-                overall_revenue += revenue
-                overall_fixed += fixed_costs
-                overall_commission += commission_cost
-
-            overall_operational = overall_fixed + overall_commission
-            results['Overall'] = {
-                'Revenue': overall_revenue,
-                'Fixed Cost': overall_fixed,
-                'Commission Cost': overall_commission,
-                'Operational Cost': overall_operational,
-                'Net Profit': overall_revenue - overall_operational,
-            }
-
-            # Convert results to DataFrame
-            profit_df = pd.DataFrame.from_dict(results, orient='index')
+            # One row per branch plus the overall total
+            profit_df = profit.set_index('Branch')[PROFIT_SUMMARY_COLUMNS]
+            profit_df.loc['Overall'] = profit_df.sum()
             profit_df.index.name = 'Category'
 
             return profit_df
@@ -722,72 +884,54 @@ class ReportService:
         """Filter DataFrame by timeframe string."""
         if timeframe_str == "minggu ini":
             start_date, end_date = self._get_week_range()
-            df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
+            df = TimeSlicer.between(df, start_date, end_date)
         elif timeframe_str == "bulan ini":
-            month_str = now.strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == month_str]
+            df = TimeSlicer.month(df, now.year, now.month)
         elif timeframe_str == "hari ini":
-            date_str = now.strftime('%Y-%m-%d')
-            df = df[df['Date'].dt.strftime('%Y-%m-%d') == date_str]
+            df = TimeSlicer.day(df, now)
         elif timeframe_str == "kemarin":
             yesterday = now - timedelta(days=1)
-            date_str = yesterday.strftime('%Y-%m-%d')
-            df = df[df['Date'].dt.strftime('%Y-%m-%d') == date_str]
+            df = TimeSlicer.day(df, yesterday)
         elif timeframe_str == "bulan lalu":
             first_day_of_current_month = now.replace(day=1)
             last_day_of_last_month = first_day_of_current_month - timedelta(days=1)
-            month_str = last_day_of_last_month.strftime('%Y-%m')
-            df = df[df['Date'].dt.strftime('%Y-%m') == month_str]
+            df = TimeSlicer.month(df, last_day_of_last_month.year, last_day_of_last_month.month)
         elif timeframe_str == "minggu lalu":
             start_date, _ = self._get_week_range()
             prev_start = start_date - timedelta(days=7)
             prev_end = start_date - timedelta(seconds=1)
-            df = df[(df['Date'] >= prev_start) & (df['Date'] <= prev_end)]
+            df = TimeSlicer.between(df, prev_start, prev_end)
         elif timeframe_str == "3 bulan terakhir":
-            three_months_ago = now - timedelta(days=90)
-            df = df[df['Date'] >= three_months_ago]
+            # Whole days: rollup cells are stamped at midnight
+            three_months_ago = (now - timedelta(days=90)).replace(hour=0, minute=0, second=0, microsecond=0)
+            df = TimeSlicer.since(df, three_months_ago)
         return df
 
-    def _build_capster_ranking(self, df: pd.DataFrame, limit: int = 10) -> str:
+    def _build_capster_ranking(self, summary: SliceSummary, limit: int = 10) -> str:
         """Build capster ranking context string."""
-        if df.empty or 'Capster' not in df.columns:
+        if not summary.capster:
             return ""
-        by_capster = df.groupby('Capster').agg(
-            revenue=('Price', 'sum'),
-            count=('Price', 'count')
-        ).sort_values('revenue', ascending=False).head(limit)
-
         lines = ["Ranking Capster:"]
-        for idx, (capster, row) in enumerate(by_capster.iterrows(), 1):
-            lines.append(f"  {idx}. {capster}: {int(row['count'])} layanan, pendapatan Rp {row['revenue']:,.0f}")
+        for idx, (capster, revenue, count, _) in enumerate(summary.capster.rows('sum', limit=limit), 1):
+            lines.append(f"  {idx}. {capster}: {count} layanan, pendapatan Rp {revenue:,.0f}")
         return "\n".join(lines)
 
-    def _build_branch_comparison(self, df: pd.DataFrame) -> str:
+    def _build_branch_comparison(self, summary: SliceSummary) -> str:
         """Build branch comparison context string."""
-        if df.empty or 'Branch' not in df.columns:
+        if not summary.branch:
             return ""
-        by_branch = df.groupby('Branch').agg(
-            revenue=('Price', 'sum'),
-            count=('Price', 'count')
-        ).sort_values('revenue', ascending=False)
-
         lines = ["Perbandingan Cabang:"]
-        for branch, row in by_branch.iterrows():
-            lines.append(f"  - {branch}: {int(row['count'])} transaksi, pendapatan Rp {row['revenue']:,.0f}")
+        for branch, revenue, count, _ in summary.branch.rows('sum'):
+            lines.append(f"  - {branch}: {count} transaksi, pendapatan Rp {revenue:,.0f}")
         return "\n".join(lines)
 
-    def _build_service_popularity(self, df: pd.DataFrame, limit: int = 10) -> str:
+    def _build_service_popularity(self, summary: SliceSummary, limit: int = 10) -> str:
         """Build service popularity context string."""
-        if df.empty or 'Service' not in df.columns:
+        if not summary.service:
             return ""
-        by_service = df.groupby('Service').agg(
-            count=('Price', 'count'),
-            revenue=('Price', 'sum')
-        ).sort_values('count', ascending=False).head(limit)
-
         lines = ["Layanan Terpopuler:"]
-        for idx, (service, row) in enumerate(by_service.iterrows(), 1):
-            lines.append(f"  {idx}. {service}: {int(row['count'])}x, pendapatan Rp {row['revenue']:,.0f}")
+        for idx, (service, revenue, count, _) in enumerate(summary.service.rows('count', limit=limit), 1):
+            lines.append(f"  {idx}. {service}: {count}x, pendapatan Rp {revenue:,.0f}")
         return "\n".join(lines)
 
     def _build_profit_context(self, year: int, month: int, timeframe_str: str) -> str:
@@ -809,29 +953,23 @@ class ReportService:
             logger.error(f"Failed to build profit context: {e}")
             return "Data profit tidak tersedia."
 
-    def _build_daily_breakdown(self, df: pd.DataFrame) -> str:
+    def _build_daily_breakdown(self, summary: SliceSummary) -> str:
         """Build daily breakdown context string."""
-        if df.empty:
+        if not summary.daily:
             return ""
-        daily = df.groupby(df['Date'].dt.date).agg(
-            revenue=('Price', 'sum'),
-            count=('Price', 'count')
-        ).sort_index()
-
         lines = ["Breakdown per Hari:"]
-        for date, row in daily.iterrows():
+        for date, revenue, count, _ in summary.daily.rows():
             day_name = pd.Timestamp(date).strftime('%A')
             day_name_id = self._translate_day(day_name)
-            lines.append(f"  {day_name_id}, {pd.Timestamp(date).strftime('%d %b')}: {int(row['count'])} transaksi, Rp {row['revenue']:,.0f}")
+            lines.append(f"  {day_name_id}, {pd.Timestamp(date).strftime('%d %b')}: {count} transaksi, Rp {revenue:,.0f}")
         return "\n".join(lines)
 
-    def _build_payment_methods(self, df: pd.DataFrame) -> str:
+    def _build_payment_methods(self, summary: SliceSummary) -> str:
         """Build payment method breakdown context string."""
-        if df.empty or 'Payment_Method' not in df.columns:
+        if not summary.payment:
             return ""
-        by_payment = df.groupby('Payment_Method')['Price'].sum().sort_values(ascending=False)
         lines = ["Metode Pembayaran:"]
-        for method, amount in by_payment.items():
+        for method, amount, _, _ in summary.payment.rows('sum'):
             lines.append(f"  - {method}: Rp {amount:,.0f}")
         return "\n".join(lines)
 
@@ -855,16 +993,16 @@ class ReportService:
         else:
             years_needed.add(now.year)
 
-        # 1. Fetch base data (merge multiple years if needed)
+        # 1. Fetch base data: rollup cube cells of the year(s) needed
         frames = []
-        for y in years_needed:
-            f = self._get_or_fetch_transactions(y)
+        for y in sorted(years_needed):
+            f = self.cache.get_rollup_year(y)
             if not f.empty:
                 frames.append(f)
 
         if not frames:
             return None
-        df = pd.concat(frames).drop_duplicates() if len(frames) > 1 else frames[0]
+        df = TransactionSchema.concat(frames) if len(frames) > 1 else frames[0]
 
         if df.empty:
             return None
@@ -875,22 +1013,18 @@ class ReportService:
 
         if query_result.specific_dates:
             # Filter to multiple discrete dates
-            date_strs = [d.strftime('%Y-%m-%d') for d in query_result.specific_dates]
-            df = df[df['Date'].dt.strftime('%Y-%m-%d').isin(date_strs)]
+            df = TimeSlicer.dates(df, query_result.specific_dates)
         elif query_result.specific_date and query_result.date_end:
             # Date range filter
             start_dt = query_result.specific_date
             end_dt = query_result.date_end.replace(hour=23, minute=59, second=59)
-            df = df[(df['Date'] >= start_dt) & (df['Date'] <= end_dt)]
+            df = TimeSlicer.between(df, start_dt, end_dt)
         elif query_result.specific_date:
             # Filter to exact date
-            target = query_result.specific_date
-            date_str = target.strftime('%Y-%m-%d')
-            df = df[df['Date'].dt.strftime('%Y-%m-%d') == date_str]
+            df = TimeSlicer.day(df, query_result.specific_date)
         elif query_result.specific_month and query_result.specific_year:
             # Filter to specific month
-            month_str = f"{query_result.specific_year:04d}-{query_result.specific_month:02d}"
-            df = df[df['Date'].dt.strftime('%Y-%m') == month_str]
+            df = TimeSlicer.month(df, query_result.specific_year, query_result.specific_month)
         else:
             df = self._filter_by_timeframe(df, timeframe_str, now)
 
@@ -904,7 +1038,7 @@ class ReportService:
                 # Expand aliases: e.g. "Zidan" also matches "timingemma"
                 for alias_name in alias_map.get(name_lower, []):
                     capster_filter.add(alias_name)
-            df = df[df['Capster'].str.lower().isin(capster_filter)]
+            df = self._filter_by_capster_names(df, capster_filter)
 
         # 4. Filter by branches
         if query_result.branches:
@@ -914,9 +1048,10 @@ class ReportService:
         if df.empty:
             return f"Data tidak ditemukan untuk periode '{timeframe_str}'."
 
-        # 5. Build context string
-        total_revenue = df['Price'].sum()
-        total_transactions = len(df)
+        # 5. Build context string from a single aggregation pass
+        summary = SliceAggregator.summarize(df)
+        total_revenue = summary.total
+        total_transactions = summary.count
         report_type = query_result.report_type or 'general'
         limit = query_result.limit or 10
 
@@ -933,17 +1068,17 @@ class ReportService:
 
         # Add report-type specific data
         if report_type in ('capster_ranking', 'general', 'monthly_summary', 'weekly_summary'):
-            ranking = self._build_capster_ranking(df, limit)
+            ranking = self._build_capster_ranking(summary, limit)
             if ranking:
                 context_parts.append(ranking)
 
         if report_type in ('branch_comparison', 'general', 'monthly_summary', 'weekly_summary'):
-            comparison = self._build_branch_comparison(df)
+            comparison = self._build_branch_comparison(summary)
             if comparison:
                 context_parts.append(comparison)
 
         if report_type in ('service_popularity', 'general', 'monthly_summary'):
-            popularity = self._build_service_popularity(df, limit)
+            popularity = self._build_service_popularity(summary, limit)
             if popularity:
                 context_parts.append(popularity)
 
@@ -958,13 +1093,13 @@ class ReportService:
             context_parts.append(profit_context)
 
         if report_type in ('daily_summary', 'weekly_summary', 'monthly_summary', 'general'):
-            daily = self._build_daily_breakdown(df)
+            daily = self._build_daily_breakdown(summary)
             if daily:
                 context_parts.append(daily)
 
         # Always include payment method for summaries
         if report_type in ('monthly_summary', 'weekly_summary', 'general'):
-            payments = self._build_payment_methods(df)
+            payments = self._build_payment_methods(summary)
             if payments:
                 context_parts.append(payments)
 
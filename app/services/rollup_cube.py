@@ -0,0 +1,89 @@
+"""
+Rollup Cube — revenue and count per (day, branch, capster, service, payment).
+
+Every aggregate report is a sum or count over a few of these dimensions, so
+it can be answered from the cube cells instead of the raw rows. A cube is
+built once from a month of transactions and then updated in place, one cell
+per new sale. The cube frame uses the transaction column names (Price holds
+the cell revenue, Count the number of sales), so it can be sliced by
+TimeSlicer and aggregated by SliceAggregator like a transaction frame.
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.utils.time_slicer import TimeSlicer
+from app.utils.transaction_schema import CATEGORY_COLUMNS, REGISTRY, TransactionSchema
+
+logger = logging.getLogger(__name__)
+
+# Cube dimensions besides the day
+DIMENSIONS = ['Branch', 'Capster', 'Service', 'Payment_Method']
+
+
+class RollupCube:
+    """Materialized day × branch × capster × service × payment rollup of one month."""
+
+    def __init__(self):
+        # (day, branch, capster, service, payment) -> [revenue, count]
+        self._cells: Dict[Tuple, list] = {}
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @staticmethod
+    def _key_columns(df: pd.DataFrame) -> list:
+        day = df['Date'].dt.normalize()
+        return [day] + [
+            df[col].astype(object) if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+            for col in DIMENSIONS
+        ]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'RollupCube':
+        """Build the cube from a month of transaction rows (one groupby)."""
+        cube = cls()
+        if df.empty:
+            return cube
+        keys = cls._key_columns(df)
+        grouped = df['Price'].groupby(keys, dropna=False, sort=False).agg(['sum', 'count'])
+        for key, revenue, count in zip(grouped.index, grouped['sum'].tolist(), grouped['count'].tolist()):
+            cube._cells[cls._clean(key)] = [int(revenue), int(count)]
+        return cube
+
+    @staticmethod
+    def _clean(key: Tuple) -> Tuple:
+        # Missing labels are stored as None, never NaN (NaN != NaN as a dict key)
+        return tuple(None if value is None or value != value else value for value in key)
+
+    def add(self, df: pd.DataFrame):
+        """Fold new transaction rows into the cube: one dict update per row."""
+        if df.empty:
+            return
+        keys = self._key_columns(df)
+        for *key, price in zip(*keys, df['Price'].tolist()):
+            cell = self._cells.setdefault(self._clean(key), [0, 0])
+            cell[0] += int(price)
+            cell[1] += 1
+        self._frame = None
+
+    def frame(self) -> pd.DataFrame:
+        """The cube as a Date-indexed frame with compact categorical dimensions."""
+        if self._frame is None:
+            self._frame = self._materialize()
+        return self._frame
+
+    def _materialize(self) -> pd.DataFrame:
+        if not self._cells:
+            return pd.DataFrame()
+        keys = list(self._cells.keys())
+        values = list(self._cells.values())
+        df = pd.DataFrame(keys, columns=['Date'] + DIMENSIONS)
+        df['Date'] = pd.to_datetime(df['Date'])
+        for col in CATEGORY_COLUMNS:
+            df[col] = REGISTRY.encode(col, df[col])
+        df['Price'] = pd.Series([v[0] for v in values], dtype='int64')
+        df['Count'] = pd.Series([v[1] for v in values], dtype='int64')
+        return TimeSlicer.index_by_date(TransactionSchema.add_capster_key(df))
@@ -0,0 +1,238 @@
+"""
+Sheets Governor — one gate for every Google Sheets API request.
+
+Reads and writes draw from separate token buckets sized from the per-minute
+quotas. Rate-limit (429) errors are retried with jittered exponential backoff;
+a Retry-After header pauses all requests until it has passed. Transient server
+errors are retried only for reads and idempotent writes, since an append that
+got a 5xx may already be in the sheet. Requests carry a priority, set per thread with
+``request_priority``: transaction writes go first, and background work
+(mirror sync, migrations, warm-ups) yields while any transaction write waits.
+"""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import gspread
+from gspread.exceptions import APIError
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Request priorities (lower runs first)
+PRIORITY_TRANSACTION = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+READ = 'read'
+WRITE = 'write'
+
+# gspread methods that only read; every other API method counts as a write
+READ_METHODS = {
+    'worksheets', 'worksheet', 'get_worksheet', 'get_worksheet_by_id', 'fetch_sheet_metadata',
+    'values_get', 'values_batch_get', 'batch_get', 'get', 'get_values', 'get_all_values',
+    'get_all_records', 'row_values', 'col_values', 'cell', 'acell', 'find', 'findall',
+}
+
+# Writes that can safely run twice (they set values, they do not add rows or sheets)
+IDEMPOTENT_WRITE_METHODS = {
+    'update', 'update_cell', 'update_acell', 'batch_update', 'values_update', 'values_batch_update',
+}
+
+# 429 means the request was rejected: safe to retry for any method. A 5xx may come back
+# after the request was applied, so it is only retried for reads and idempotent writes.
+RATE_LIMITED = 429
+SERVER_ERRORS = {500, 502, 503, 504}
+
+_local = threading.local()
+
+
+def current_priority() -> int:
+    return getattr(_local, 'priority', PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Run the Sheets requests made by this thread inside the block at the given priority."""
+    previous = current_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = max(per_minute, 1) / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_to_token(self) -> float:
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class SheetsGovernor:
+    """Rate limiting, prioritization and retry for Sheets API calls."""
+
+    def __init__(self, reads_per_minute: Optional[int] = None, writes_per_minute: Optional[int] = None,
+                 burst: Optional[int] = None, max_retries: Optional[int] = None,
+                 base_delay: float = 1.0, max_delay: float = 64.0):
+        burst = burst or settings.SHEETS_BURST
+        self._buckets = {
+            READ: _TokenBucket(reads_per_minute or settings.SHEETS_READS_PER_MINUTE, burst),
+            WRITE: _TokenBucket(writes_per_minute or settings.SHEETS_WRITES_PER_MINUTE, burst),
+        }
+        self.max_retries = settings.SHEETS_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, list] = {READ: [], WRITE: []}
+        self._seq = itertools.count()
+        # Set from Retry-After: no request starts before this (monotonic) time
+        self._blocked_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _must_yield(self, priority: int) -> bool:
+        """Background requests wait while a transaction write is queued. Caller holds _cond."""
+        return priority >= PRIORITY_BACKGROUND and any(
+            waiting and waiting[0][0] == PRIORITY_TRANSACTION for waiting in self._waiting.values()
+        )
+
+    def acquire(self, kind: str):
+        """Block until a request of this kind may start: not paused by Retry-After, first in
+        priority order for its bucket, and a token is available."""
+        bucket = self._buckets[kind]
+        priority = current_priority()
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiting[kind], entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    wait = self._blocked_until - now
+                    if wait <= 0:
+                        if self._waiting[kind][0] != entry or self._must_yield(priority):
+                            wait = None    # woken when the queue changes
+                        elif bucket.tokens >= 1:
+                            bucket.tokens -= 1
+                            self.calls += 1
+                            return
+                        else:
+                            wait = bucket.time_to_token()
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._waiting[kind].remove(entry)
+                heapq.heapify(self._waiting[kind])
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _status(error: APIError) -> Optional[int]:
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None)
+
+    @staticmethod
+    def _retry_after(error: APIError) -> Optional[float]:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            return max(0.0, float(headers.get('Retry-After')))
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential delay for a retry: uniform between base and base * 2^attempt (capped)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(min(self.base_delay, ceiling), ceiling)
+
+    @staticmethod
+    def retryable(kind: str, name: str, status: Optional[int]) -> bool:
+        """Whether a failed call may be sent again."""
+        if status == RATE_LIMITED:
+            return True
+        return status in SERVER_ERRORS and (kind == READ or name in IDEMPOTENT_WRITE_METHODS)
+
+    def execute(self, kind: str, func: Callable, *args, **kwargs) -> Any:
+        """Run one API call under the governor, retrying 429s (and server errors of reads and
+        idempotent writes)."""
+        name = getattr(func, '__name__', 'request')
+        for attempt in range(self.max_retries + 1):
+            self.acquire(kind)
+            try:
+                return func(*args, **kwargs)
+            except APIError as e:
+                status = self._status(e)
+                if not self.retryable(kind, name, status) or attempt == self.max_retries:
+                    raise
+                retry_after = self._retry_after(e)
+                delay = retry_after if retry_after is not None else self.backoff(attempt)
+                self.retries += 1
+                logger.warning(f"Sheets {kind} '{name}' got HTTP {status}; retry {attempt + 1}/{self.max_retries} "
+                               f"in {delay:.1f}s")
+                if status == RATE_LIMITED:
+                    # Quota is shared: hold every request back, not only this one
+                    with self._cond:
+                        self.throttled += 1
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                        self._cond.notify_all()
+                else:
+                    time.sleep(delay)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {'calls': self.calls, 'retries': self.retries, 'throttled': self.throttled,
+                    'waiting': {kind: len(waiting) for kind, waiting in self._waiting.items()}}
+
+
+class GovernedProxy:
+    """Wraps a gspread Spreadsheet or Worksheet so every API method goes through the governor.
+    Worksheets returned by the wrapped object are wrapped as well; plain attributes pass through."""
+
+    def __init__(self, target, governor: SheetsGovernor):
+        self._target = target
+        self._governor = governor
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+        kind = READ if name in READ_METHODS else WRITE
+
+        def call(*args, **kwargs):
+            return self._wrap(self._governor.execute(kind, attr, *args, **kwargs))
+
+        call.__name__ = name
+        return call
+
+    def _wrap(self, result):
+        if isinstance(result, gspread.Worksheet):
+            return GovernedProxy(result, self._governor)
+        if isinstance(result, list) and result and all(isinstance(item, gspread.Worksheet) for item in result):
+            return [GovernedProxy(item, self._governor) for item in result]
+        return result
+
+    def __repr__(self) -> str:
+        return f"Governed({self._target!r})"
@@ -1,9 +1,12 @@
 """
 Google Sheets Service
 """
+import json
 import logging
+import os
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import gspread
 from gspread.exceptions import WorksheetNotFound
 from oauth2client.service_account import ServiceAccountCredentials
@@ -11,16 +14,30 @@ import pandas as pd
 
 from app.config.settings import settings
 from app.config.constants import (
-    DATETIME_FORMAT, DATE_FORMAT, SHEET_CUSTOMERS, SHEET_CAPSTERS, MONTHS_ID,
+    DATETIME_FORMAT, SHEET_CUSTOMERS, SHEET_CAPSTERS, SHEET_SUMMARY, MONTHS_ID,
     SHEET_SERVICES, SHEET_BRANCHES, SHEET_PRODUCTS,
     SERVICES_MAIN, SERVICES_COLORING, BRANCHES, PRODUCTS,
 )
 from app.models.transaction import Transaction
+from app.services.sheets_governor import (
+    GovernedProxy, SheetsGovernor, PRIORITY_BACKGROUND, PRIORITY_TRANSACTION, request_priority,
+)
+from app.utils.row_index import RowIndex
+from app.utils.sheet_ingest import SheetIngest
+from app.utils.time_slicer import TimeSlicer
 
 logger = logging.getLogger(__name__)
 
 class SheetsService:
     """Google Sheets operations"""
+
+    # Columns of a monthly transaction sheet: Date..Branch
+    TRANSACTION_COLUMNS = 'A:F'
+    # Rows written by the transaction queue carry their journal entry id here (no header,
+    # so the column is left out of the parsed frames) to make a replayed flush idempotent
+    ENTRY_ID_COLUMN = 'G'
+    # Minimum time between worksheet title reloads triggered by unknown sheet names
+    TITLES_REFRESH_INTERVAL = timedelta(minutes=5)
     
     def __init__(self):
         """Initialize Google Sheets client"""
@@ -35,11 +52,27 @@ class SheetsService:
             )
             
             self.client = gspread.authorize(creds)
-            self.sheet = self.client.open_by_key(settings.GOOGLE_SHEET_ID)
+            # Every request (and those of the worksheets it returns) is rate limited,
+            # prioritized and retried by the governor
+            self.governor = SheetsGovernor()
+            self.sheet = GovernedProxy(self.client.open_by_key(settings.GOOGLE_SHEET_ID), self.governor)
             
-            # Initialize worksheet cache
+            # Initialize worksheet cache. Methods are called from the async
+            # facade's worker threads, so every access goes through the lock.
             self._worksheet_cache = {}
+            self._cache_lock = threading.RLock()
+            self._titles_loaded_at = datetime.min
             self._load_worksheet_titles()
+
+            # Write hooks so local caches follow writes made through this service
+            # (wired in bot.py to TransactionCache)
+            self.on_transaction_written = None   # (sheet_name, row)
+            self.on_transactions_edited = None   # (sheet_names)
+            self.on_config_written = None        # ()
+
+            # id -> row indexes of the config sheets (see _config_row)
+            self._row_indexes: Dict[str, RowIndex] = {}
+            self._config_lock = threading.RLock()
             
             logger.info("Google Sheets client initialized successfully")
             
@@ -51,49 +84,121 @@ class SheetsService:
         """Load all worksheet titles into cache."""
         try:
             worksheets = self.sheet.worksheets()
-            self._worksheet_cache = {ws.title: ws for ws in worksheets}
-            logger.info(f"Loaded {len(self._worksheet_cache)} worksheets into cache.")
+            with self._cache_lock:
+                self._worksheet_cache = {ws.title: ws for ws in worksheets}
+                self._titles_loaded_at = datetime.now()
+            logger.info(f"Loaded {len(worksheets)} worksheets into cache.")
         except Exception as e:
             logger.error(f"Failed to load worksheet titles into cache: {e}")
 
+    def _get_cached_worksheet(self, sheet_name: str):
+        """Return a worksheet from cache, or None if it is not cached."""
+        with self._cache_lock:
+            return self._worksheet_cache.get(sheet_name)
+
+    def _cache_worksheet(self, sheet_name: str, worksheet):
+        """Store a worksheet in cache. Keeps the first instance if another thread won the race."""
+        with self._cache_lock:
+            return self._worksheet_cache.setdefault(sheet_name, worksheet)
+
+    def _get_worksheet(self, sheet_name: str):
+        """Get a worksheet from cache or open it. Raises WorksheetNotFound if missing."""
+        worksheet = self._get_cached_worksheet(sheet_name)
+        if worksheet is None:
+            worksheet = self._cache_worksheet(sheet_name, self.sheet.worksheet(sheet_name))
+        return worksheet
+
     def _get_monthly_worksheet_name(self, date: datetime) -> str:
         """Helper to get the monthly worksheet name for a given date."""
         month_name = MONTHS_ID[date.month]
         return f"{month_name} {date.year}"
 
 
+    def _get_or_create_monthly_worksheet(self, sheet_name: str):
+        """Get a monthly transaction worksheet, creating it with headers if needed."""
+        worksheet = self._get_cached_worksheet(sheet_name)
+        if worksheet is not None:
+            return worksheet
+
+        # Hold the lock while creating so two concurrent sales in a new month
+        # don't both try to add the same worksheet.
+        with self._cache_lock:
+            worksheet = self._worksheet_cache.get(sheet_name)
+            if worksheet is not None:
+                return worksheet
+            try:
+                # It might have been created by another process
+                worksheet = self.sheet.worksheet(sheet_name)
+            except gspread.exceptions.WorksheetNotFound:
+                logger.info(f"Worksheet '{sheet_name}' not found. Creating it...")
+                worksheet = self.sheet.add_worksheet(title=sheet_name, rows="100", cols="20")
+                # Add headers to the new sheet
+                headers = ['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch']
+                worksheet.append_row(headers)
+            self._worksheet_cache[sheet_name] = worksheet
+            return worksheet
+
+    @staticmethod
+    def transaction_to_row(transaction: Transaction) -> list:
+        """Convert a transaction to a monthly sheet row."""
+        return [
+            transaction.date.strftime(DATETIME_FORMAT),
+            transaction.capster,
+            transaction.service,
+            transaction.price,
+            transaction.payment_method,
+            transaction.branch
+        ]
+
+    def _notify(self, hook, *args):
+        """Call a write hook; a failing hook must never fail the write itself."""
+        if hook is None:
+            return
+        try:
+            hook(*args)
+        except Exception as e:
+            logger.error(f"Write hook failed: {e}", exc_info=True)
+
+    def append_transaction_rows(self, sheet_name: str, rows: List[list]) -> bool:
+        """Append many transaction rows to one monthly sheet in a single API call."""
+        if not rows:
+            return True
+        try:
+            with request_priority(PRIORITY_TRANSACTION):
+                worksheet = self._get_or_create_monthly_worksheet(sheet_name)
+                worksheet.append_rows(rows)
+            logger.info(f"✅ {len(rows)} transaction(s) appended to '{sheet_name}'")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to append {len(rows)} row(s) to '{sheet_name}': {e}", exc_info=True)
+            return False
+
+    def get_entry_ids(self, sheet_name: str) -> Optional[set]:
+        """Journal entry ids already written to a monthly sheet (see ENTRY_ID_COLUMN).
+        A sheet that doesn't exist has none. Returns None if the request fails."""
+        if not self._existing_sheet_names([sheet_name]):
+            return set()
+        column = self.ENTRY_ID_COLUMN
+        try:
+            with request_priority(PRIORITY_TRANSACTION):
+                response = self.sheet.values_batch_get([self._a1_range(sheet_name, f"{column}:{column}")])
+        except Exception as e:
+            logger.error(f"Failed to read entry ids of '{sheet_name}': {e}")
+            return None
+        values = (response.get('valueRanges') or [{}])[0].get('values', [])
+        return {row[0] for row in values if row and row[0]}
+
     def add_transaction(self, transaction: Transaction) -> bool:
         """Add new transaction to the appropriate monthly sheet."""
         try:
             sheet_name = self._get_monthly_worksheet_name(transaction.date)
             
-            # Try to get the worksheet from cache
-            worksheet = self._worksheet_cache.get(sheet_name)
-
-            if worksheet is None:
-                # If not in cache, try to open it (it might have been created by another process)
-                try:
-                    worksheet = self.sheet.worksheet(sheet_name)
-                    self._worksheet_cache[sheet_name] = worksheet # Add to cache
-                except gspread.exceptions.WorksheetNotFound:
-                    logger.info(f"Worksheet '{sheet_name}' not found. Creating it...")
-                    worksheet = self.sheet.add_worksheet(title=sheet_name, rows="100", cols="20")
-                    # Add headers to the new sheet
-                    headers = ['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch']
-                    worksheet.append_row(headers)
-                    self._worksheet_cache[sheet_name] = worksheet # Add to cache
-            
-            row = [
-                transaction.date.strftime(DATETIME_FORMAT),
-                transaction.capster,
-                transaction.service,
-                transaction.price,
-                transaction.payment_method,
-                transaction.branch 
-            ]
-            
-            worksheet.append_row(row)
+            row = self.transaction_to_row(transaction)
+            with request_priority(PRIORITY_TRANSACTION):
+                worksheet = self._get_or_create_monthly_worksheet(sheet_name)
+                worksheet.append_row(row)
             logger.info(f"✅ Transaction saved to '{sheet_name}': {transaction}")
+            self._notify(self.on_transaction_written, sheet_name, row)
             
             return True
         
@@ -101,32 +206,103 @@ class SheetsService:
             logger.error(f"❌ Failed to add transaction to monthly sheet: {e}", exc_info=True)
             return False
     
-    def _records_to_dataframe(self, records: List[Dict[str, Any]], sheet_name: str = "Unknown") -> pd.DataFrame:
-        """Convert list of records to a DataFrame and parse dates."""
-        if not records:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(records)
+    def _values_to_dataframe(self, all_values: List[List[str]], sheet_name: str = "Unknown",
+                             first_row: int = 2) -> pd.DataFrame:
+        """Convert raw sheet values (header row + data rows) to a compact DataFrame.
+        first_row is the sheet row number of the first data row (see SheetIngest)."""
+        return SheetIngest.to_dataframe(all_values, sheet_name, first_row)
+
+    @staticmethod
+    def _a1_range(sheet_name: str, cells: str) -> str:
+        """Build an A1 range for a sheet, quoting the title (e.g. 'Januari 2026'!A:F)."""
+        return "'{}'!{}".format(sheet_name.replace("'", "''"), cells)
+
+    def _existing_sheet_names(self, sheet_names: List[str]) -> List[str]:
+        """Filter sheet names to those present in the worksheet cache.
+        Reloads the titles once when some are missing, in case they were created elsewhere."""
+        with self._cache_lock:
+            missing = [n for n in sheet_names if n not in self._worksheet_cache]
+        if missing and datetime.now() - self._titles_loaded_at > self.TITLES_REFRESH_INTERVAL:
+            self._load_worksheet_titles()
+        with self._cache_lock:
+            return [n for n in sheet_names if n in self._worksheet_cache]
 
-        # Convert 'Price' column to numeric (get_all_values returns strings)
-        if 'Price' in df.columns:
-            df['Price'] = pd.to_numeric(df['Price'], errors='coerce').fillna(0).astype(int)
+    def get_monthly_values(self, sheet_names: List[str]) -> Optional[Dict[str, List[List[str]]]]:
+        """Get the raw values (header + rows) of several monthly sheets in one values_batch_get request.
+        Sheets that don't exist are left out. Returns None if the request fails."""
+        existing = self._existing_sheet_names(sheet_names)
+        if not existing:
+            return {}
 
-        # Convert 'Date' column to datetime, trying multiple formats
-        df['Date'] = pd.to_datetime(df['Date'], format=DATETIME_FORMAT, errors='coerce')
+        try:
+            ranges = [self._a1_range(name, self.TRANSACTION_COLUMNS) for name in existing]
+            response = self.sheet.values_batch_get(ranges)
+        except Exception as e:
+            logger.error(f"Failed to batch-get transactions for {len(existing)} sheet(s): {e}")
+            return None
+
+        logger.info(f"Loaded {len(existing)} monthly sheet(s) in one batch request.")
+        return {
+            name: value_range.get('values', [])
+            for name, value_range in zip(existing, response.get('valueRanges', []))
+        }
+
+    def get_monthly_tails(self, offsets: Dict[str, int]) -> Optional[Dict[str, Dict[str, List[List[str]]]]]:
+        """Get only the rows appended after a known row count, for several sheets in one request.
+
+        ``offsets`` maps sheet name -> number of sheet rows already ingested (header included).
+        For each sheet returns ``{'head': rows 1-2, 'anchor': row n, 'tail': rows n+1..}``
+        so the caller can verify that the ingested part hasn't changed.
+        Returns None if the request fails (e.g. rows were deleted and row n no longer exists)."""
+        if not offsets:
+            return {}
+
+        # Tail range starts at the anchor row itself: an open range starting past the
+        # grid's last row is rejected by the API, while row n is known to exist.
+        ranges = []
+        for name, row_count in offsets.items():
+            ranges.append(self._a1_range(name, 'A1:F2'))
+            ranges.append(self._a1_range(name, f"A{row_count}:F"))
 
-        failed_rows = df['Date'].isnull()
-        if failed_rows.any():
-            original_dates_on_fail = pd.DataFrame(records).loc[failed_rows, 'Date']
-            df.loc[failed_rows, 'Date'] = pd.to_datetime(original_dates_on_fail, format=DATE_FORMAT, errors='coerce')
+        try:
+            response = self.sheet.values_batch_get(ranges)
+        except Exception as e:
+            logger.error(f"Failed to fetch new rows for {len(offsets)} sheet(s): {e}")
+            return None
+
+        value_ranges = [vr.get('values', []) for vr in response.get('valueRanges', [])]
+        tails = {}
+        for i, name in enumerate(offsets):
+            head, anchor_and_tail = value_ranges[2 * i:2 * i + 2]
+            tails[name] = {
+                'head': head,
+                'anchor': anchor_and_tail[:1],
+                'tail': anchor_and_tail[1:],
+            }
+        return tails
+
+    def get_transactions_for_months(self, months: List[Tuple[int, int]]) -> pd.DataFrame:
+        """Get transactions for any set of (year, month) pairs in a single values_batch_get request.
+        Months without a worksheet are skipped using the cached worksheet titles."""
+        sheet_names = []
+        for year, month in months:
+            name = f"{MONTHS_ID[month]} {year}"
+            if name not in sheet_names:
+                sheet_names.append(name)
+
+        values_by_sheet = self.get_monthly_values(sheet_names)
+        if not values_by_sheet:
+            return pd.DataFrame()
 
-        # Log and drop rows with invalid dates after trying all formats
-        invalid_count = df['Date'].isnull().sum()
-        if invalid_count > 0:
-            logger.warning(f"Dropping {invalid_count} rows with unparseable dates in sheet '{sheet_name}'.")
-            df = df.dropna(subset=['Date'])
+        all_dfs = []
+        for name, values in values_by_sheet.items():
+            df = self._values_to_dataframe(values, name)
+            if not df.empty:
+                all_dfs.append(df)
 
-        return df
+        if not all_dfs:
+            return pd.DataFrame()
+        return pd.concat(all_dfs, ignore_index=True)
 
     def get_transactions_by_month(self, year: int, month: int) -> pd.DataFrame:
         """Efficiently get all transactions for a specific month as a DataFrame."""
@@ -134,20 +310,13 @@ class SheetsService:
         sheet_name = f"{month_name} {year}"
 
         try:
-            worksheet = self._worksheet_cache.get(sheet_name)
-            if worksheet is None:
-                worksheet = self.sheet.worksheet(sheet_name)
-                self._worksheet_cache[sheet_name] = worksheet
+            worksheet = self._get_worksheet(sheet_name)
 
             # Use get_all_values() instead of get_all_records() to avoid
             # gspread error when header row has duplicate empty cells
             # (worksheets created with cols > number of actual headers).
             all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return pd.DataFrame()
-            headers = all_values[0]
-            records = [dict(zip(headers, row)) for row in all_values[1:] if any(row)]
-            return self._records_to_dataframe(records, sheet_name)
+            return self._values_to_dataframe(all_values, sheet_name)
         
         except gspread.exceptions.WorksheetNotFound:
             logger.info(f"Worksheet '{sheet_name}' not found for month {year}-{month}. Returning empty DataFrame.")
@@ -158,42 +327,17 @@ class SheetsService:
 
     def get_all_transactions(self, year: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get all transactions from all monthly sheets for a given year."""
-        if year is None:
-            year = datetime.now().year
-        
-        all_records = []
-        
-        for month_num in range(1, 13):
-            month_name = MONTHS_ID[month_num]
-            sheet_name = f"{month_name} {year}"
-            
-            try:
-                # Use the more efficient method to get a DataFrame, then convert to dicts
-                df = self.get_transactions_by_month(year, month_num)
-                if not df.empty:
-                    # To keep the original return type, we convert the DataFrame back to records.
-                    # Note: This might have performance implications if the caller doesn't actually need dicts.
-                    all_records.extend(df.to_dict('records'))
-            except Exception as e:
-                logger.error(f"Failed to get records from '{sheet_name}': {e}")
-        
-        return all_records
+        df = self.get_transactions_dataframe(year)
+        if df.empty:
+            return []
+        # To keep the original return type, we convert the DataFrame back to records.
+        return df.to_dict('records')
     
     def get_transactions_dataframe(self, year: Optional[int] = None) -> pd.DataFrame:
         """Get transactions as a pandas DataFrame for a given year."""
         if year is None:
             year = datetime.now().year
-
-        all_dfs = []
-        for month_num in range(1, 13):
-            df = self.get_transactions_by_month(year, month_num)
-            if not df.empty:
-                all_dfs.append(df)
-        
-        if not all_dfs:
-            return pd.DataFrame()
-        
-        return pd.concat(all_dfs, ignore_index=True)
+        return self.get_transactions_for_months([(year, month) for month in range(1, 13)])
     
     def get_transactions_by_date(self, date: datetime) -> pd.DataFrame:
         """Get transactions for a specific date from its monthly sheet."""
@@ -202,19 +346,16 @@ class SheetsService:
         if df.empty:
             return pd.DataFrame()
         
-        date_str = date.strftime(DATE_FORMAT)
-        return df[df['Date'].dt.strftime(DATE_FORMAT) == date_str]
+        return TimeSlicer.day(df, date)
     
     def get_transactions_by_range(self, start: datetime, end: datetime) -> pd.DataFrame:
         """Get transactions within a date range from relevant monthly sheets."""
         
-        all_dfs_in_range = []
+        months = []
         current_date = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         while current_date <= end:
-            df = self.get_transactions_by_month(current_date.year, current_date.month)
-            if not df.empty:
-                all_dfs_in_range.append(df)
+            months.append((current_date.year, current_date.month))
             
             # Move to the next month
             if current_date.month == 12:
@@ -222,10 +363,9 @@ class SheetsService:
             else:
                 current_date = current_date.replace(month=current_date.month + 1)
 
-        if not all_dfs_in_range:
+        combined_df = self.get_transactions_for_months(months)
+        if combined_df.empty:
             return pd.DataFrame()
-        
-        combined_df = pd.concat(all_dfs_in_range, ignore_index=True)
 
         # Filter by exact start and end dates
         # Ensure 'Date' column is datetime type before filtering
@@ -262,6 +402,127 @@ class SheetsService:
             logger.error(f"Failed to get customers: {e}")
             return []
 
+    # --- Config Sheet Row Index ---
+
+    # Key column of each config sheet
+    _CONFIG_KEYS = {
+        SHEET_CAPSTERS: 'TelegramID',
+        SHEET_SERVICES: 'ServiceID',
+        SHEET_BRANCHES: 'BranchID',
+        SHEET_PRODUCTS: 'ProductID',
+    }
+
+    def _index_config_values(self, sheet_name: str, all_values: List[List[str]]) -> RowIndex:
+        """(Re)build a config sheet's row index from a full read of its values."""
+        index = RowIndex(all_values, self._CONFIG_KEYS[sheet_name])
+        with self._config_lock:
+            self._row_indexes[sheet_name] = index
+        return index
+
+    def _rebuild_config_index(self, sheet_name: str, worksheet) -> RowIndex:
+        logger.info(f"Rebuilding row index of '{sheet_name}'")
+        return self._index_config_values(sheet_name, worksheet.get_all_values())
+
+    def _config_row(self, sheet_name: str, worksheet, key) -> Tuple[Optional[int], RowIndex]:
+        """Sheet row of a key in a config sheet, and the index it came from.
+
+        The index is trusted without a read: it follows the appends and deletes made here
+        and is rebuilt by every config load, which also picks up rows and headers changed
+        by hand. Only an unknown key costs a full read. Caller holds _config_lock.
+        """
+        index = self._row_indexes.get(sheet_name)
+        row = index.row_of(key) if index is not None else None
+        if row is None:
+            index = self._rebuild_config_index(sheet_name, worksheet)
+            row = index.row_of(key)
+        return row, index
+
+    def _write_config_row(self, sheet_name: str, worksheet, key,
+                          write: Callable[[int, RowIndex], None]) -> bool:
+        """Run write(row, index) against a key's row. When the write fails (e.g. the row
+        moved past the end of the sheet) the index is rebuilt from a full read and the
+        write is tried once more. False if the key is unknown."""
+        with self._config_lock:
+            row, index = self._config_row(sheet_name, worksheet, key)
+            if row is None:
+                return False
+            try:
+                write(row, index)
+            except Exception as e:
+                logger.info(f"Write to row {row} of '{sheet_name}' failed ({e}), re-indexing")
+                index = self._rebuild_config_index(sheet_name, worksheet)
+                row = index.row_of(key)
+                if row is None:
+                    return False
+                write(row, index)
+            return True
+
+    @staticmethod
+    def _values_to_records(all_values: List[List[str]]) -> List[Dict[str, Any]]:
+        """Header + rows to one dict per non-empty row (like the get_all_* config readers)."""
+        if len(all_values) <= 1:
+            return []
+        headers = all_values[0]
+        return [dict(zip(headers, row)) for row in all_values[1:] if any(row)]
+
+    def get_config_values(self) -> Optional[Dict[str, List[List[str]]]]:
+        """Raw values of the four config sheets in one values_batch_get request.
+        Missing sheets are created (and seeded) first; the row indexes are rebuilt from the
+        result. Returns None if the request fails."""
+        ensure = {
+            SHEET_SERVICES: self._ensure_service_sheet,
+            SHEET_BRANCHES: self._ensure_branch_config_sheet,
+            SHEET_PRODUCTS: self._ensure_product_sheet,
+            SHEET_CAPSTERS: self._ensure_capster_sheet,
+        }
+        try:
+            existing = self._existing_sheet_names(list(ensure))
+            for name, ensure_sheet in ensure.items():
+                if name not in existing:
+                    ensure_sheet()
+            response = self.sheet.values_batch_get([self._a1_range(name, 'A:Z') for name in ensure])
+        except Exception as e:
+            logger.error(f"Failed to batch-get config sheets: {e}")
+            return None
+
+        values = {
+            name: value_range.get('values', [])
+            for name, value_range in zip(ensure, response.get('valueRanges', []))
+        }
+        for name, all_values in values.items():
+            self._index_config_values(name, all_values)
+        logger.info(f"Loaded {len(values)} config sheet(s) in one batch request.")
+        return values
+
+    def _append_config_row(self, sheet_name: str, worksheet, key, values: list):
+        """Append a config row and record it in the index (dropped when the row landed
+        somewhere other than right after the last known row)."""
+        with self._config_lock:
+            response = worksheet.append_row(values)
+            index = self._row_indexes.get(sheet_name)
+            if index is not None and not index.appended(key, RowIndex.updated_row(response)):
+                del self._row_indexes[sheet_name]
+
+    def _update_config_row(self, sheet_name: str, worksheet, key, fields: Dict[str, Any]) -> bool:
+        """Write the given columns of a keyed config row in one request. False if the key is unknown."""
+        def write(row: int, index: RowIndex):
+            cells = [
+                {'range': gspread.utils.rowcol_to_a1(row, index.column(field)), 'values': [[value]]}
+                for field, value in fields.items() if index.column(field)
+            ]
+            if cells:
+                worksheet.batch_update(cells, value_input_option='USER_ENTERED')
+
+        return self._write_config_row(sheet_name, worksheet, key, write)
+
+    def _delete_config_row(self, sheet_name: str, worksheet, key) -> bool:
+        """Delete a keyed config row. False if the key is unknown."""
+        def write(row: int, index: RowIndex):
+            worksheet.delete_rows(row)
+            index.removed(row)
+
+        return self._write_config_row(sheet_name, worksheet, key, write)
+
     # --- Capster Management ---
 
     _CAPSTER_HEADERS = ['Name', 'TelegramID', 'Alias']
@@ -269,28 +530,29 @@ class SheetsService:
     def _ensure_capster_sheet(self):
         """Create CapsterList sheet with headers if it doesn't exist."""
         try:
-            worksheet = self._worksheet_cache.get(SHEET_CAPSTERS)
+            worksheet = self._get_cached_worksheet(SHEET_CAPSTERS)
             if worksheet is None:
-                try:
-                    worksheet = self.sheet.worksheet(SHEET_CAPSTERS)
-                except WorksheetNotFound:
-                    logger.info(f"Creating '{SHEET_CAPSTERS}' sheet...")
-                    worksheet = self.sheet.add_worksheet(title=SHEET_CAPSTERS, rows="100", cols="5")
-                    worksheet.append_row(self._CAPSTER_HEADERS)
+                with self._cache_lock:
+                    try:
+                        worksheet = self.sheet.worksheet(SHEET_CAPSTERS)
+                    except WorksheetNotFound:
+                        logger.info(f"Creating '{SHEET_CAPSTERS}' sheet...")
+                        worksheet = self.sheet.add_worksheet(title=SHEET_CAPSTERS, rows="100", cols="5")
+                        worksheet.append_row(self._CAPSTER_HEADERS)
+                        self._worksheet_cache[SHEET_CAPSTERS] = worksheet
+                        return worksheet
+
+                    # Sheet exists — verify/upgrade headers
+                    first_row = worksheet.row_values(1)
+                    if not first_row or first_row[0] != 'Name':
+                        logger.info(f"'{SHEET_CAPSTERS}' sheet missing headers, adding them...")
+                        worksheet.insert_row(self._CAPSTER_HEADERS, index=1)
+                    elif len(first_row) < 3 or first_row[2] != 'Alias':
+                        # Upgrade: add Alias column header
+                        logger.info(f"Upgrading '{SHEET_CAPSTERS}' headers with Alias column...")
+                        worksheet.update_cell(1, 3, 'Alias')
+
                     self._worksheet_cache[SHEET_CAPSTERS] = worksheet
-                    return worksheet
-
-                # Sheet exists — verify/upgrade headers
-                first_row = worksheet.row_values(1)
-                if not first_row or first_row[0] != 'Name':
-                    logger.info(f"'{SHEET_CAPSTERS}' sheet missing headers, adding them...")
-                    worksheet.insert_row(self._CAPSTER_HEADERS, index=1)
-                elif len(first_row) < 3 or first_row[2] != 'Alias':
-                    # Upgrade: add Alias column header
-                    logger.info(f"Upgrading '{SHEET_CAPSTERS}' headers with Alias column...")
-                    worksheet.update_cell(1, 3, 'Alias')
-
-                self._worksheet_cache[SHEET_CAPSTERS] = worksheet
             return worksheet
         except Exception as e:
             logger.error(f"Failed to ensure capster sheet: {e}", exc_info=True)
@@ -300,8 +562,9 @@ class SheetsService:
         """Add a new capster to the CapsterList sheet."""
         try:
             worksheet = self._ensure_capster_sheet()
-            worksheet.append_row(capster.to_row())
+            self._append_config_row(SHEET_CAPSTERS, worksheet, capster.telegram_id, capster.to_row())
             logger.info(f"Capster added: {capster.name} ({capster.telegram_id})")
+            self._notify(self.on_config_written)
             return True
         except Exception as e:
             logger.error(f"Failed to add capster: {e}", exc_info=True)
@@ -312,6 +575,7 @@ class SheetsService:
         try:
             worksheet = self._ensure_capster_sheet()
             all_values = worksheet.get_all_values()
+            self._index_config_values(SHEET_CAPSTERS, all_values)
             if len(all_values) <= 1:
                 # Only header or empty
                 return []
@@ -325,14 +589,10 @@ class SheetsService:
         """Remove a capster by telegram_id from the CapsterList sheet."""
         try:
             worksheet = self._ensure_capster_sheet()
-            records = worksheet.get_all_records()
-
-            for i, rec in enumerate(records):
-                if int(rec.get('TelegramID', 0)) == telegram_id:
-                    # Row index: +2 because row 1 is header, records are 0-indexed
-                    worksheet.delete_rows(i + 2)
-                    logger.info(f"Capster with TelegramID {telegram_id} removed from sheet.")
-                    return True
+            if self._delete_config_row(SHEET_CAPSTERS, worksheet, telegram_id):
+                logger.info(f"Capster with TelegramID {telegram_id} removed from sheet.")
+                self._notify(self.on_config_written)
+                return True
 
             logger.warning(f"Capster with TelegramID {telegram_id} not found in sheet.")
             return False
@@ -344,18 +604,12 @@ class SheetsService:
         """Update capster data by telegram_id."""
         try:
             worksheet = self._ensure_capster_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-
-            for i, row in enumerate(all_values[1:], start=2):
-                if len(row) >= 2 and str(row[1]).strip() == str(telegram_id):
-                    if name is not None:
-                        worksheet.update_cell(i, 1, name)
-                    if alias is not None:
-                        worksheet.update_cell(i, 3, alias)
-                    logger.info(f"Capster {telegram_id} updated: name={name}, alias={alias}")
-                    return True
+            fields = {'Name': name, 'Alias': alias}
+            fields = {field: value for field, value in fields.items() if value is not None}
+            if self._update_config_row(SHEET_CAPSTERS, worksheet, telegram_id, fields):
+                logger.info(f"Capster {telegram_id} updated: name={name}, alias={alias}")
+                self._notify(self.on_config_written)
+                return True
 
             logger.warning(f"Capster {telegram_id} not found for update.")
             return False
@@ -363,44 +617,127 @@ class SheetsService:
             logger.error(f"Failed to update capster: {e}", exc_info=True)
             return False
 
-    def migrate_capster_names(self, alias_to_real: dict) -> dict:
+    # Sheets that never hold transactions (skipped by the capster name migration)
+    _NON_TRANSACTION_SHEETS = (SHEET_CUSTOMERS, SHEET_CAPSTERS, SHEET_SUMMARY,
+                               SHEET_SERVICES, SHEET_BRANCHES, SHEET_PRODUCTS)
+    # Progress of an interrupted capster name migration (in DATA_DIR)
+    MIGRATION_STATE_FILE = 'capster_migration.json'
+
+    @staticmethod
+    def _plan_capster_renames(values: List[List[str]], alias_to_real: dict) -> List[Tuple[int, str]]:
+        """(sheet row number, new name) of every row whose Capster is a known alias."""
+        if len(values) <= 1 or 'Capster' not in values[0]:
+            return []
+        capster_col = values[0].index('Capster')
+        changes = []
+        for row_idx, row in enumerate(values[1:], start=2):
+            if capster_col < len(row):
+                old_name = row[capster_col].strip()
+                new_name = alias_to_real.get(old_name.lower())
+                if new_name and new_name != old_name:
+                    changes.append((row_idx, new_name))
+        return changes
+
+    def _rename_ranges(self, sheet_name: str, capster_col: int, changes: List[Tuple[int, str]]) -> List[dict]:
+        """values_batch_update data for the changes; consecutive rows share one range."""
+        runs = []  # [first_row, last_row, values]
+        for row_idx, new_name in changes:
+            if runs and runs[-1][1] == row_idx - 1:
+                runs[-1][1] = row_idx
+                runs[-1][2].append([new_name])
+            else:
+                runs.append([row_idx, row_idx, [[new_name]]])
+        column = gspread.utils.rowcol_to_a1(1, capster_col + 1)[:-1]
+        return [
+            {'range': self._a1_range(sheet_name, f"{column}{first}:{column}{last}"), 'values': values}
+            for first, last, values in runs
+        ]
+
+    def _migration_state_path(self, state_path: Optional[str] = None) -> str:
+        return state_path or os.path.join(settings.DATA_DIR, self.MIGRATION_STATE_FILE)
+
+    def _load_migration_state(self, path: str, aliases: list) -> Dict[str, int]:
+        """Sheets finished by an interrupted run with the same alias map ({sheet: updated rows})."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('aliases') == aliases:
+                return dict(state.get('done', {}))
+            logger.info("Ignoring capster migration progress of a different alias map")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Unreadable capster migration progress {path}: {e}")
+        return {}
+
+    def _save_migration_state(self, path: str, aliases: list, done: Dict[str, int]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'aliases': aliases, 'done': done}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def capster_migration_pending(self, state_path: Optional[str] = None) -> bool:
+        """True when an earlier capster name migration was interrupted (run it again to resume)."""
+        return os.path.exists(self._migration_state_path(state_path))
+
+    def migrate_capster_names(self, alias_to_real: dict, progress: Optional[Callable] = None,
+                              state_path: Optional[str] = None) -> dict:
         """Batch rename capster names in all monthly transaction sheets.
         alias_to_real: {old_name_lower: new_real_name}
+        progress: optional callback (sheets_done, sheets_total, sheet_name, updated) after each sheet
         Returns: {sheet_name: count_of_updated_rows}
+
+        All sheets are read in one values_batch_get; the renames of each sheet are written
+        in one values_batch_update. Finished sheets are recorded in MIGRATION_STATE_FILE,
+        so an interrupted migration resumes with the remaining sheets.
         """
+        path = self._migration_state_path(state_path)
+        aliases = [list(item) for item in sorted(alias_to_real.items())]  # as stored in JSON
         results = {}
         try:
-            worksheets = self.sheet.worksheets()
-            for ws in worksheets:
-                title = ws.title
-                # Skip non-transaction sheets
-                if title in (SHEET_CUSTOMERS, SHEET_CAPSTERS, 'Summary'):
-                    continue
-
-                all_values = ws.get_all_values()
-                if len(all_values) <= 1:
-                    continue
-
-                headers = all_values[0]
-                if 'Capster' not in headers:
-                    continue
-
-                capster_col = headers.index('Capster')
-                updated = 0
-                for row_idx, row in enumerate(all_values[1:], start=2):
-                    if capster_col < len(row):
-                        old_name = row[capster_col].strip()
-                        new_name = alias_to_real.get(old_name.lower())
-                        if new_name and new_name != old_name:
-                            ws.update_cell(row_idx, capster_col + 1, new_name)
-                            updated += 1
-
-                if updated > 0:
-                    results[title] = updated
-                    logger.info(f"Migrated {updated} rows in '{title}'")
+            with request_priority(PRIORITY_BACKGROUND):
+                done = self._load_migration_state(path, aliases)
+                if done:
+                    logger.info(f"Resuming capster migration, {len(done)} sheet(s) already done")
+                # Written up front so a run failing at any point is seen as pending
+                self._save_migration_state(path, aliases, done)
+                results.update({name: count for name, count in done.items() if count})
+
+                titles = [ws.title for ws in self.sheet.worksheets()
+                          if ws.title not in self._NON_TRANSACTION_SHEETS]
+                pending = [title for title in titles if title not in done]
+                total = len(titles)
+                if pending:
+                    response = self.sheet.values_batch_get([self._a1_range(title, 'A:Z') for title in pending])
+                    sheet_values = zip(pending, response.get('valueRanges', []))
+                else:
+                    sheet_values = []
+
+                for title, value_range in sheet_values:
+                    values = value_range.get('values', [])
+                    changes = self._plan_capster_renames(values, alias_to_real)
+                    if changes:
+                        capster_col = values[0].index('Capster')
+                        self.sheet.values_batch_update(body={
+                            'valueInputOption': 'RAW',
+                            'data': self._rename_ranges(title, capster_col, changes),
+                        })
+                        results[title] = len(changes)
+                        logger.info(f"Migrated {len(changes)} rows in '{title}'")
+                    done[title] = len(changes)
+                    self._save_migration_state(path, aliases, done)
+                    if progress:
+                        progress(len(done), total, title, len(changes))
+
+            # Every sheet done: nothing left to resume
+            if os.path.exists(path):
+                os.remove(path)
 
         except Exception as e:
             logger.error(f"Migration failed: {e}", exc_info=True)
+        if results:
+            self._notify(self.on_transactions_edited, list(results))
         return results
 
     # --- Service Config Management ---
@@ -410,27 +747,28 @@ class SheetsService:
     def _ensure_service_sheet(self):
         """Create ServiceList sheet with headers if it doesn't exist. Seed from hardcoded defaults."""
         try:
-            worksheet = self._worksheet_cache.get(SHEET_SERVICES)
+            worksheet = self._get_cached_worksheet(SHEET_SERVICES)
             if worksheet is None:
-                try:
-                    worksheet = self.sheet.worksheet(SHEET_SERVICES)
-                except WorksheetNotFound:
-                    logger.info(f"Creating '{SHEET_SERVICES}' sheet with default data...")
-                    worksheet = self.sheet.add_worksheet(title=SHEET_SERVICES, rows="100", cols="10")
-                    worksheet.append_row(self._SERVICE_HEADERS)
-                    # Seed from hardcoded constants
-                    rows = []
-                    for sid, data in SERVICES_MAIN.items():
-                        rows.append([sid, data['name'], 'main', data['price']])
-                    for sid, data in SERVICES_COLORING.items():
-                        rows.append([sid, data['name'], 'coloring', data['price']])
-                    if rows:
-                        worksheet.append_rows(rows)
-                    self._worksheet_cache[SHEET_SERVICES] = worksheet
-                    logger.info(f"Seeded {len(rows)} services into '{SHEET_SERVICES}'")
-                    return worksheet
+                with self._cache_lock:
+                    try:
+                        worksheet = self.sheet.worksheet(SHEET_SERVICES)
+                    except WorksheetNotFound:
+                        logger.info(f"Creating '{SHEET_SERVICES}' sheet with default data...")
+                        worksheet = self.sheet.add_worksheet(title=SHEET_SERVICES, rows="100", cols="10")
+                        worksheet.append_row(self._SERVICE_HEADERS)
+                        # Seed from hardcoded constants
+                        rows = []
+                        for sid, data in SERVICES_MAIN.items():
+                            rows.append([sid, data['name'], 'main', data['price']])
+                        for sid, data in SERVICES_COLORING.items():
+                            rows.append([sid, data['name'], 'coloring', data['price']])
+                        if rows:
+                            worksheet.append_rows(rows)
+                        self._worksheet_cache[SHEET_SERVICES] = worksheet
+                        logger.info(f"Seeded {len(rows)} services into '{SHEET_SERVICES}'")
+                        return worksheet
 
-                self._worksheet_cache[SHEET_SERVICES] = worksheet
+                    self._worksheet_cache[SHEET_SERVICES] = worksheet
             return worksheet
         except Exception as e:
             logger.error(f"Failed to ensure service sheet: {e}", exc_info=True)
@@ -441,6 +779,7 @@ class SheetsService:
         try:
             worksheet = self._ensure_service_sheet()
             all_values = worksheet.get_all_values()
+            self._index_config_values(SHEET_SERVICES, all_values)
             if len(all_values) <= 1:
                 return []
             headers = all_values[0]
@@ -453,8 +792,9 @@ class SheetsService:
         """Add a new service to the ServiceList sheet."""
         try:
             worksheet = self._ensure_service_sheet()
-            worksheet.append_row([service_id, name, category, price])
+            self._append_config_row(SHEET_SERVICES, worksheet, service_id, [service_id, name, category, price])
             logger.info(f"Service added: {service_id} ({name})")
+            self._notify(self.on_config_written)
             return True
         except Exception as e:
             logger.error(f"Failed to add service: {e}", exc_info=True)
@@ -464,19 +804,10 @@ class SheetsService:
         """Update a service by ServiceID. fields can be name, category, price."""
         try:
             worksheet = self._ensure_service_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-            headers = all_values[0]
-            sid_col = headers.index('ServiceID')
-            for i, row in enumerate(all_values[1:], start=2):
-                if row[sid_col] == service_id:
-                    for field, value in fields.items():
-                        if field in headers:
-                            col_idx = headers.index(field) + 1
-                            worksheet.update_cell(i, col_idx, value)
-                    logger.info(f"Service {service_id} updated: {fields}")
-                    return True
+            if self._update_config_row(SHEET_SERVICES, worksheet, service_id, fields):
+                logger.info(f"Service {service_id} updated: {fields}")
+                self._notify(self.on_config_written)
+                return True
             logger.warning(f"Service {service_id} not found for update.")
             return False
         except Exception as e:
@@ -487,16 +818,10 @@ class SheetsService:
         """Remove a service by ServiceID."""
         try:
             worksheet = self._ensure_service_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-            headers = all_values[0]
-            sid_col = headers.index('ServiceID')
-            for i, row in enumerate(all_values[1:], start=2):
-                if row[sid_col] == service_id:
-                    worksheet.delete_rows(i)
-                    logger.info(f"Service {service_id} removed.")
-                    return True
+            if self._delete_config_row(SHEET_SERVICES, worksheet, service_id):
+                logger.info(f"Service {service_id} removed.")
+                self._notify(self.on_config_written)
+                return True
             logger.warning(f"Service {service_id} not found for removal.")
             return False
         except Exception as e:
@@ -513,36 +838,37 @@ class SheetsService:
     def _ensure_branch_config_sheet(self):
         """Create BranchConfig sheet with headers if it doesn't exist. Seed from hardcoded defaults."""
         try:
-            worksheet = self._worksheet_cache.get(SHEET_BRANCHES)
+            worksheet = self._get_cached_worksheet(SHEET_BRANCHES)
             if worksheet is None:
-                try:
-                    worksheet = self.sheet.worksheet(SHEET_BRANCHES)
-                except WorksheetNotFound:
-                    logger.info(f"Creating '{SHEET_BRANCHES}' sheet with default data...")
-                    worksheet = self.sheet.add_worksheet(title=SHEET_BRANCHES, rows="100", cols="15")
-                    worksheet.append_row(self._BRANCH_HEADERS)
-                    rows = []
-                    for bid, data in BRANCHES.items():
-                        costs = data.get('operational_cost', {})
-                        rows.append([
-                            bid,
-                            data['name'],
-                            data.get('location', ''),
-                            data.get('short', ''),
-                            data.get('employees', 2),
-                            data.get('commission_rate', 0),
-                            costs.get('tempat', 0),
-                            costs.get('listrik air', 0),
-                            costs.get('wifi', 0),
-                            costs.get('karyawan_fixed', 0),
-                        ])
-                    if rows:
-                        worksheet.append_rows(rows)
-                    self._worksheet_cache[SHEET_BRANCHES] = worksheet
-                    logger.info(f"Seeded {len(rows)} branches into '{SHEET_BRANCHES}'")
-                    return worksheet
+                with self._cache_lock:
+                    try:
+                        worksheet = self.sheet.worksheet(SHEET_BRANCHES)
+                    except WorksheetNotFound:
+                        logger.info(f"Creating '{SHEET_BRANCHES}' sheet with default data...")
+                        worksheet = self.sheet.add_worksheet(title=SHEET_BRANCHES, rows="100", cols="15")
+                        worksheet.append_row(self._BRANCH_HEADERS)
+                        rows = []
+                        for bid, data in BRANCHES.items():
+                            costs = data.get('operational_cost', {})
+                            rows.append([
+                                bid,
+                                data['name'],
+                                data.get('location', ''),
+                                data.get('short', ''),
+                                data.get('employees', 2),
+                                data.get('commission_rate', 0),
+                                costs.get('tempat', 0),
+                                costs.get('listrik air', 0),
+                                costs.get('wifi', 0),
+                                costs.get('karyawan_fixed', 0),
+                            ])
+                        if rows:
+                            worksheet.append_rows(rows)
+                        self._worksheet_cache[SHEET_BRANCHES] = worksheet
+                        logger.info(f"Seeded {len(rows)} branches into '{SHEET_BRANCHES}'")
+                        return worksheet
 
-                self._worksheet_cache[SHEET_BRANCHES] = worksheet
+                    self._worksheet_cache[SHEET_BRANCHES] = worksheet
             return worksheet
         except Exception as e:
             logger.error(f"Failed to ensure branch config sheet: {e}", exc_info=True)
@@ -553,6 +879,7 @@ class SheetsService:
         try:
             worksheet = self._ensure_branch_config_sheet()
             all_values = worksheet.get_all_values()
+            self._index_config_values(SHEET_BRANCHES, all_values)
             if len(all_values) <= 1:
                 return []
             headers = all_values[0]
@@ -565,19 +892,10 @@ class SheetsService:
         """Update a branch config by BranchID. fields can be any column name."""
         try:
             worksheet = self._ensure_branch_config_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-            headers = all_values[0]
-            bid_col = headers.index('BranchID')
-            for i, row in enumerate(all_values[1:], start=2):
-                if row[bid_col] == branch_id:
-                    for field, value in fields.items():
-                        if field in headers:
-                            col_idx = headers.index(field) + 1
-                            worksheet.update_cell(i, col_idx, value)
-                    logger.info(f"Branch {branch_id} updated: {fields}")
-                    return True
+            if self._update_config_row(SHEET_BRANCHES, worksheet, branch_id, fields):
+                logger.info(f"Branch {branch_id} updated: {fields}")
+                self._notify(self.on_config_written)
+                return True
             logger.warning(f"Branch {branch_id} not found for update.")
             return False
         except Exception as e:
@@ -591,24 +909,25 @@ class SheetsService:
     def _ensure_product_sheet(self):
         """Create ProductList sheet with headers if it doesn't exist. Seed from hardcoded defaults."""
         try:
-            worksheet = self._worksheet_cache.get(SHEET_PRODUCTS)
+            worksheet = self._get_cached_worksheet(SHEET_PRODUCTS)
             if worksheet is None:
-                try:
-                    worksheet = self.sheet.worksheet(SHEET_PRODUCTS)
-                except WorksheetNotFound:
-                    logger.info(f"Creating '{SHEET_PRODUCTS}' sheet with default data...")
-                    worksheet = self.sheet.add_worksheet(title=SHEET_PRODUCTS, rows="100", cols="10")
-                    worksheet.append_row(self._PRODUCT_HEADERS)
-                    rows = []
-                    for pid, data in PRODUCTS.items():
-                        rows.append([pid, data['name'], data['price']])
-                    if rows:
-                        worksheet.append_rows(rows)
-                    self._worksheet_cache[SHEET_PRODUCTS] = worksheet
-                    logger.info(f"Seeded {len(rows)} products into '{SHEET_PRODUCTS}'")
-                    return worksheet
+                with self._cache_lock:
+                    try:
+                        worksheet = self.sheet.worksheet(SHEET_PRODUCTS)
+                    except WorksheetNotFound:
+                        logger.info(f"Creating '{SHEET_PRODUCTS}' sheet with default data...")
+                        worksheet = self.sheet.add_worksheet(title=SHEET_PRODUCTS, rows="100", cols="10")
+                        worksheet.append_row(self._PRODUCT_HEADERS)
+                        rows = []
+                        for pid, data in PRODUCTS.items():
+                            rows.append([pid, data['name'], data['price']])
+                        if rows:
+                            worksheet.append_rows(rows)
+                        self._worksheet_cache[SHEET_PRODUCTS] = worksheet
+                        logger.info(f"Seeded {len(rows)} products into '{SHEET_PRODUCTS}'")
+                        return worksheet
 
-                self._worksheet_cache[SHEET_PRODUCTS] = worksheet
+                    self._worksheet_cache[SHEET_PRODUCTS] = worksheet
             return worksheet
         except Exception as e:
             logger.error(f"Failed to ensure product sheet: {e}", exc_info=True)
@@ -619,6 +938,7 @@ class SheetsService:
         try:
             worksheet = self._ensure_product_sheet()
             all_values = worksheet.get_all_values()
+            self._index_config_values(SHEET_PRODUCTS, all_values)
             if len(all_values) <= 1:
                 return []
             headers = all_values[0]
@@ -631,8 +951,9 @@ class SheetsService:
         """Add a new product to the ProductList sheet."""
         try:
             worksheet = self._ensure_product_sheet()
-            worksheet.append_row([product_id, name, price])
+            self._append_config_row(SHEET_PRODUCTS, worksheet, product_id, [product_id, name, price])
             logger.info(f"Product added: {product_id} ({name})")
+            self._notify(self.on_config_written)
             return True
         except Exception as e:
             logger.error(f"Failed to add product: {e}", exc_info=True)
@@ -642,19 +963,10 @@ class SheetsService:
         """Update a product by ProductID."""
         try:
             worksheet = self._ensure_product_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-            headers = all_values[0]
-            pid_col = headers.index('ProductID')
-            for i, row in enumerate(all_values[1:], start=2):
-                if row[pid_col] == product_id:
-                    for field, value in fields.items():
-                        if field in headers:
-                            col_idx = headers.index(field) + 1
-                            worksheet.update_cell(i, col_idx, value)
-                    logger.info(f"Product {product_id} updated: {fields}")
-                    return True
+            if self._update_config_row(SHEET_PRODUCTS, worksheet, product_id, fields):
+                logger.info(f"Product {product_id} updated: {fields}")
+                self._notify(self.on_config_written)
+                return True
             logger.warning(f"Product {product_id} not found for update.")
             return False
         except Exception as e:
@@ -665,16 +977,10 @@ class SheetsService:
         """Remove a product by ProductID."""
         try:
             worksheet = self._ensure_product_sheet()
-            all_values = worksheet.get_all_values()
-            if len(all_values) <= 1:
-                return False
-            headers = all_values[0]
-            pid_col = headers.index('ProductID')
-            for i, row in enumerate(all_values[1:], start=2):
-                if row[pid_col] == product_id:
-                    worksheet.delete_rows(i)
-                    logger.info(f"Product {product_id} removed.")
-                    return True
+            if self._delete_config_row(SHEET_PRODUCTS, worksheet, product_id):
+                logger.info(f"Product {product_id} removed.")
+                self._notify(self.on_config_written)
+                return True
             logger.warning(f"Product {product_id} not found for removal.")
             return False
         except Exception as e:
@@ -0,0 +1,130 @@
+"""
+Snapshot Service — immutable columnar snapshots of closed months.
+
+A closed month is frozen into a directory of typed ``.npy`` column files plus a
+``meta.json``, keyed by sheet name and content hash. Text columns are
+dictionary-encoded (integer codes + a small category list), which is where the
+size reduction comes from. Rows are stored sorted by date. Loading memory-maps
+the arrays and wraps them without copying: dates as datetime64 (also the
+DatetimeIndex), text columns as categoricals over the stored codes. A snapshot
+is replaced as soon as its sheet's content hash changes.
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import settings
+from app.utils.transaction_schema import TransactionSchema
+
+logger = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ['Capster', 'Service', 'Payment_Method', 'Branch']
+
+
+class SnapshotService:
+    """Freeze / load closed-month DataFrames as memory-mapped column files."""
+
+    DIR_NAME = 'snapshots'
+    FORMAT_VERSION = 3
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or os.path.join(settings.DATA_DIR, self.DIR_NAME)
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    @staticmethod
+    def _slug(sheet_name: str) -> str:
+        return re.sub(r'[^A-Za-z0-9]+', '_', sheet_name).strip('_')
+
+    def _snapshot_dir(self, sheet_name: str, content_hash: str) -> str:
+        return os.path.join(self.base_dir, f"{self._slug(sheet_name)}-{content_hash[:16]}")
+
+    def _stale_dirs(self, sheet_name: str, keep: str):
+        prefix = f"{self._slug(sheet_name)}-"
+        for entry in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, entry)
+            if entry.startswith(prefix) and path != keep and os.path.isdir(path):
+                yield path
+
+    def has(self, sheet_name: str, content_hash: str) -> bool:
+        return os.path.exists(os.path.join(self._snapshot_dir(sheet_name, content_hash), 'meta.json'))
+
+    def freeze(self, sheet_name: str, content_hash: str, df: pd.DataFrame) -> bool:
+        """Write a snapshot of a month and drop older snapshots of the same sheet."""
+        target = self._snapshot_dir(sheet_name, content_hash)
+        tmp = f"{target}.tmp"
+        try:
+            with self._lock:
+                shutil.rmtree(tmp, ignore_errors=True)
+                os.makedirs(tmp)
+
+                meta = {'version': self.FORMAT_VERSION, 'sheet': sheet_name,
+                        'hash': content_hash, 'rows': len(df), 'categories': {}}
+                if not df.empty:
+                    df = df.sort_values('Date', kind='mergesort')
+                    np.save(os.path.join(tmp, 'Date.npy'), df['Date'].values.astype('datetime64[ns]').view('int64'))
+                    np.save(os.path.join(tmp, 'Price.npy'), df['Price'].values.astype('int32'))
+                    for col in TEXT_COLUMNS:
+                        codes, categories = pd.factorize(df[col].astype(object).fillna('').astype(str))
+                        # Saved in the code dtype pandas uses for this many categories, so
+                        # load can wrap the file without converting it
+                        codes = pd.Categorical.from_codes(codes, categories=categories).codes
+                        np.save(os.path.join(tmp, f'{col}.npy'), codes)
+                        meta['categories'][col] = list(categories)
+
+                # meta.json is written last: its presence marks a complete snapshot
+                with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, ensure_ascii=False)
+
+                shutil.rmtree(target, ignore_errors=True)
+                os.replace(tmp, target)
+                for stale in list(self._stale_dirs(sheet_name, keep=target)):
+                    shutil.rmtree(stale, ignore_errors=True)
+
+            logger.info(f"Froze snapshot of '{sheet_name}' ({len(df)} rows, hash {content_hash[:8]})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to freeze snapshot of '{sheet_name}': {e}", exc_info=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+    def load(self, sheet_name: str, content_hash: str) -> Optional[pd.DataFrame]:
+        """Load a snapshot by memory-mapping its columns. Returns None if it doesn't exist.
+
+        The frame's columns and DatetimeIndex are read-only views of the mapped files.
+        Its categories are the snapshot's own; TransactionSchema.align moves them to the
+        registry when the frame is combined with others.
+        """
+        path = self._snapshot_dir(sheet_name, content_hash)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != self.FORMAT_VERSION:
+                return None
+            if meta['rows'] == 0:
+                return pd.DataFrame()
+
+            def column(name):
+                return np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+
+            dates = column('Date').view('datetime64[ns]')
+            data = {'Date': dates}
+            for col in TEXT_COLUMNS:
+                data[col] = pd.Categorical.from_codes(column(col), categories=meta['categories'][col])
+            data['Price'] = column('Price')
+            df = pd.DataFrame(data, index=pd.DatetimeIndex(dates), copy=False,
+                              columns=['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch'])
+            return TransactionSchema.add_capster_key(df)
+        except Exception as e:
+            logger.error(f"Failed to load snapshot of '{sheet_name}': {e}", exc_info=True)
+            return None
@@ -0,0 +1,149 @@
+"""
+Summary Store — persisted per-month report summaries.
+
+Month-over-month and year-over-year comparisons need totals of earlier months.
+Those are closed months, so their summary (revenue, transactions and the
+per-branch / per-capster / per-service / per-payment breakdowns) is stored in
+SQLite together with the month's content hash, and read back with two indexed
+queries. A summary is rebuilt from the month's rollup cube only when the hash
+changes (the month was edited). Open months are summarized on the fly.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.config.settings import settings
+from app.services.cache_service import TransactionCache
+from app.utils.slice_aggregator import SliceAggregator, SliceSummary
+
+logger = logging.getLogger(__name__)
+
+# Breakdowns kept per month
+DIMENSIONS = ['branch', 'capster', 'service', 'payment']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS month_summary (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (year, month)
+);
+CREATE TABLE IF NOT EXISTS month_breakdown (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    dimension TEXT NOT NULL,
+    label TEXT NOT NULL,
+    revenue INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (year, month, dimension, label)
+);
+"""
+
+
+@dataclass
+class MonthSummary:
+    """Totals of one month plus (revenue, count) per label of each dimension."""
+    year: int
+    month: int
+    total: int = 0
+    count: int = 0
+    branch: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    capster: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    service: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    payment: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def avg_ticket(self) -> float:
+        """Average revenue per transaction."""
+        return self.total / self.count if self.count else 0
+
+    @classmethod
+    def from_slice(cls, year: int, month: int, summary: SliceSummary) -> 'MonthSummary':
+        result = cls(year=year, month=month, total=summary.total, count=summary.count)
+        for name in DIMENSIONS:
+            breakdown = getattr(summary, name)
+            if breakdown is not None:
+                setattr(result, name, {str(label): (revenue, count)
+                                       for label, revenue, count, _ in breakdown.rows()})
+        return result
+
+
+class SummaryStore:
+    """Per-month summaries, persisted for closed months and keyed by their content hash."""
+
+    DB_FILENAME = 'summaries.db'
+
+    def __init__(self, cache: TransactionCache, db_path: Optional[str] = None):
+        self.cache = cache
+        self.db_path = db_path or os.path.join(settings.DATA_DIR, self.DB_FILENAME)
+        self._lock = threading.Lock()
+
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def get(self, year: int, month: int) -> MonthSummary:
+        """Summary of a month: from the store when the month is closed and unchanged,
+        otherwise built from the month's rollup cube (and stored if the month is closed)."""
+        content_hash = self.cache.mirror.month_content_hash(year, month)
+        if content_hash is not None:
+            stored = self._load(year, month, content_hash)
+            if stored is not None:
+                return stored
+
+        summary = MonthSummary.from_slice(year, month, SliceAggregator.summarize(self.cache.get_rollup([(year, month)])))
+        if content_hash is not None:
+            self._save(summary, content_hash)
+        return summary
+
+    def _load(self, year: int, month: int, content_hash: str) -> Optional[MonthSummary]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total, count FROM month_summary WHERE year = ? AND month = ? AND content_hash = ?",
+                (year, month, content_hash),
+            ).fetchone()
+            if row is None:
+                return None
+            breakdown = self._conn.execute(
+                "SELECT dimension, label, revenue, count FROM month_breakdown WHERE year = ? AND month = ?",
+                (year, month),
+            ).fetchall()
+
+        summary = MonthSummary(year=year, month=month, total=row[0], count=row[1])
+        for dimension, label, revenue, count in breakdown:
+            getattr(summary, dimension)[label] = (revenue, count)
+        return summary
+
+    def _save(self, summary: MonthSummary, content_hash: str):
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM month_breakdown WHERE year = ? AND month = ?",
+                                   (summary.year, summary.month))
+                self._conn.executemany(
+                    "INSERT INTO month_breakdown (year, month, dimension, label, revenue, count) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (summary.year, summary.month, name, label, revenue, count)
+                        for name in DIMENSIONS
+                        for label, (revenue, count) in getattr(summary, name).items()
+                    ],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO month_summary (year, month, content_hash, total, count, built_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (summary.year, summary.month, content_hash, summary.total, summary.count, time.time()),
+                )
+                self._conn.commit()
+            logger.info(f"Stored summary of {summary.month}/{summary.year} (hash {content_hash[:8]})")
+        except Exception as e:
+            logger.error(f"Failed to store summary of {summary.month}/{summary.year}: {e}")
@@ -0,0 +1,222 @@
+"""
+Transaction Write Queue — durable write-behind for monthly transaction sheets.
+
+Sales are appended to a local journal file and confirmed immediately. A
+background flusher groups pending rows per monthly sheet and writes each group
+with a single ``append_rows`` call. Anything journaled but not yet flushed is
+replayed on startup.
+
+Each row is written with its entry id in an extra column. When a write's outcome
+is unknown (the append failed, or the process stopped before the journal was
+trimmed) the sheet's ids are checked before the rows are sent again, so a replay
+never duplicates a sale.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+from app.config.settings import settings
+from app.models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionQueue:
+    """Append-only journal + batched flusher for transaction rows."""
+
+    JOURNAL_FILENAME = 'transaction_journal.jsonl'
+
+    def __init__(self, sheets_service, journal_path: Optional[str] = None,
+                 flush_interval: Optional[int] = None, max_batch: Optional[int] = None,
+                 on_enqueue: Optional[Callable[[Dict], None]] = None,
+                 on_flush: Optional[Callable[[List[Dict]], None]] = None):
+        self.sheets = sheets_service
+        # Called with each journaled entry, and with the entries written by each successful flush
+        self.on_enqueue = on_enqueue
+        self.on_flush = on_flush
+        self.journal_path = journal_path or os.path.join(settings.DATA_DIR, self.JOURNAL_FILENAME)
+        self.flush_interval = flush_interval or settings.WRITE_QUEUE_FLUSH_INTERVAL
+        self.max_batch = max_batch or settings.WRITE_QUEUE_MAX_BATCH
+
+        self._lock = threading.Lock()        # guards _pending and the journal file
+        self._flush_lock = threading.Lock()  # only one flush at a time
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: List[Dict] = []
+        # Ids that may already be in the sheet: replayed from the journal or from a failed append
+        self._unconfirmed: Set[str] = set()
+
+        os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+        self._load_journal()
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _load_journal(self):
+        """Load unflushed entries left by a previous run."""
+        if not os.path.exists(self.journal_path):
+            return
+        entries = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a truncated last line
+                    logger.warning(f"Skipping corrupt journal line: {line[:80]}")
+        self._pending = entries
+        self._unconfirmed = {e['id'] for e in entries}
+        if entries:
+            logger.info(f"Replaying {len(entries)} journaled transaction(s) not yet flushed to Sheets.")
+
+    def _rewrite_journal(self):
+        """Atomically replace the journal with the current pending entries. Caller holds _lock."""
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def enqueue(self, transaction: Transaction) -> bool:
+        """Journal a transaction. Returns once the row is durable on local disk."""
+        entry = {
+            'id': uuid.uuid4().hex,
+            'sheet': self.sheets._get_monthly_worksheet_name(transaction.date),
+            'row': self.sheets.transaction_to_row(transaction),
+        }
+        try:
+            with self._lock:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._pending.append(entry)
+                pending = len(self._pending)
+        except Exception as e:
+            logger.error(f"❌ Failed to journal transaction: {e}", exc_info=True)
+            return False
+
+        logger.info(f"Transaction journaled for '{entry['sheet']}' ({pending} pending): {transaction}")
+        if self.on_enqueue:
+            try:
+                self.on_enqueue(entry)
+            except Exception as e:
+                logger.error(f"Transaction queue enqueue callback failed: {e}", exc_info=True)
+        if pending >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Number of journaled rows not yet written to Sheets."""
+        with self._lock:
+            return len(self._pending)
+
+    def pending_entries(self) -> List[Dict]:
+        """Journaled entries not yet written to Sheets."""
+        with self._lock:
+            return list(self._pending)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _already_written(self, sheet_name: str, entries: List[Dict]) -> Optional[Set[str]]:
+        """Ids of these entries that a previous attempt already wrote to the sheet.
+        Only entries with an unknown outcome are checked; None if the check fails."""
+        if not any(e['id'] in self._unconfirmed for e in entries):
+            return set()
+        written = self.sheets.get_entry_ids(sheet_name)
+        if written is None:
+            return None
+        return {e['id'] for e in entries if e['id'] in written}
+
+    def flush(self) -> int:
+        """Write all pending rows to Sheets, one append_rows call per monthly sheet.
+        Rows of a sheet whose write fails stay journaled for the next attempt; rows
+        found in the sheet already (a previous attempt got through) are not sent again.
+        Returns the number of rows flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+
+            by_sheet: Dict[str, List[Dict]] = OrderedDict()
+            for entry in batch:
+                by_sheet.setdefault(entry['sheet'], []).append(entry)
+
+            flushed_ids = set()
+            flushed_entries = []
+            for sheet_name, entries in by_sheet.items():
+                written = self._already_written(sheet_name, entries)
+                if written is None:
+                    continue   # can't tell what is in the sheet: try again next round
+                if written:
+                    logger.warning(f"{len(written)} journaled row(s) already in '{sheet_name}'; not appending again")
+                rows = [e['row'] + [e['id']] for e in entries if e['id'] not in written]
+                if self.sheets.append_transaction_rows(sheet_name, rows):
+                    flushed_ids.update(e['id'] for e in entries)
+                    flushed_entries.extend(entries)
+                else:
+                    self._unconfirmed.update(e['id'] for e in entries)
+
+            if flushed_ids:
+                with self._lock:
+                    self._pending = [e for e in self._pending if e['id'] not in flushed_ids]
+                    self._unconfirmed -= flushed_ids
+                    self._rewrite_journal()
+
+            remaining = len(batch) - len(flushed_ids)
+            logger.info(
+                f"Flushed {len(flushed_ids)} journaled transaction(s) in {len(by_sheet)} sheet write(s)"
+                + (f", {remaining} left for retry" if remaining else "")
+            )
+            if flushed_entries and self.on_flush:
+                try:
+                    self.on_flush(flushed_entries)
+                except Exception as e:
+                    logger.error(f"Transaction queue flush callback failed: {e}", exc_info=True)
+            return len(flushed_ids)
+
+    def _run(self):
+        """Background loop: flush every flush_interval seconds or when woken early."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Transaction queue flush failed: {e}", exc_info=True)
+
+    def start(self):
+        """Start the background flusher (replays the journal right away)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='transaction-flusher', daemon=True)
+        self._thread.start()
+        if self.pending_count():
+            self._wakeup.set()
+        logger.info(f"Transaction flusher started (every {self.flush_interval}s or {self.max_batch} rows)")
+
+    def stop(self):
+        """Stop the flusher and make a final flush attempt."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=30)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final transaction flush failed: {e}", exc_info=True)
@@ -0,0 +1,107 @@
+"""
+Warm-up Service — fills the report caches in the background.
+
+Runs once right after startup (the bot already accepts updates while it
+works) and again shortly before opening hours, so the first report of the day
+is served from warm partitions and pre-rendered texts instead of a cold fetch.
+Every step is independent: a failing step is logged and the rest still run.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.services.report_service import ReportService
+from app.services.sheets_governor import PRIORITY_BACKGROUND, request_priority
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """Loads current partitions, the capster list and the common reports ahead of requests."""
+
+    def __init__(self, report_service: ReportService, capster_service=None, config_service=None,
+                 query_parser=None):
+        self.reports = report_service
+        self.capsters = capster_service
+        self.config = config_service
+        self.query_parser = query_parser
+        self.last_warmed: Optional[datetime] = None
+        # CapsterList rows from a config reload of the current run
+        self._capster_records = None
+
+    @staticmethod
+    def warm_months(now: Optional[datetime] = None) -> List[tuple]:
+        """Months the day's reports read: this year up to now, plus last month and
+        the same month last year (comparisons)."""
+        now = now or datetime.now()
+        months = [(now.year, month) for month in range(1, now.month + 1)]
+        months.append((now.year - 1, 12) if now.month == 1 else (now.year, now.month - 1))
+        months.append((now.year - 1, now.month))
+        return sorted(set(months))
+
+    def merged_capster_list(self, capsters: list) -> List[str]:
+        """Transaction capster names + CapsterList real names and aliases, deduplicated
+        case-insensitively (original casing of the first occurrence kept)."""
+        names = self.reports.get_dynamic_capster_list()
+        for capster in capsters:
+            names = names + capster.all_names()  # includes alias
+        seen_lower = set()
+        capster_list = []
+        for name in names:
+            if name and name.lower() not in seen_lower:
+                seen_lower.add(name.lower())
+                capster_list.append(name)
+        return capster_list
+
+    def warm(self, reload_config: bool = False) -> Dict[str, float]:
+        """Run every warm-up step; returns the seconds each one took."""
+        timings = {}
+
+        def step(name, func):
+            started = time.perf_counter()
+            try:
+                with request_priority(PRIORITY_BACKGROUND):
+                    func()
+            except Exception as e:
+                logger.error(f"Warm-up step '{name}' failed: {e}", exc_info=True)
+            timings[name] = time.perf_counter() - started
+
+        if reload_config and self.config:
+            step('config', self._reload_config)
+        step('partitions', lambda: self.reports.cache.get_rollup(self.warm_months()))
+        if self.capsters:
+            step('capsters', self._refresh_capsters)
+        step('reports', self._render_reports)
+
+        self.last_warmed = datetime.now()
+        logger.info("Cache warm-up done: " + ", ".join(f"{name} {secs:.2f}s" for name, secs in timings.items()))
+        return timings
+
+    def _reload_config(self):
+        if not self.config.load_all_config():
+            return
+        self.reports.cache.bump_config_version()
+        self._capster_records = self.config.capster_records
+        if self.capsters:
+            # Capsters added while the bot ran from the config snapshot
+            self.capsters.load_capsters_to_auth(self._capster_records)
+
+    def _refresh_capsters(self):
+        records, self._capster_records = self._capster_records, None
+        capsters = self.capsters.get_all_capsters(records) if records is not None else self.capsters.get_all_capsters()
+        capster_list = self.merged_capster_list(capsters)
+        alias_map = self.capsters.get_name_alias_map(capsters)
+        self.reports._capster_alias_map = alias_map
+        if self.query_parser:
+            self.query_parser.update_capster_list(capster_list, alias_map)
+        logger.info(f"Query parser capster list: {capster_list}")
+
+    def _render_reports(self):
+        """Pre-render the owner menu reports of the current period into the render cache."""
+        self.reports.generate_daily_report()
+        self.reports.generate_weekly_report()
+        self.reports.generate_monthly_report()
+        self.reports.generate_monthly_profit_report()
+        self.reports.generate_weekly_breakdown(is_owner=True)
+        self.reports.generate_annual_profit_report()
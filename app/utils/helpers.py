@@ -4,11 +4,14 @@ Helper Functions
 import logging
 from telegram import Update
 from telegram.error import BadRequest
-from typing import Optional
+from typing import Awaitable, Callable, List, Optional
 from telegram.ext import ContextTypes # Add this import at the top
 
 logger = logging.getLogger(__name__)
 
+# Longest text Telegram accepts in one message
+TELEGRAM_MESSAGE_LIMIT = 4096
+
 async def safe_edit_message(query, text: str, reply_markup=None, parse_mode=None):
     """
     Safely edit message, handling "message not modified" error
@@ -50,6 +53,60 @@ async def safe_edit_message(query, text: str, reply_markup=None, parse_mode=None
     except Exception as e:
         logger.error(f"Unexpected error editing message: {e}")
         raise
+
+
+def _message_length(text: str) -> int:
+    """Length as Telegram counts it (UTF-16 code units: an emoji counts 2)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """
+    Split text into parts Telegram accepts, breaking between lines
+    (a single line longer than the limit is cut)
+
+    Args:
+        text: Message text
+        limit: Maximum length of one part
+
+    Returns:
+        list: Parts in order; joined they give the original text
+    """
+    parts, current = [], ''
+    for line in text.splitlines(keepends=True):
+        while _message_length(line) > limit:
+            if current:
+                parts.append(current)
+                current = ''
+            cut = limit // 2   # fits even if every character takes two units
+            parts.append(line[:cut])
+            line = line[cut:]
+        if _message_length(current) + _message_length(line) > limit:
+            parts.append(current)
+            current = ''
+        current += line
+    if current or not parts:
+        parts.append(current)
+    return parts
+
+
+async def send_long_message(first: Callable[..., Awaitable], rest: Callable[..., Awaitable],
+                            text: str, reply_markup=None):
+    """
+    Show a text that may exceed Telegram's limit: the first part through `first`
+    (usually editing the loading message), the others as new messages through `rest`.
+    The keyboard goes on the last part.
+
+    Args:
+        first: Coroutine function taking (text, reply_markup)
+        rest: Coroutine function taking (text, reply_markup)
+        text: Message text
+        reply_markup: Keyboard markup
+    """
+    parts = split_message(text)
+    for i, part in enumerate(parts):
+        markup = reply_markup if i == len(parts) - 1 else None
+        await (first if i == 0 else rest)(part, markup)
     
     
 def get_kapster_info(username):
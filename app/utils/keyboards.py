@@ -6,6 +6,7 @@ from app.config.constants import (
     CB_ADD_TRANSACTION, CB_CHANGE_BRANCH, CB_CUSTOMER_MENU, CB_REPORT_DAILY_CAPSTER,
     CB_REPORT_WEEKLY_CAPSTER, CB_REPORT_MONTHLY_CAPSTER, CB_REPORT_DAILY,
     CB_REPORT_WEEKLY_BREAKDOWN, CB_REPORT_MONTHLY, CB_REPORT_PROFIT,
+    CB_REPORT_ANNUAL, CB_ANNUAL_NAV, CB_PROFIT_NAV,
     CB_LIST_CUSTOMERS, CB_ADD_CUSTOMER, CB_BRANCH, CB_SERVICE_MAIN,
     CB_COLORING_MENU, CB_SERVICE_COLORING, CB_PAYMENT, CB_BACK_SERVICE,
     CB_BACK_MAIN, CB_WEEK_SELECT,
@@ -48,6 +49,7 @@ class KeyboardBuilder:
             [InlineKeyboardButton("📈 Laporan Mingguan Umum", callback_data=CB_REPORT_WEEKLY_BREAKDOWN)],
             [InlineKeyboardButton("📅 Laporan Bulanan Umum", callback_data=CB_REPORT_MONTHLY)],
             [InlineKeyboardButton("💰 Laporan Profit", callback_data=CB_REPORT_PROFIT)],
+            [InlineKeyboardButton("📆 Laporan Tahunan", callback_data=CB_REPORT_ANNUAL)],
             [InlineKeyboardButton("💈 Kelola Capster", callback_data=CB_CAPSTER_MENU)],
             [InlineKeyboardButton("👤 Menu Pelanggan", callback_data=CB_CUSTOMER_MENU)],
             [InlineKeyboardButton("⚙️ Pengaturan", callback_data=CB_CONFIG_MENU)],
@@ -421,3 +423,23 @@ class KeyboardBuilder:
             ]
         ]
         return InlineKeyboardMarkup(keyboard)
+
+    @staticmethod
+    def annual_navigation_keyboard(year: int) -> InlineKeyboardMarkup:
+        """
+        Navigation for the annual profit report: one button per month (opens the
+        monthly profit report of that month) plus previous/next year.
+        """
+        from app.config.constants import MONTHS_ID
+
+        month_buttons = [
+            InlineKeyboardButton(MONTHS_ID[month][:3], callback_data=f"{CB_PROFIT_NAV}_{year}_{month}")
+            for month in range(1, 13)
+        ]
+        keyboard = [month_buttons[i:i + 4] for i in range(0, 12, 4)]
+        keyboard.append([
+            InlineKeyboardButton(f"⬅️ {year - 1}", callback_data=f"{CB_ANNUAL_NAV}_{year - 1}"),
+            InlineKeyboardButton("🏠 Menu", callback_data=CB_BACK_MAIN),
+            InlineKeyboardButton(f"{year + 1} ➡️", callback_data=f"{CB_ANNUAL_NAV}_{year + 1}"),
+        ])
+        return InlineKeyboardMarkup(keyboard)
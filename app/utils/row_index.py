@@ -0,0 +1,68 @@
+"""
+Row Index — id -> sheet row number for the config sheets.
+
+Built from one full read of a sheet (header in row 1, one record per row) and
+kept in step with the writes made through SheetsService: appended rows are
+added, deleted rows shift the rows below them up. The index only tracks; the
+caller checks it against the sheet (header and row position) before writing
+and rebuilds it when they no longer agree.
+"""
+import re
+from typing import Dict, List, Optional
+
+
+class RowIndex:
+    """Key column value -> sheet row number, plus the header and last used row."""
+
+    def __init__(self, values: List[List[str]], key_column: str):
+        self.key_column = key_column
+        self.headers = list(values[0]) if values else []
+        self._rows: Dict[str, int] = {}
+        # Last used sheet row (1 = header only); get_all_values drops trailing empty rows
+        self.last_row = max(len(values), 1)
+
+        col = self.headers.index(key_column) if key_column in self.headers else None
+        if col is not None:
+            for number, row in enumerate(values[1:], start=2):
+                key = str(row[col]).strip() if col < len(row) else ''
+                if key:
+                    self._rows.setdefault(key, number)   # first match wins, like a top-down scan
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row_of(self, key) -> Optional[int]:
+        return self._rows.get(str(key).strip())
+
+    def column(self, field: str) -> Optional[int]:
+        """1-based column of a header, or None."""
+        return self.headers.index(field) + 1 if field in self.headers else None
+
+    def key_in(self, row: List[str]) -> str:
+        """The key value of a row's values."""
+        col = self.column(self.key_column)
+        return str(row[col - 1]).strip() if col and col - 1 < len(row) else ''
+
+    def appended(self, key, row_number: int) -> bool:
+        """Record a row appended at row_number. False when that is not the row after the
+        last known one (rows were added or removed elsewhere): the index is stale."""
+        if row_number != self.last_row + 1:
+            return False
+        self.last_row = row_number
+        self._rows.setdefault(str(key).strip(), row_number)
+        return True
+
+    def removed(self, row_number: int):
+        """Record a deleted row: its key goes, the rows below move up by one."""
+        self._rows = {
+            key: (row - 1 if row > row_number else row)
+            for key, row in self._rows.items() if row != row_number
+        }
+        self.last_row = max(self.last_row - 1, 1)
+
+    @staticmethod
+    def updated_row(response: dict) -> Optional[int]:
+        """Row number written by an append_row call, from its updatedRange (e.g. 'Sheet'!A7:C7)."""
+        updated_range = (response or {}).get('updates', {}).get('updatedRange', '')
+        match = re.search(r'![A-Z]+(\d+)', updated_range)
+        return int(match.group(1)) if match else None
@@ -0,0 +1,114 @@
+"""
+Sheet Ingest — raw get_all_values rows straight to a compact transaction frame.
+
+Rows are transposed into one array per column (no per-row dicts), dates are
+parsed with DATETIME_FORMAT in one vectorized pass and only the rows that
+failed are retried with DATE_FORMAT. Rows whose date still cannot be parsed
+are dropped from the frame and kept in a quarantine list for reporting.
+"""
+import logging
+import threading
+from itertools import zip_longest
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.config.constants import DATE_FORMAT, DATETIME_FORMAT
+from app.utils.transaction_schema import TransactionSchema
+
+logger = logging.getLogger(__name__)
+
+
+class DateQuarantine:
+    """Sheet rows dropped for an unparseable date: (sheet, sheet row number) -> raw value."""
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, sheet_name: str, rows: List[Tuple[int, str]]):
+        with self._lock:
+            for row_number, raw in rows:
+                self._rows[(sheet_name, row_number)] = raw
+
+    def clear_sheet(self, sheet_name: str):
+        """Forget a sheet's rows (it is being parsed again in full)."""
+        with self._lock:
+            for key in [key for key in self._rows if key[0] == sheet_name]:
+                del self._rows[key]
+
+    def entries(self, sheet_name: Optional[str] = None) -> List[Tuple[str, int, str]]:
+        """(sheet, row number, raw date) sorted by sheet and row, optionally for one sheet."""
+        with self._lock:
+            return sorted(
+                (sheet, row, raw) for (sheet, row), raw in self._rows.items()
+                if sheet_name is None or sheet == sheet_name
+            )
+
+
+# Shared by every parser of transaction sheets (Sheets reads and the mirror)
+QUARANTINE = DateQuarantine()
+
+
+class SheetIngest:
+    """Vectorized parsing of transaction sheet values."""
+
+    @staticmethod
+    def parse_dates(raw: np.ndarray) -> pd.Series:
+        """DATETIME_FORMAT in one pass; DATE_FORMAT only for the values that failed."""
+        dates = pd.to_datetime(pd.Series(raw, dtype=object), format=DATETIME_FORMAT, errors='coerce')
+        failed = dates.isna().to_numpy()
+        if failed.any():
+            dates[failed] = pd.to_datetime(pd.Series(raw[failed], dtype=object), format=DATE_FORMAT,
+                                           errors='coerce').to_numpy()
+        return dates
+
+    @staticmethod
+    def to_dataframe(values: List[List[str]], sheet_name: str = "Unknown", first_row: int = 2) -> pd.DataFrame:
+        """Convert header + data rows to a compact frame.
+
+        ``first_row`` is the sheet row number of values[1]; it is used to report quarantined
+        rows. Parsing a whole sheet (first_row=2) replaces that sheet's quarantine entries.
+        Columns with an empty header are skipped; for duplicate headers the last one wins.
+        """
+        if first_row == 2:
+            QUARANTINE.clear_sheet(sheet_name)
+        if len(values) <= 1:
+            return pd.DataFrame()
+
+        headers = values[0]
+        numbers, rows = [], []
+        for number, row in enumerate(values[1:], first_row):
+            if any(row):
+                numbers.append(number)
+                rows.append(row)
+        if not rows:
+            return pd.DataFrame()
+
+        # Transpose once: one tuple per sheet column, short rows padded with None
+        columns = list(zip_longest(*rows, fillvalue=None))
+        positions = {name: i for i, name in enumerate(headers) if name}
+        data = {
+            name: np.array(columns[i] if i < len(columns) else [None] * len(rows), dtype=object)
+            for name, i in positions.items()
+        }
+        if 'Date' not in data:
+            return pd.DataFrame()
+
+        dates = SheetIngest.parse_dates(data['Date'])
+        bad = dates.isna().to_numpy()
+        df = pd.DataFrame(data)
+        df['Date'] = dates
+        if bad.any():
+            bad_rows = [(numbers[i], data['Date'][i]) for i in np.flatnonzero(bad)]
+            QUARANTINE.add(sheet_name, bad_rows)
+            logger.warning(f"Dropping {len(bad_rows)} rows with unparseable dates in sheet '{sheet_name}' "
+                           f"(quarantined, e.g. row {bad_rows[0][0]}: {bad_rows[0][1]!r}).")
+            df = df[~bad].reset_index(drop=True)
+
+        # Compact schema: categorical text columns, int32 Price (get_all_values returns strings)
+        return TransactionSchema.compact(df)
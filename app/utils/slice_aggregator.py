@@ -0,0 +1,156 @@
+"""
+Slice Aggregator - One-pass breakdowns (sum, count, share) of a transaction slice
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Report dimension -> transaction column
+DIMENSIONS = {
+    'branch': 'Branch',
+    'capster': 'Capster',
+    'service': 'Service',
+    'payment': 'Payment_Method',
+}
+
+
+@dataclass
+class Breakdown:
+    """Totals of one dimension. Labels are kept in label order; rows() re-sorts on demand."""
+    labels: List
+    sums: np.ndarray
+    counts: np.ndarray
+    total: int = 0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def rows(self, order: str = 'label', limit: Optional[int] = None) -> Iterator[Tuple]:
+        """Yield (label, sum, count, share) ordered by 'label', or descending 'sum' / 'count'.
+        Ties keep label order."""
+        if order == 'label':
+            index = np.arange(len(self.labels))
+        else:
+            values = self.sums if order == 'sum' else self.counts
+            index = np.argsort(-values, kind='stable')
+        for i in index[:limit]:
+            share = self.sums[i] / self.total if self.total > 0 else 0.0
+            yield self.labels[i], int(self.sums[i]), int(self.counts[i]), share
+
+    def sum_of(self, label) -> int:
+        """Sum of one label (0 if absent)."""
+        try:
+            return int(self.sums[self.labels.index(label)])
+        except ValueError:
+            return 0
+
+
+@dataclass
+class SliceSummary:
+    """Everything the reports need from one slice, computed in a single pass."""
+    total: int = 0
+    count: int = 0
+    branch: Optional[Breakdown] = None
+    capster: Optional[Breakdown] = None
+    service: Optional[Breakdown] = None
+    payment: Optional[Breakdown] = None
+    daily: Optional[Breakdown] = None
+    # Per-day capster breakdowns, keyed by date
+    daily_capster: Dict[date, Breakdown] = field(default_factory=dict)
+
+    @property
+    def days(self) -> int:
+        """Number of days with transactions."""
+        return len(self.daily) if self.daily is not None else 0
+
+
+class SliceAggregator:
+    """Aggregate a transaction slice with np.bincount over integer codes.
+
+    Categorical columns already carry codes; other columns are factorized once.
+    Each dimension costs one bincount for sums and one for counts, instead of a
+    groupby (or a boolean mask per label) per breakdown. Pre-aggregated frames
+    (rollup cube cells) carry a 'Count' column that weights the counts.
+    """
+
+    @staticmethod
+    def _codes(series: pd.Series) -> Tuple[np.ndarray, List]:
+        """Integer codes (-1 for missing) and the labels they index, labels sorted."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            labels = list(series.cat.categories)
+            # Registry categories are in first-seen order: renumber them in label order
+            order = np.argsort(np.array([str(label) for label in labels], dtype=object), kind='stable')
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            codes = np.where(codes >= 0, rank.take(np.maximum(codes, 0)) if len(rank) else -1, -1)
+            return codes, [labels[i] for i in order]
+        codes, uniques = pd.factorize(series, sort=True)
+        return codes, list(uniques)
+
+    @staticmethod
+    def _bincount(codes: np.ndarray, prices: np.ndarray, weights: Optional[np.ndarray],
+                  size: int) -> Tuple[np.ndarray, np.ndarray]:
+        valid = codes >= 0
+        sums = np.bincount(codes[valid], weights=prices[valid], minlength=size)
+        if weights is None:
+            counts = np.bincount(codes[valid], minlength=size)
+        else:
+            counts = np.rint(np.bincount(codes[valid], weights=weights[valid], minlength=size)).astype(np.int64)
+        return np.rint(sums).astype(np.int64), counts
+
+    @staticmethod
+    def _breakdown(codes: np.ndarray, labels: List, prices: np.ndarray, weights: Optional[np.ndarray],
+                   total: int) -> Breakdown:
+        sums, counts = SliceAggregator._bincount(codes, prices, weights, len(labels))
+        observed = np.flatnonzero(counts)  # categories without rows in this slice are left out
+        return Breakdown(
+            labels=[labels[i] for i in observed],
+            sums=sums[observed],
+            counts=counts[observed],
+            total=total,
+        )
+
+    @staticmethod
+    def summarize(df: pd.DataFrame) -> SliceSummary:
+        """Compute totals plus branch, capster, service, payment, daily and per-day capster breakdowns."""
+        if df.empty:
+            return SliceSummary()
+
+        prices = df['Price'].to_numpy(dtype=np.float64)
+        weights = df['Count'].to_numpy(dtype=np.float64) if 'Count' in df.columns else None
+        total = int(np.rint(prices.sum()))
+        count = int(np.rint(weights.sum())) if weights is not None else len(df)
+        summary = SliceSummary(total=total, count=count)
+
+        encoded = {}
+        for name, column in DIMENSIONS.items():
+            if column in df.columns:
+                encoded[column] = codes, labels = SliceAggregator._codes(df[column])
+                setattr(summary, name, SliceAggregator._breakdown(codes, labels, prices, weights, total))
+
+        if 'Date' in df.columns:
+            day_codes, days = pd.factorize(df['Date'].to_numpy().astype('datetime64[D]'), sort=True)
+            day_labels = list(pd.DatetimeIndex(days).date)
+            summary.daily = SliceAggregator._breakdown(day_codes, day_labels, prices, weights, total)
+
+            if 'Capster' in encoded:
+                # One bincount over the combined (day, capster) key
+                capster_codes, capster_labels = encoded['Capster']
+                width = max(len(capster_labels), 1)
+                keys = np.where(capster_codes >= 0, day_codes * width + capster_codes, -1)
+                sums, counts = SliceAggregator._bincount(keys, prices, weights, len(day_labels) * width)
+                for d, day in enumerate(day_labels):
+                    block = slice(d * width, (d + 1) * width)
+                    observed = np.flatnonzero(counts[block])
+                    summary.daily_capster[day] = Breakdown(
+                        labels=[capster_labels[i] for i in observed],
+                        sums=sums[block][observed],
+                        counts=counts[block][observed],
+                        total=int(summary.daily.sums[d]),
+                    )
+
+        return summary
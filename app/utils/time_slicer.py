@@ -0,0 +1,76 @@
+"""
+Time Slicer - Binary-search date filtering on frames sorted by a DatetimeIndex
+"""
+from datetime import datetime, timedelta
+from typing import Iterable
+
+import pandas as pd
+
+
+class TimeSlicer:
+    """Slice transaction frames by time without formatting dates to strings.
+
+    Frames are kept sorted on a DatetimeIndex built from the 'Date' column, so
+    every lookup is two ``searchsorted`` calls plus the size of the slice.
+    """
+
+    @staticmethod
+    def index_by_date(df: pd.DataFrame) -> pd.DataFrame:
+        """Return the frame sorted by 'Date' with a matching DatetimeIndex (no-op if already so)."""
+        if df.empty or 'Date' not in df.columns:
+            return df
+        if isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing:
+            return df
+        df = df.sort_values('Date', kind='mergesort')
+        df.index = pd.DatetimeIndex(df['Date'].values)
+        return df
+
+    @staticmethod
+    def _half_open(df: pd.DataFrame, start: datetime, stop: datetime) -> pd.DataFrame:
+        """Rows with start <= Date < stop."""
+        df = TimeSlicer.index_by_date(df)
+        if df.empty:
+            return df
+        lo = df.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = df.index.searchsorted(pd.Timestamp(stop), side='left')
+        return df.iloc[lo:hi]
+
+    @staticmethod
+    def between(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+        """Rows with start <= Date <= end."""
+        df = TimeSlicer.index_by_date(df)
+        if df.empty:
+            return df
+        lo = df.index.searchsorted(pd.Timestamp(start), side='left')
+        hi = df.index.searchsorted(pd.Timestamp(end), side='right')
+        return df.iloc[lo:hi]
+
+    @staticmethod
+    def since(df: pd.DataFrame, start: datetime) -> pd.DataFrame:
+        """Rows with Date >= start."""
+        df = TimeSlicer.index_by_date(df)
+        if df.empty:
+            return df
+        return df.iloc[df.index.searchsorted(pd.Timestamp(start), side='left'):]
+
+    @staticmethod
+    def day(df: pd.DataFrame, date: datetime) -> pd.DataFrame:
+        """Rows on the calendar day of ``date``."""
+        start = datetime(date.year, date.month, date.day)
+        return TimeSlicer._half_open(df, start, start + timedelta(days=1))
+
+    @staticmethod
+    def month(df: pd.DataFrame, year: int, month: int) -> pd.DataFrame:
+        """Rows in the given month."""
+        start = datetime(year, month, 1)
+        stop = datetime(year + month // 12, month % 12 + 1, 1)
+        return TimeSlicer._half_open(df, start, stop)
+
+    @staticmethod
+    def dates(df: pd.DataFrame, dates: Iterable[datetime]) -> pd.DataFrame:
+        """Rows on any of the given calendar days."""
+        df = TimeSlicer.index_by_date(df)
+        days = sorted({datetime(d.year, d.month, d.day) for d in dates})
+        if df.empty or not days:
+            return df.iloc[0:0]
+        return pd.concat([TimeSlicer.day(df, d) for d in days])
@@ -0,0 +1,139 @@
+"""
+Transaction Schema - Compact in-memory representation of transaction frames
+"""
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_COLUMNS = ['Capster', 'Service', 'Payment_Method', 'Branch']
+# Normalized (stripped, lowercase) capster name, used for alias matching
+CAPSTER_KEY = 'Capster_Key'
+
+
+class CategoryRegistry:
+    """Append-only category lists per column.
+
+    A value keeps the code it was first given for the lifetime of the process,
+    so frames built at different times share categories and concatenate as
+    categoricals instead of falling back to object columns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+
+    def categories(self, column: str) -> pd.Index:
+        with self._lock:
+            return pd.Index(list(self._categories.get(column, [])), dtype=object)
+
+    def codes_for(self, column: str, values: Iterable) -> Tuple[np.ndarray, pd.Index]:
+        """Registry codes of ``values`` (adding unseen ones) plus the category list they index."""
+        with self._lock:
+            categories = self._categories.setdefault(column, [])
+            codes = self._codes.setdefault(column, {})
+            result = []
+            for value in values:
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(categories)
+                    categories.append(value)
+                result.append(code)
+            return np.array(result, dtype='int32'), pd.Index(list(categories), dtype=object)
+
+    def lookup(self, column: str, values: Iterable) -> List[int]:
+        """Codes of already-known values (unknown values are skipped)."""
+        with self._lock:
+            codes = self._codes.get(column, {})
+            return [codes[v] for v in values if v in codes]
+
+    def encode(self, column: str, series: pd.Series) -> pd.Categorical:
+        """Encode a column against the registry. Only the distinct values are hashed."""
+        inverse, uniques = pd.factorize(series)  # NaN -> -1
+        value_codes, categories = self.codes_for(column, [str(u) for u in uniques])
+        codes = np.where(inverse >= 0, value_codes[inverse] if len(value_codes) else -1, -1).astype('int32')
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+    def remap(self, column: str, local_codes: np.ndarray, local_categories: List[str]) -> pd.Categorical:
+        """Turn codes into a private category list (e.g. a snapshot's) into registry categoricals."""
+        value_codes, categories = self.codes_for(column, [str(c) for c in local_categories])
+        if len(value_codes) == 0:
+            codes = np.full(len(local_codes), -1, dtype='int32')
+        else:
+            codes = value_codes.take(local_codes)
+        return pd.Categorical.from_codes(codes, categories=categories)
+
+
+REGISTRY = CategoryRegistry()
+
+
+class TransactionSchema:
+    """Compact transaction frames: categoricals with stable categories, int32 prices,
+    datetime64 dates and a normalized capster key column."""
+
+    @staticmethod
+    def add_capster_key(df: pd.DataFrame) -> pd.DataFrame:
+        """Derive Capster_Key from the Capster categories (one lower() per distinct name)."""
+        capster = df['Capster']
+        if not isinstance(capster.dtype, pd.CategoricalDtype):
+            capster = pd.Series(REGISTRY.encode('Capster', capster), index=df.index)
+        categories = capster.cat.categories
+        key_codes, key_categories = REGISTRY.codes_for(
+            CAPSTER_KEY, [str(c).strip().lower() for c in categories]
+        )
+        codes = capster.cat.codes.to_numpy()
+        mapped = np.where(codes >= 0, key_codes.take(np.maximum(codes, 0)) if len(key_codes) else -1, -1)
+        df[CAPSTER_KEY] = pd.Categorical.from_codes(mapped.astype('int32'), categories=key_categories)
+        return df
+
+    @staticmethod
+    def compact(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert a parsed transaction frame to the compact schema."""
+        if df.empty:
+            return df
+        if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        if 'Price' in df.columns:
+            df['Price'] = pd.to_numeric(df['Price'], errors='coerce').fillna(0).astype('int32')
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns and not (isinstance(df[col].dtype, pd.CategoricalDtype)
+                                          and df[col].cat.categories.equals(REGISTRY.categories(col))):
+                df[col] = REGISTRY.encode(col, df[col].astype(object))
+        if 'Capster' in df.columns:
+            TransactionSchema.add_capster_key(df)
+        return df
+
+    @staticmethod
+    def align(df: pd.DataFrame) -> pd.DataFrame:
+        """Move categoricals to the registry's current categories. Registry lists only grow
+        at the end, so codes of an earlier registry list stay valid and are only widened;
+        other category lists (a snapshot's own) are remapped."""
+        if df.empty:
+            return df
+        for col in CATEGORY_COLUMNS + [CAPSTER_KEY]:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                categories = REGISTRY.categories(col)
+                own = df[col].cat.categories
+                codes = df[col].cat.codes.to_numpy()
+                if not categories[:len(own)].equals(own):
+                    df[col] = REGISTRY.remap(col, codes, list(own))
+                elif len(own) != len(categories):
+                    df[col] = pd.Categorical.from_codes(codes, categories=categories)
+        return df
+
+    @staticmethod
+    def concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate compact frames, keeping categorical columns categorical."""
+        frames = [TransactionSchema.align(df.copy(deep=False)) for df in frames if not df.empty]
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames)
+
+    @staticmethod
+    def capster_codes(names: Iterable[str]) -> List[int]:
+        """Capster_Key codes of lowercase names (unknown names are skipped)."""
+        return REGISTRY.lookup(CAPSTER_KEY, names)
@@ -0,0 +1,94 @@
+"""
+Shared test fixtures: in-memory monthly sheets behind a SheetsService and a local mirror
+"""
+import re
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.mirror_service import MirrorService
+from app.services.sheets_service import SheetsService
+
+HEADER = ['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch']
+
+
+class FakeSpreadsheet:
+    """Serves values_batch_get from in-memory sheets and records requested ranges;
+    values_batch_update writes single-column ranges."""
+
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.requests = []
+
+    def values_batch_get(self, ranges):
+        self.requests.append(list(ranges))
+        value_ranges = []
+        for a1 in ranges:
+            name, cells = re.match(r"'(.*)'!(.*)", a1).groups()
+            rows = self.sheets[name]
+            m = re.match(r"A(\d*):[A-Z](\d*)", cells)
+            first = int(m.group(1) or 1)
+            last = int(m.group(2)) if m.group(2) else len(rows)
+            if first > len(rows) + 1:
+                raise Exception("Range exceeds grid limits")
+            value_ranges.append({'values': rows[first - 1:last]})
+        return {'valueRanges': value_ranges}
+
+    def values_batch_update(self, body):
+        for item in body['data']:
+            name, column, first, last = re.match(r"'(.*)'!([A-Z])(\d+):[A-Z](\d+)", item['range']).groups()
+            col = ord(column) - ord('A')
+            for number, value in zip(range(int(first), int(last) + 1), item['values']):
+                self.sheets[name][number - 1][col] = value[0]
+
+    def worksheets(self):
+        return [SimpleNamespace(title=name) for name in self.sheets]
+
+
+def _sheets_service(spreadsheet):
+    service = SheetsService.__new__(SheetsService)
+    service.sheet = spreadsheet
+    service._cache_lock = threading.RLock()
+    service._titles_loaded_at = datetime.now()
+    service._worksheet_cache = {name: None for name in spreadsheet.sheets}
+    return service
+
+
+def _row(day, price=25000):
+    return [f'2026-01-{day:02d} 10:00:00', 'John', 'Potong Rambut', str(price), 'Cash', 'Cabang A']
+
+
+def _mirror(spreadsheet):
+    return MirrorService(_sheets_service(spreadsheet), db_path=':memory:')
+
+
+@pytest.fixture
+def header():
+    """Header row of a monthly transaction sheet."""
+    return HEADER
+
+
+@pytest.fixture
+def row():
+    """Builds a January 2026 sale row: row(day, price=25000)."""
+    return _row
+
+
+@pytest.fixture
+def make_spreadsheet():
+    """Builds a FakeSpreadsheet from {sheet name: rows}."""
+    return FakeSpreadsheet
+
+
+@pytest.fixture
+def make_sheets_service():
+    """Builds a SheetsService reading a FakeSpreadsheet."""
+    return _sheets_service
+
+
+@pytest.fixture
+def make_mirror():
+    """Builds an in-memory MirrorService over a FakeSpreadsheet."""
+    return _mirror
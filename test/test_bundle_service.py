@@ -0,0 +1,42 @@
+"""
+Unit Tests for BundleService (nightly report bundle)
+"""
+import json
+from datetime import datetime
+
+from app.services.bundle_service import BundleService
+from app.services.report_service import ReportService
+
+
+def test_nightly_bundle_summarizes_and_prerenders(header, make_spreadsheet, make_sheets_service, tmp_path):
+    """The bundle covers today, week and month to date, is stored as a snapshot and
+    leaves the owner reports in the render cache under the keys the morning requests use"""
+    spreadsheet = make_spreadsheet({'Februari 2026': [
+        header,
+        ['2026-02-02 10:00:00', 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A'],   # Monday
+        ['2026-02-04 10:00:00', 'Ana', 'Coloring', '100000', 'QRIS', 'Cabang B'],
+        ['2026-02-04 11:00:00', 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A'],
+        ['2026-02-05 10:00:00', 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A'],   # tomorrow
+        ['2026-01-30 10:00:00', 'Ana', 'Coloring', '100000', 'QRIS', 'Cabang B'],        # other month
+    ]})
+    reports = ReportService(make_sheets_service(spreadsheet))
+    bundles = BundleService(reports, base_dir=str(tmp_path))
+    bundle = bundles.build_and_save(datetime(2026, 2, 4, 23, 0))
+
+    assert bundle.date == '2026-02-04'
+    assert 'HARI INI (04 February 2026)\n  2 transaksi, Rp 125,000' in bundle.text
+    assert 'MINGGU INI (02 Feb - 04 Feb)\n  3 transaksi, Rp 150,000' in bundle.text
+    assert 'BULAN INI (Februari s.d. tanggal 4)\n  3 transaksi, Rp 150,000' in bundle.text
+    assert 'John: Rp 25,000 | 2 layanan (Rp 50,000)' in bundle.text
+    with open(tmp_path / 'bundle_2026-02-04.json', encoding='utf-8') as f:
+        assert json.load(f)['text'] == bundle.text
+
+    # Next morning: the running month's report (its day included) and the week come from the bundle
+    morning = datetime(2026, 2, 5, 10, 30)
+    hits = reports.rendered.stats()['hits']
+    assert bundle.reports_for == '2026-02-05 09:00'
+    assert 'Rata-rata/hari: Rp 55,000' in reports.generate_monthly_report(now=morning)   # the sheet / 5 days
+    reports.generate_weekly_report(now=morning)
+    reports.generate_monthly_profit_report(2026, 2)
+    reports.generate_weekly_breakdown(2026, 2, is_owner=True)
+    assert reports.rendered.stats()['hits'] == hits + 4
@@ -0,0 +1,128 @@
+"""
+Unit Tests for TransactionCache (per-month partitions over the mirror)
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.services.cache_service import TransactionCache
+from app.services.mirror_service import MirrorService
+
+
+def test_write_through_row_is_visible_once(header, row, make_spreadsheet, make_mirror):
+    """A queued sale shows up immediately and is not doubled after flush + sync"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1)]})
+    cache = TransactionCache(make_mirror(spreadsheet))
+    assert len(cache.get_month(2026, 1)) == 1
+    version = cache.version(2026, 1)
+
+    entry = {'id': 'abc', 'sheet': 'Januari 2026', 'row': row(2)}
+    cache.push_entry(entry)
+    assert len(cache.get_month(2026, 1)) == 2
+    assert cache.version(2026, 1) == version + 1
+
+    spreadsheet.sheets['Januari 2026'].append(row(2))
+    cache.mirror.confirm_flushed([entry])
+    cache.mirror.sync_sheets(['Januari 2026'])
+    assert len(cache.get_month(2026, 1)) == 2
+
+
+def test_invalidated_sheet_serves_edited_rows(header, row, make_spreadsheet, make_mirror):
+    """Rows edited in place are served after invalidate_sheets, not rebuilt from the old mirror rows"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2), row(3), row(4)]})
+    cache = TransactionCache(make_mirror(spreadsheet))
+    assert cache.get_month(2026, 1)['Capster'].tolist() == ['John'] * 4
+
+    spreadsheet.sheets['Januari 2026'][2][1] = 'Joni'
+    cache.invalidate_sheets(['Januari 2026'])
+    assert cache.get_month(2026, 1)['Capster'].tolist() == ['John', 'Joni', 'John', 'John']
+
+
+def test_rollup_cube_updates_on_write_through(header, row, make_spreadsheet, make_mirror):
+    """The month's rollup cube folds in new sales in place and matches the raw rows"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(1), row(2, price=50000)]})
+    cache = TransactionCache(make_mirror(spreadsheet))
+    cube = cache.get_rollup([(2026, 1)])
+    assert len(cube) == 2
+    assert cube['Count'].sum() == 3 and cube['Price'].sum() == 100000
+
+    cache.push_entry({'id': 'abc', 'sheet': 'Januari 2026', 'row': row(2, price=50000)})
+    partition_cube = cache._partitions[(2026, 1)].cube
+    cube = cache.get_rollup([(2026, 1)])
+    assert cache._partitions[(2026, 1)].cube is partition_cube
+    assert len(cube) == 2
+    assert cube['Count'].tolist() == [2, 2]
+    assert cube['Price'].tolist() == [50000, 100000]
+
+
+def test_concurrent_misses_share_one_load(header, row, make_spreadsheet, make_mirror):
+    """Readers of the same month wait for one in-flight load instead of each querying the mirror"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    mirror = make_mirror(spreadsheet)
+    mirror.ensure_year(2026)
+    loads = []
+    query = mirror.get_transactions_for_months
+
+    def slow_query(months):
+        loads.append(months)
+        time.sleep(0.05)
+        return query(months)
+
+    mirror.get_transactions_for_months = slow_query
+    cache = TransactionCache(mirror)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_month(2026, 1))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [[(2026, 1)]]
+    assert all(df is results[0] for df in results) and len(results[0]) == 2
+
+
+def test_expired_partition_served_stale_then_rechecked(header, row, make_spreadsheet, make_mirror):
+    """Past the TTL the old partition is served and re-checked in the background;
+    past the max staleness the re-check happens before returning"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1)]})
+    cache = TransactionCache(make_mirror(spreadsheet), ttl=60, max_staleness=600)
+    df = cache.get_month(2026, 1)
+    requests = len(spreadsheet.requests)
+    spreadsheet.sheets['Januari 2026'].append(row(2))
+
+    partition = cache._partitions[(2026, 1)]
+    partition.loaded_at = cache.mirror._synced_at['Januari 2026'] = datetime.now() - timedelta(seconds=120)
+    assert cache.get_month(2026, 1) is df
+    assert cache.mirror._full_check_sheets == {'Januari 2026'}
+    assert len(spreadsheet.requests) == requests
+
+    partition.loaded_at = cache.mirror._synced_at['Januari 2026'] = datetime.now() - timedelta(seconds=900)
+    assert len(cache.get_month(2026, 1)) == 2
+
+
+def test_partition_cache_evicts_over_memory_budget(header, row, make_spreadsheet, make_mirror):
+    """Least recently used months are evicted past the memory budget; the current month stays"""
+    now = datetime.now()
+    current = MirrorService._sheet_name(now.year, now.month)
+    current_row = [now.strftime('%Y-%m-01 10:00:00'), 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A']
+    spreadsheet = make_spreadsheet({
+        'Januari 2026': [header, row(1)],
+        'Februari 2026': [header, ['2026-02-01 10:00:00', 'Ana', 'Coloring', '50000', 'QRIS', 'Cabang B']],
+        current: [header, current_row],
+    })
+    cache = TransactionCache(make_mirror(spreadsheet))
+    cache.get_month(now.year, now.month)
+    cache.get_month(2026, 1)
+    one_month = cache._partitions[(2026, 1)].nbytes
+    assert one_month > 0
+    cache.max_bytes = cache.stats()['bytes'] + one_month // 2
+
+    cache.get_month(2026, 1)
+    cache.get_month(2026, 2)
+    assert set(cache._partitions) == {(now.year, now.month), (2026, 2)}
+    assert cache.stats()['bytes'] == sum(p.nbytes for p in cache._partitions.values())
+
+    cache.get_month(2026, 1)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 2)
+    assert (now.year, now.month) in cache._partitions
@@ -0,0 +1,107 @@
+"""
+Unit Tests for the batched, resumable capster name migration
+"""
+import re
+from types import SimpleNamespace
+
+from app.services.cache_service import TransactionCache
+from app.services.mirror_service import MirrorService
+from app.services.report_service import ReportService
+from app.services.sheets_service import SheetsService
+
+HEADER = ['Date', 'Capster', 'Service', 'Price', 'Payment', 'Branch']
+
+
+class FakeSpreadsheet:
+    """In-memory sheets; values_batch_update applies single-column ranges and is recorded."""
+
+    def __init__(self, sheets, fail_on=None):
+        self.sheets = sheets
+        self.fail_on = fail_on
+        self.updates = []
+
+    def worksheets(self):
+        return [SimpleNamespace(title=name) for name in self.sheets]
+
+    def values_batch_get(self, ranges):
+        return {'valueRanges': [{'values': self.sheets[re.match(r"'(.*)'!", a1).group(1)]} for a1 in ranges]}
+
+    def values_batch_update(self, body):
+        self.updates.append(body)
+        for item in body['data']:
+            name, first, last = re.match(r"'(.*)'!B(\d+):B(\d+)", item['range']).groups()
+            if name == self.fail_on:
+                raise Exception("quota exceeded")
+            for row, value in zip(range(int(first), int(last) + 1), item['values']):
+                self.sheets[name][row - 1][1] = value[0]
+
+
+def _rows(*names):
+    return [HEADER] + [['2026-01-01 10:00:00', name, 'Potong Rambut', '25000', 'Cash', 'Cabang A'] for name in names]
+
+
+def _sheets_service(spreadsheet):
+    service = SheetsService.__new__(SheetsService)
+    service.sheet = spreadsheet
+    service.on_transactions_edited = None
+    return service
+
+
+def test_migration_writes_one_batch_per_sheet(tmp_path):
+    """Renames of a sheet go out in one request, consecutive rows merged into one range"""
+    spreadsheet = FakeSpreadsheet({
+        'Januari 2026': _rows('jo', 'jo', 'Budi', 'JO'),
+        'Februari 2026': _rows('Budi'),
+        'CapsterList': [['TelegramID', 'Name', 'Alias'], ['1', 'jo', 'jo']],
+    })
+    service = _sheets_service(spreadsheet)
+    progress = []
+    state = str(tmp_path / 'migration.json')
+
+    results = service.migrate_capster_names({'jo': 'John'}, progress=lambda *args: progress.append(args),
+                                            state_path=state)
+
+    assert results == {'Januari 2026': 3}
+    assert len(spreadsheet.updates) == 1
+    assert [item['range'] for item in spreadsheet.updates[0]['data']] == ["'Januari 2026'!B2:B3", "'Januari 2026'!B5:B5"]
+    assert [row[1] for row in spreadsheet.sheets['Januari 2026'][1:]] == ['John', 'John', 'Budi', 'John']
+    assert progress == [(1, 2, 'Januari 2026', 3), (2, 2, 'Februari 2026', 0)]
+    assert not service.capster_migration_pending(state)
+
+
+def test_interrupted_migration_resumes(tmp_path):
+    """A failed run leaves its progress behind; the next run skips the finished sheets"""
+    spreadsheet = FakeSpreadsheet({
+        'Januari 2026': _rows('jo'),
+        'Februari 2026': _rows('jo', 'jo'),
+    }, fail_on='Februari 2026')
+    service = _sheets_service(spreadsheet)
+    state = str(tmp_path / 'migration.json')
+
+    assert service.migrate_capster_names({'jo': 'John'}, state_path=state) == {'Januari 2026': 1}
+    assert service.capster_migration_pending(state)
+
+    spreadsheet.fail_on = None
+    spreadsheet.updates.clear()
+    results = service.migrate_capster_names({'jo': 'John'}, state_path=state)
+
+    assert results == {'Januari 2026': 1, 'Februari 2026': 2}
+    assert ["'Februari 2026'" in item['range'] for body in spreadsheet.updates for item in body['data']] == [True]
+    assert not service.capster_migration_pending(state)
+
+
+def test_migrated_names_reach_cache_and_reports(header, row, make_spreadsheet, make_sheets_service, tmp_path):
+    """After a migration the cache and reports show the real name, without waiting for a re-check"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2), row(3)]})
+    spreadsheet.sheets['Januari 2026'][2][1] = 'jo'
+    service = make_sheets_service(spreadsheet)
+    cache = TransactionCache(MirrorService(service, db_path=':memory:'))
+    reports = ReportService(service, cache=cache)
+    service.on_transactions_edited = cache.invalidate_sheets
+    assert 'jo' in cache.get_month(2026, 1)['Capster'].tolist()
+    reports.generate_monthly_report(2026, 1)
+
+    state = str(tmp_path / 'migration.json')
+    assert service.migrate_capster_names({'jo': 'Joni'}, state_path=state) == {'Januari 2026': 1}
+    assert cache.get_month(2026, 1)['Capster'].tolist() == ['John', 'Joni', 'John']
+    assert 'Joni' in reports.generate_monthly_report(2026, 1)
@@ -0,0 +1,91 @@
+"""
+Unit Tests for the config bootstrap (one batch read, local snapshot fallback)
+"""
+import copy
+import json
+import threading
+
+import pytest
+
+from app.config import constants
+from app.config.constants import SHEET_BRANCHES, SHEET_CAPSTERS, SHEET_PRODUCTS, SHEET_SERVICES
+from app.services.config_service import ConfigService
+from app.services.sheets_service import SheetsService
+
+
+def _values(price='25000'):
+    return {
+        SHEET_SERVICES: [['ServiceID', 'Name', 'Category', 'Price'], ['Cut', 'Potong Rambut', 'main', price]],
+        SHEET_BRANCHES: [['BranchID', 'Name', 'CommissionRate'], ['A', 'Cabang A', '0,5']],
+        SHEET_PRODUCTS: [['ProductID', 'Name', 'Price'], ['Pomade', 'Pomade', '50000']],
+        SHEET_CAPSTERS: [['Name', 'TelegramID', 'Alias'], ['John', '111', 'jo']],
+    }
+
+
+class FakeSheets:
+    """get_config_values from memory; `release` gates the call to simulate a slow Sheets."""
+
+    _values_to_records = staticmethod(SheetsService._values_to_records)
+
+    def __init__(self, values=None):
+        self.values = values
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_config_values(self):
+        self.calls += 1
+        self.release.wait(5)
+        return copy.deepcopy(self.values)
+
+
+@pytest.fixture(autouse=True)
+def restore_constants():
+    """Config loads update the constants in place; put them back after each test."""
+    names = ['SERVICES_MAIN', 'SERVICES_COLORING', 'ALL_SERVICES', 'BRANCHES', 'PRODUCTS']
+    saved = {name: copy.deepcopy(getattr(constants, name)) for name in names}
+    yield
+    for name, value in saved.items():
+        getattr(constants, name).clear()
+        getattr(constants, name).update(value)
+
+
+def test_bootstrap_loads_all_config_and_saves_snapshot(tmp_path):
+    """One read fills every config constant and the capster rows; unchanged reloads keep the version"""
+    sheets = FakeSheets(_values())
+    config = ConfigService(sheets, snapshot_path=str(tmp_path / 'config.json'))
+
+    assert config.bootstrap(timeout=1)
+    assert sheets.calls == 1
+    assert constants.ALL_SERVICES == {'Cut': {'name': 'Potong Rambut', 'price': 25000}}
+    assert constants.BRANCHES['A']['commission_rate'] == 0.5
+    assert list(constants.PRODUCTS) == ['Pomade']
+    assert config.capster_records == [{'Name': 'John', 'TelegramID': '111', 'Alias': 'jo'}]
+
+    assert config.load_all_config()
+    sheets.values = _values(price='30000')
+    assert config.load_all_config()
+    with open(tmp_path / 'config.json', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['version'] == 2
+    assert snapshot['sheets'][SHEET_SERVICES][1][3] == '30000'
+
+
+def test_slow_sheets_starts_from_snapshot_then_reconciles(tmp_path):
+    """Past the timeout the snapshot is used; the pending read is applied by the next reload"""
+    path = str(tmp_path / 'config.json')
+    ConfigService(FakeSheets(_values()), snapshot_path=path).bootstrap(timeout=1)
+
+    sheets = FakeSheets(_values(price='40000'))
+    sheets.release.clear()
+    config = ConfigService(sheets, snapshot_path=path)
+
+    assert not config.bootstrap(timeout=0.05)
+    assert config.from_snapshot
+    assert constants.ALL_SERVICES['Cut']['price'] == 25000
+
+    sheets.release.set()
+    assert config.load_all_config()
+    assert sheets.calls == 1   # the startup read was reused, not repeated
+    assert not config.from_snapshot
+    assert constants.ALL_SERVICES['Cut']['price'] == 40000
@@ -0,0 +1,131 @@
+"""
+Unit Tests for the config sheet row index (keyed updates and deletes)
+"""
+import re
+import threading
+
+from gspread.utils import a1_to_rowcol
+
+from app.config.constants import SHEET_SERVICES
+from app.services.sheets_service import SheetsService
+
+
+class FakeWorksheet:
+    """In-memory worksheet counting reads and write requests. Like Sheets, a write past
+    the last row fails."""
+
+    title = SHEET_SERVICES
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.full_reads = 0
+        self.reads = 0
+        self.writes = 0
+
+    def get_all_values(self):
+        self.full_reads += 1
+        return [list(row) for row in self.rows]
+
+    def batch_get(self, ranges):
+        self.reads += 1
+        result = []
+        for a1 in ranges:
+            first, last = (int(n) for n in re.match(r"(\d+):(\d+)", a1).groups())
+            result.append([list(row) for row in self.rows[first - 1:last]])
+        return result
+
+    def batch_update(self, data, value_input_option=None):
+        self.writes += 1
+        for item in data:
+            row, col = a1_to_rowcol(item['range'])
+            self._check(row)
+            self.rows[row - 1][col - 1] = item['values'][0][0]
+
+    def append_row(self, values):
+        self.writes += 1
+        self.rows.append([str(v) for v in values])
+        return {'updates': {'updatedRange': f"'{self.title}'!A{len(self.rows)}:D{len(self.rows)}"}}
+
+    def delete_rows(self, index):
+        self.writes += 1
+        self._check(index)
+        del self.rows[index - 1]
+
+    def _check(self, row):
+        if row > len(self.rows):
+            raise ValueError(f"Row {row} exceeds grid limits")
+
+
+def _service(worksheet):
+    service = SheetsService.__new__(SheetsService)
+    service._cache_lock = threading.RLock()
+    service._worksheet_cache = {SHEET_SERVICES: worksheet}
+    service._row_indexes = {}
+    service._config_lock = threading.RLock()
+    service.on_config_written = None
+    return service
+
+
+def _worksheet():
+    return FakeWorksheet([
+        ['ServiceID', 'Name', 'Category', 'Price'],
+        ['cut', 'Potong Rambut', 'main', '25000'],
+        ['wash', 'Cuci Rambut', 'main', '10000'],
+        ['color', 'Semir', 'coloring', '50000'],
+    ])
+
+
+def test_multi_field_update_is_one_write_without_full_read():
+    """Once indexed, an update makes no read and writes once"""
+    worksheet = _worksheet()
+    service = _service(worksheet)
+    assert len(service.get_all_services()) == 3
+
+    assert service.update_service('wash', Name='Keramas', Price=15000)
+    assert worksheet.full_reads == 1 and worksheet.reads == 0 and worksheet.writes == 1
+    assert worksheet.rows[2] == ['wash', 'Keramas', 'main', 15000]
+    assert not service.update_service('missing', Name='x')
+
+
+def test_index_follows_appends_and_deletes():
+    """Rows added and removed through the service keep the index in step"""
+    worksheet = _worksheet()
+    service = _service(worksheet)
+    service.get_all_services()
+
+    assert service.add_service('beard', 'Cukur Jenggot', 'main', 15000)
+    assert service.remove_service('cut')
+    assert service.update_service('beard', Price=20000)
+    assert service.remove_service('color')
+
+    assert worksheet.full_reads == 1 and worksheet.reads == 0
+    assert [row[0] for row in worksheet.rows] == ['ServiceID', 'wash', 'beard']
+    assert worksheet.rows[2][3] == 20000
+
+
+def test_config_load_picks_up_rows_moved_elsewhere():
+    """A row inserted outside the bot is in the index after the next config load"""
+    worksheet = _worksheet()
+    service = _service(worksheet)
+    service.get_all_services()
+
+    worksheet.rows.insert(1, ['trim', 'Rapikan', 'main', '20000'])
+    service.get_all_services()
+    assert service.remove_service('wash')
+
+    assert worksheet.full_reads == 2 and worksheet.reads == 0
+    assert [row[0] for row in worksheet.rows] == ['ServiceID', 'trim', 'cut', 'color']
+
+
+def test_failed_write_rebuilds_index_and_retries():
+    """Rows removed outside the bot leave the indexed row past the end: the index is
+    rebuilt and the write lands on the key's current row"""
+    worksheet = _worksheet()
+    service = _service(worksheet)
+    service.get_all_services()
+
+    del worksheet.rows[1:3]
+    assert service.update_service('color', Price=60000)
+
+    assert worksheet.full_reads == 2 and worksheet.writes == 2
+    assert worksheet.rows == [['ServiceID', 'Name', 'Category', 'Price'], ['color', 'Semir', 'coloring', 60000]]
@@ -0,0 +1,152 @@
+"""
+Unit Tests for MirrorService (local SQLite mirror, incremental tail-fetch sync)
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.services.mirror_service import MirrorService
+from app.services.report_service import ReportService
+from app.services.snapshot_service import SnapshotService
+from app.utils.transaction_schema import CAPSTER_KEY, TransactionSchema
+
+
+def test_sync_reads_only_new_rows(header, row, make_spreadsheet, make_mirror):
+    """A re-sync only fetches rows after the ingested offset"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    mirror = make_mirror(spreadsheet)
+    assert mirror.sync_year(2026)
+    assert len(mirror.get_transactions_by_year(2026)) == 2
+
+    spreadsheet.sheets['Januari 2026'].append(row(3))
+    assert mirror.sync_year(2026)
+
+    assert len(mirror.get_transactions_by_year(2026)) == 3
+    assert spreadsheet.requests[-1] == ["'Januari 2026'!A1:F2", "'Januari 2026'!A3:F"]
+
+
+def test_edited_rows_trigger_full_reload(header, row, make_spreadsheet, make_mirror):
+    """A changed anchor row falls back to reloading the whole month"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    mirror = make_mirror(spreadsheet)
+    mirror.sync_year(2026)
+
+    spreadsheet.sheets['Januari 2026'][2] = row(2, price=50000)
+    mirror.sync_year(2026)
+
+    assert mirror.get_transactions_by_year(2026)['Price'].tolist() == [25000, 50000]
+    assert spreadsheet.requests[-1] == ["'Januari 2026'!A:F"]
+
+
+def test_full_check_catches_edits_between_rows(header, row, make_spreadsheet, make_mirror):
+    """Edits to middle rows are invisible to the tail sync but caught by the full value check"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header] + [row(day) for day in range(1, 5)]})
+    mirror = make_mirror(spreadsheet)
+    mirror.sync_year(2026)
+
+    spreadsheet.sheets['Januari 2026'][2] = row(2, price=30000)
+    spreadsheet.sheets['Januari 2026'][3] = row(3, price=40000)
+    mirror.sync_year(2026)
+    assert mirror.get_transactions_by_year(2026)['Price'].tolist() == [25000] * 4
+
+    spreadsheet.sheets['Januari 2026'].append(row(5))
+    assert mirror.sync_year(2026, full=True)
+    assert mirror.get_transactions_by_year(2026)['Price'].tolist() == [25000, 30000, 40000, 25000, 25000]
+    assert spreadsheet.requests[-1] == ["'Januari 2026'!A:F"]
+
+    # Unchanged sheet plus new rows: only the new rows are inserted
+    version = mirror.sheet_version('Januari 2026')
+    spreadsheet.sheets['Januari 2026'].append(row(6))
+    mirror.sync_year(2026, full=True)
+    assert mirror.sheet_version('Januari 2026') == version + 1
+    assert len(mirror.get_transactions_by_year(2026)) == 6
+
+
+def test_reports_read_from_mirror(header, row, make_spreadsheet, make_sheets_service):
+    """Report reads are served locally once the year is mirrored"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    report = ReportService(make_sheets_service(spreadsheet))
+    assert len(report._get_or_fetch_transactions(2026)) == 2
+    requests = len(spreadsheet.requests)
+
+    report.mirror.get_transactions_by_range(datetime(2026, 1, 2), datetime(2026, 1, 2, 23, 59, 59))
+    assert len(report._get_or_fetch_transactions(2026)) == 2
+    assert len(spreadsheet.requests) == requests
+
+
+def test_closed_month_served_from_snapshot(header, row, make_spreadsheet, make_sheets_service, tmp_path):
+    """Closed months are frozen once and re-frozen when their content changes"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    snapshots = SnapshotService(base_dir=str(tmp_path))
+    mirror = MirrorService(make_sheets_service(spreadsheet), db_path=':memory:', snapshots=snapshots)
+    mirror._is_closed = lambda sheet_name: True
+    mirror.sync_year(2026)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    df = mirror.get_transactions_by_year(2026)
+    assert df['Price'].tolist() == [25000, 25000]
+    assert df['Capster'].tolist() == ['John', 'John']
+
+    spreadsheet.sheets['Januari 2026'][2] = row(2, price=50000)
+    mirror.sync_year(2026)
+    assert mirror.get_transactions_by_year(2026)['Price'].tolist() == [25000, 50000]
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A closed month edited in a middle row is re-frozen on the full check, with a new hash
+    spreadsheet.sheets['Januari 2026'].append(row(3))
+    mirror.sync_year(2026)
+    content_hash = mirror.month_content_hash(2026, 1)
+    spreadsheet.sheets['Januari 2026'][2] = row(2, price=60000)
+    mirror.sync_year(2026, full=True)
+    assert mirror.month_content_hash(2026, 1) != content_hash
+    assert mirror.get_transactions_by_year(2026)['Price'].tolist() == [25000, 60000, 25000]
+
+
+def _mapped(array) -> bool:
+    """True when the array is a view of a memory-mapped file."""
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def test_snapshot_loads_as_views_of_its_files(header, row, make_spreadsheet, make_sheets_service, tmp_path):
+    """A loaded snapshot wraps the mapped column files; combined with live rows its
+    categories move to the registry"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(2), row(1), row(3, price=40000)]})
+    snapshots = SnapshotService(base_dir=str(tmp_path))
+    mirror = MirrorService(make_sheets_service(spreadsheet), db_path=':memory:', snapshots=snapshots)
+    mirror._is_closed = lambda sheet_name: True
+    mirror.sync_year(2026)
+
+    df = snapshots.load('Januari 2026', mirror.month_content_hash(2026, 1))
+    for values in [df['Date'].values, df.index.values, df['Capster'].cat.codes.to_numpy(), df['Price'].values]:
+        assert _mapped(values)
+    assert df['Date'].dt.day.tolist() == [1, 2, 3]
+
+    live = pd.DataFrame({'Date': [datetime(2026, 2, 1)], 'Capster': ['Zidan'], 'Service': ['Coloring'],
+                         'Price': [50000], 'Payment_Method': ['QRIS'], 'Branch': ['Cabang B']})
+    combined = TransactionSchema.concat([df, TransactionSchema.compact(live)])
+    assert isinstance(combined['Capster'].dtype, pd.CategoricalDtype)
+    assert combined['Capster'].tolist() == ['John', 'John', 'John', 'Zidan']
+    assert combined['Price'].tolist() == [25000, 25000, 40000, 50000]
+
+
+def test_compact_frames_concat_as_categoricals(header, row, make_spreadsheet, make_mirror):
+    """Frames parsed at different times share categories and stay compact when combined"""
+    spreadsheet = make_spreadsheet({
+        'Januari 2026': [header, row(1)],
+        'Februari 2026': [header, ['2026-02-01 10:00:00', ' Zidan ', 'Coloring', '50000', 'QRIS', 'Cabang B']],
+    })
+    mirror = make_mirror(spreadsheet)
+    df = TransactionSchema.concat([
+        mirror.get_transactions_for_months([(2026, 1)]),
+        mirror.get_transactions_for_months([(2026, 2)]),
+    ])
+    assert df['Price'].dtype == 'int32'
+    assert isinstance(df['Capster'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['Service'].dtype, pd.CategoricalDtype)
+    assert df['Service'].tolist() == ['Potong Rambut', 'Coloring']
+
+    zidan = df[df[CAPSTER_KEY].cat.codes.isin(TransactionSchema.capster_codes({'zidan'}))]
+    assert zidan['Price'].tolist() == [50000]
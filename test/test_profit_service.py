@@ -0,0 +1,63 @@
+"""
+Unit Tests for ProfitService (multi-month profit per branch)
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from app.services.profit_service import ProfitService
+from app.services.rollup_cube import RollupCube
+from app.utils.transaction_schema import TransactionSchema
+
+BRANCHES = {
+    'cabang_a': {'short': 'Cabang A', 'commission_rate': 0, 'operational_cost': {'tempat': 100000}},
+    'cabang_b': {'short': 'Cabang B', 'commission_rate': 0.5, 'operational_cost': {'tempat': 50000, 'wifi': 10000}},
+}
+
+
+class FakeCache:
+    """Serves rollup cells built from fixed rows instead of the mirror."""
+
+    def __init__(self, rows):
+        df = pd.DataFrame(rows, columns=['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch'])
+        self.cube = RollupCube.build(TransactionSchema.compact(df)).frame()
+        self.rollup_calls = []
+
+    def version(self, year, month):
+        return 0
+
+    def get_rollup(self, months):
+        self.rollup_calls.append(sorted(months))
+        if self.cube.empty:
+            return self.cube
+        wanted = set(months)
+        return self.cube[[(d.year, d.month) in wanted for d in self.cube['Date']]]
+
+
+def test_profit_frame_covers_months_by_branches():
+    """One call returns a row per month × branch, joined against the cost table"""
+    cache = FakeCache([
+        (datetime(2026, 1, 5), 'John', 'Potong Rambut', 200000, 'Cash', 'Cabang A'),
+        (datetime(2026, 1, 6), 'Ana', 'Coloring', 100000, 'QRIS', 'Cabang B'),
+        (datetime(2026, 2, 3), 'Ana', 'Coloring', 40000, 'QRIS', 'Cabang B'),
+        (datetime(2026, 2, 4), 'Budi', 'Potong Rambut', 30000, 'Cash', 'Cabang Lama'),
+    ])
+    engine = ProfitService(cache)
+    frame = engine.profit_frame([(2026, 1), (2026, 2), (2026, 3)], costs=ProfitService.cost_table(BRANCHES))
+
+    assert list(zip(frame['Month'], frame['Branch'])) == [
+        (1, 'Cabang A'), (1, 'Cabang B'), (2, 'Cabang A'), (2, 'Cabang B'),
+    ]
+    assert frame['Revenue'].tolist() == [200000, 100000, 0, 40000]
+    assert frame['Operational Cost'].tolist() == [100000, 110000, 100000, 80000]
+    assert frame['Net Profit'].tolist() == [100000, -10000, -100000, -40000]
+
+    # Cached per month: a second view only reads months not seen before
+    engine.profit_frame([(2026, 2), (2026, 4)], costs=ProfitService.cost_table(BRANCHES))
+    assert cache.rollup_calls == [[(2026, 1), (2026, 2), (2026, 3)], [(2026, 4)]]
+
+
+def test_profit_frame_without_sales_is_empty():
+    """Months without transactions produce no rows (and no fixed costs)"""
+    engine = ProfitService(FakeCache([]))
+    assert engine.profit_frame([(2026, 1)], costs=ProfitService.cost_table(BRANCHES)).empty
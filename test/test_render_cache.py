@@ -0,0 +1,46 @@
+"""
+Unit Tests for RenderCache (finished report texts)
+"""
+import re
+
+from app.services.cache_service import TransactionCache
+from app.services.render_cache import RenderCache
+from app.services.report_service import ReportService
+
+
+def _without_time(text):
+    return re.sub(r'⏰ Generated: .*', '', text)
+
+
+def test_rendered_reports_reused_until_new_sale(header, row, make_spreadsheet, make_sheets_service, make_mirror):
+    """Repeated report requests are served from the render cache until their month changes"""
+    spreadsheet = make_spreadsheet({'Januari 2026': [header, row(1), row(2)]})
+    cache = TransactionCache(make_mirror(spreadsheet))
+    reports = ReportService(make_sheets_service(spreadsheet), cache=cache)
+
+    first = reports.generate_monthly_report(2026, 1)
+    assert _without_time(reports.generate_monthly_report(2026, 1)) == _without_time(first)
+    assert reports.generate_monthly_report(2026, 1, user='John') != first
+    assert reports.rendered.stats()['hits'] == 1
+
+    # The cached text keeps a placeholder: each request shows its own "Generated" time
+    cached = next(iter(reports.rendered._entries.values()))
+    assert '{generated:%d %b %Y, %H:%M:%S}' in cached
+    assert '{generated:' not in first and '⏰ Generated: ' in first
+
+    cache.push_entry({'id': 'abc', 'sheet': 'Januari 2026', 'row': row(3)})
+    assert 'Total Transaksi: 3' in reports.generate_monthly_report(2026, 1)
+
+
+def test_render_cache_evicts_least_recently_used():
+    """The render cache is capped by entries and by total characters"""
+    rendered = RenderCache(max_entries=2, max_chars=10)
+    rendered.put('a', 'aaa')
+    rendered.put('b', 'bbb')
+    assert rendered.get('a') == 'aaa'
+    rendered.put('c', 'ccc')
+    assert rendered.get('b') is None and rendered.get('a') == 'aaa'
+
+    rendered.put('d', 'dddddddd')
+    assert len(rendered) == 1 and rendered.get('d') == 'dddddddd'
+    assert rendered.stats()['evictions'] == 3
@@ -0,0 +1,43 @@
+"""
+Unit Tests for ReportService (annual profit report)
+"""
+from app.config import constants
+from app.services.report_service import ReportService
+from app.utils.helpers import TELEGRAM_MESSAGE_LIMIT, _message_length, split_message
+
+
+def test_annual_profit_report_compares_years(header, row, make_spreadsheet, make_sheets_service):
+    """The annual report covers every month with sales and compares it with the previous year"""
+    spreadsheet = make_spreadsheet({
+        'Januari 2025': [header, ['2025-01-03 10:00:00', 'John', 'Potong Rambut', '100000', 'Cash', 'Cabang A']],
+        'Januari 2026': [header, row(1, price=150000), row(2, price=50000)],
+        'Februari 2026': [header, ['2026-02-01 10:00:00', 'Ana', 'Coloring', '60000', 'QRIS', 'Cabang B']],
+    })
+    report = ReportService(make_sheets_service(spreadsheet)).generate_annual_profit_report(2026)
+
+    assert 'LAPORAN PROFIT TAHUNAN - 2026' in report
+    assert 'Januari: Rp 200,000' in report and 'Februari: Rp 60,000' in report
+    assert 'Bulan terbaik: Januari' in report
+    assert 'PERBANDINGAN 2025 → 2026' in report
+    assert 'Jan: Rp 100,000 → Rp 200,000 (+100.0%)' in report
+
+
+def test_annual_profit_report_fits_telegram_messages(header, make_spreadsheet, make_sheets_service, monkeypatch):
+    """Three branches over two years pass one message's limit; the split parts each fit"""
+    monkeypatch.setitem(constants.BRANCHES, 'cabang_c', {
+        'name': 'Cabang C', 'short': 'Cabang C', 'commission_rate': 0.4, 'operational_cost': {'tempat': 500000},
+    })
+    sheets = {}
+    for year in (2025, 2026):
+        for month, name in constants.MONTHS_ID.items():
+            sheets[f'{name} {year}'] = [header] + [
+                [f'{year}-{month:02d}-03 10:00:00', 'John', 'Potong Rambut', '1250000', 'Cash', branch]
+                for branch in ('Cabang A', 'Cabang B', 'Cabang C')
+            ]
+    report = ReportService(make_sheets_service(make_spreadsheet(sheets))).generate_annual_profit_report(2026)
+
+    parts = split_message(report)
+    assert _message_length(report) > TELEGRAM_MESSAGE_LIMIT
+    assert len(parts) > 1 and all(_message_length(part) <= TELEGRAM_MESSAGE_LIMIT for part in parts)
+    assert ''.join(parts) == report
+    assert split_message('ab\n' + 'x' * 5, limit=4) == ['ab\n', 'xx', 'xxx']
@@ -0,0 +1,48 @@
+"""
+Unit Tests for SheetIngest (raw sheet values to a compact frame)
+"""
+from datetime import datetime
+
+from app.utils.sheet_ingest import QUARANTINE, SheetIngest
+
+HEADER = ['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch', '', '']
+
+
+def test_values_parse_to_typed_columns():
+    """Both date formats parse; short, empty and over-long rows behave like the dict-based parser"""
+    values = [
+        HEADER,
+        ['2026-01-05 10:00:00', 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A'],
+        ['', '', '', '', '', ''],
+        ['2026-01-06', 'Ana', 'Coloring', '50000'],
+        ['2026-01-07 09:30:00', 'Budi', 'Potong Rambut', 'x', 'QRIS', 'Cabang B', '', '', 'extra'],
+    ]
+    df = SheetIngest.to_dataframe(values, 'Januari 2026')
+
+    assert df['Date'].tolist() == [datetime(2026, 1, 5, 10), datetime(2026, 1, 6), datetime(2026, 1, 7, 9, 30)]
+    assert df['Price'].tolist() == [25000, 50000, 0]
+    assert str(df['Price'].dtype) == 'int32'
+    assert df['Payment_Method'].isna().tolist() == [False, True, False]
+    assert '' not in df.columns
+    assert df['Capster_Key'].tolist() == ['john', 'ana', 'budi']
+
+
+def test_bad_dates_are_quarantined_with_sheet_rows():
+    """Unparseable dates are dropped and listed by sheet row; a full re-parse replaces the list"""
+    values = [
+        HEADER,
+        ['2026-02-01 10:00:00', 'John', 'Potong Rambut', '25000', 'Cash', 'Cabang A'],
+        ['01/02/2026', 'Ana', 'Coloring', '50000', 'QRIS', 'Cabang B'],
+        ['kemarin', 'Ana', 'Coloring', '50000', 'QRIS', 'Cabang B'],
+    ]
+    assert len(SheetIngest.to_dataframe(values, 'Februari 2026')) == 1
+    assert QUARANTINE.entries('Februari 2026') == [
+        ('Februari 2026', 3, '01/02/2026'), ('Februari 2026', 4, 'kemarin'),
+    ]
+
+    # Rows appended later are numbered from their position in the sheet
+    SheetIngest.to_dataframe([HEADER, ['??', 'John', 'Cukur', '1', 'Cash', 'Cabang A']], 'Februari 2026', first_row=5)
+    assert [row for _, row, _ in QUARANTINE.entries('Februari 2026')] == [3, 4, 5]
+
+    SheetIngest.to_dataframe(values[:2], 'Februari 2026')
+    assert QUARANTINE.entries('Februari 2026') == []
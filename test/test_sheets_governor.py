@@ -0,0 +1,150 @@
+"""
+Unit Tests for SheetsGovernor (rate limits, retries, priorities)
+"""
+import threading
+import time
+
+import pytest
+from gspread.exceptions import APIError
+
+from app.services.sheets_governor import (
+    GovernedProxy, SheetsGovernor, PRIORITY_BACKGROUND, PRIORITY_TRANSACTION, READ, WRITE,
+    request_priority,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = f"HTTP {status_code}"
+
+    def json(self):
+        return {'error': {'code': self.status_code, 'message': self.text}}
+
+
+def _failing(statuses, headers=None):
+    """A call that raises APIError for each status in turn, then returns 'ok'."""
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= len(statuses):
+            raise APIError(FakeResponse(statuses[len(calls) - 1], headers))
+        return 'ok'
+    return call, calls
+
+
+def test_retry_after_pauses_requests():
+    """A 429 with Retry-After holds the retry back for that long"""
+    governor = SheetsGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=10, max_retries=3)
+    call, calls = _failing([429], {'Retry-After': '0.2'})
+
+    assert governor.execute(READ, call) == 'ok'
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.19
+    assert governor.retries == 1 and governor.throttled == 1
+
+
+def test_backoff_retries_then_gives_up():
+    """Transient errors are retried with jittered backoff; permanent errors are raised at once"""
+    governor = SheetsGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=10,
+                              max_retries=2, base_delay=0.01, max_delay=0.02)
+    call, calls = _failing([503, 500])
+    assert governor.execute(READ, call) == 'ok'
+    assert len(calls) == 3
+
+    call, calls = _failing([503, 503, 503])
+    with pytest.raises(APIError):
+        governor.execute(READ, call)
+    assert len(calls) == 3
+
+    call, calls = _failing([400])
+    with pytest.raises(APIError):
+        governor.execute(WRITE, call)
+    assert len(calls) == 1
+
+    for attempt in range(6):
+        assert 0.01 <= governor.backoff(attempt) <= 0.02
+
+
+def test_appends_retried_only_when_rejected():
+    """A 5xx append may already be applied, so it is not resent; a 429 append is"""
+    governor = SheetsGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=10,
+                              max_retries=2, base_delay=0.01, max_delay=0.02)
+    append_rows, calls = _failing([503])
+    append_rows.__name__ = 'append_rows'
+    with pytest.raises(APIError):
+        governor.execute(WRITE, append_rows)
+    assert len(calls) == 1
+
+    append_rows, calls = _failing([429], {'Retry-After': '0'})
+    append_rows.__name__ = 'append_rows'
+    assert governor.execute(WRITE, append_rows) == 'ok'
+
+    batch_update, calls = _failing([502])
+    batch_update.__name__ = 'batch_update'
+    assert governor.execute(WRITE, batch_update) == 'ok'
+    assert len(calls) == 2
+
+
+def test_token_bucket_limits_rate():
+    """Past the burst, requests wait for tokens at the per-minute rate; reads and writes are separate"""
+    governor = SheetsGovernor(reads_per_minute=600, writes_per_minute=600, burst=2)
+    started = time.monotonic()
+    for _ in range(3):
+        governor.acquire(READ)
+    assert time.monotonic() - started >= 0.09   # third read waited ~0.1s for a token
+
+    started = time.monotonic()
+    governor.acquire(WRITE)
+    assert time.monotonic() - started < 0.05
+
+
+def test_transaction_writes_jump_ahead_of_background_reads():
+    """While a transaction write waits, queued background reads do not start"""
+    governor = SheetsGovernor(reads_per_minute=600, writes_per_minute=600, burst=1)
+    governor.acquire(READ)
+    governor.acquire(WRITE)     # both buckets empty now
+    order = []
+
+    def background_read():
+        with request_priority(PRIORITY_BACKGROUND):
+            governor.acquire(READ)
+            order.append('background')
+
+    def transaction_write():
+        with request_priority(PRIORITY_TRANSACTION):
+            governor.acquire(WRITE)
+            order.append('transaction')
+
+    reader = threading.Thread(target=background_read)
+    reader.start()
+    time.sleep(0.02)
+    writer = threading.Thread(target=transaction_write)
+    writer.start()
+    reader.join(2)
+    writer.join(2)
+
+    assert order == ['transaction', 'background']
+
+
+def test_proxy_routes_calls_through_governor():
+    """Methods of the wrapped object are counted as reads or writes; attributes pass through"""
+
+    class FakeWorksheet:
+        title = 'Januari 2026'
+
+        def get_all_values(self):
+            return [['Date']]
+
+        def append_rows(self, rows):
+            return len(rows)
+
+    governor = SheetsGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=10)
+    worksheet = GovernedProxy(FakeWorksheet(), governor)
+
+    assert worksheet.title == 'Januari 2026'
+    assert worksheet.get_all_values() == [['Date']]
+    assert worksheet.append_rows([[1], [2]]) == 2
+    assert governor.stats()['calls'] == 2
@@ -0,0 +1,55 @@
+"""
+Unit Tests for SliceAggregator (one-pass report breakdowns)
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+from app.utils.slice_aggregator import SliceAggregator
+from app.utils.transaction_schema import TransactionSchema
+
+
+def _frame():
+    rows = [
+        (datetime(2026, 1, 5, 10), 'John', 'Potong Rambut', 25000, 'Cash', 'Cabang A'),
+        (datetime(2026, 1, 5, 11), 'Ana', 'Coloring', 50000, 'QRIS', 'Cabang B'),
+        (datetime(2026, 1, 6, 9), 'John', 'Coloring', 50000, 'QRIS', 'Cabang A'),
+        (datetime(2026, 1, 6, 12), 'Budi', 'Potong Rambut', 25000, 'Cash', 'Cabang A'),
+    ]
+    df = pd.DataFrame(rows, columns=['Date', 'Capster', 'Service', 'Price', 'Payment_Method', 'Branch'])
+    return TransactionSchema.compact(df)
+
+
+def test_summary_matches_groupby():
+    """Every breakdown agrees with a plain groupby on the same slice"""
+    df = _frame()
+    summary = SliceAggregator.summarize(df)
+
+    assert summary.total == 150000
+    assert summary.count == 4
+    assert summary.days == 2
+    for breakdown, column in [(summary.branch, 'Branch'), (summary.capster, 'Capster'),
+                              (summary.service, 'Service'), (summary.payment, 'Payment_Method')]:
+        expected = df.astype({column: str}).groupby(column)['Price'].agg(['sum', 'count'])
+        assert [(label, total, count) for label, total, count, _ in breakdown.rows()] == \
+            [(label, row['sum'], row['count']) for label, row in expected.iterrows()]
+
+    assert [row[:3] for row in summary.capster.rows('sum')] == [
+        ('John', 75000, 2), ('Ana', 50000, 1), ('Budi', 25000, 1),
+    ]
+    assert summary.branch.sum_of('Cabang A') == 100000
+    assert summary.branch.sum_of('Cabang C') == 0
+    assert [row[3] for row in summary.payment.rows()] == [1 / 3, 2 / 3]
+
+
+def test_daily_capster_and_unobserved_categories():
+    """Per-day capster totals come from the same pass; categories absent from a slice are skipped"""
+    df = _frame()
+    summary = SliceAggregator.summarize(df[df['Date'] >= datetime(2026, 1, 6)])
+
+    assert [row[:3] for row in summary.daily.rows()] == [(date(2026, 1, 6), 75000, 2)]
+    assert [row[:3] for row in summary.daily_capster[date(2026, 1, 6)].rows('sum')] == [
+        ('John', 50000, 1), ('Budi', 25000, 1),
+    ]
+    assert 'Ana' not in summary.capster.labels
+    assert SliceAggregator.summarize(df.iloc[0:0]).count == 0
@@ -0,0 +1,33 @@
+"""
+Unit Tests for SummaryStore (per-month summaries for period comparisons)
+"""
+from app.services.cache_service import TransactionCache
+from app.services.report_service import ReportService
+from app.services.summary_service import SummaryStore
+
+
+def test_monthly_report_compares_with_stored_summaries(header, row, make_spreadsheet, make_sheets_service,
+                                                       make_mirror, tmp_path):
+    """Previous month and same month last year come from the summary store, persisted once closed"""
+    spreadsheet = make_spreadsheet({
+        'Februari 2025': [header, ['2025-02-03 10:00:00', 'John', 'Potong Rambut', '40000', 'Cash', 'Cabang A']],
+        'Januari 2026': [header, row(1, price=100000), row(2, price=100000)],
+        'Februari 2026': [header, ['2026-02-01 10:00:00', 'John', 'Potong Rambut', '50000', 'Cash', 'Cabang A'],
+                          ['2026-02-02 10:00:00', 'Ana', 'Coloring', '100000', 'QRIS', 'Cabang B']],
+    })
+    cache = TransactionCache(make_mirror(spreadsheet))
+    store = SummaryStore(cache, db_path=str(tmp_path / 'summaries.db'))
+    reports = ReportService(make_sheets_service(spreadsheet), cache=cache, summaries=store)
+    report = reports.generate_monthly_report(2026, 2)
+
+    assert 'vs Bulan Lalu (Januari 2026)' in report
+    assert 'Pendapatan: Rp 200,000 → Rp 150,000 (-25.0%)' in report
+    assert 'Transaksi: 2 → 2 (+0.0%)' in report
+    assert '🏢 Cabang B: Rp 0 → Rp 100,000' in report
+    assert 'vs Tahun Lalu (Februari 2025)' in report
+    assert '✂️ John: Rp 40,000 → Rp 50,000 (+25.0%)' in report
+
+    # Closed months are read back from disk without touching the cube
+    cache.get_rollup = lambda months: (_ for _ in ()).throw(AssertionError(months))
+    reloaded = SummaryStore(cache, db_path=str(tmp_path / 'summaries.db')).get(2026, 1)
+    assert (reloaded.total, reloaded.count, reloaded.capster) == (200000, 2, {'John': (200000, 2)})
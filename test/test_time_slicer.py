@@ -0,0 +1,37 @@
+"""
+Unit Tests for TimeSlicer (binary-search date filtering)
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from app.utils.time_slicer import TimeSlicer
+
+
+def _frame():
+    dates = [
+        datetime(2026, 2, 1, 9), datetime(2026, 1, 31, 23, 59), datetime(2026, 1, 5, 10),
+        datetime(2026, 2, 1, 0, 0), datetime(2026, 3, 1, 0, 0), datetime(2026, 1, 5, 18),
+    ]
+    return pd.DataFrame({'Date': dates, 'Price': range(len(dates))})
+
+
+def test_index_by_date_sorts_once():
+    """The frame is sorted on a DatetimeIndex; an indexed frame is returned as is"""
+    df = TimeSlicer.index_by_date(_frame())
+    assert isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing
+    assert df['Price'].tolist() == [2, 5, 1, 3, 0, 4]
+    assert TimeSlicer.index_by_date(df) is df
+    assert TimeSlicer.index_by_date(pd.DataFrame()).empty
+
+
+def test_slices_match_calendar_bounds():
+    """Days and months are half-open; between includes both ends"""
+    df = _frame()
+    assert TimeSlicer.day(df, datetime(2026, 1, 5, 15))['Price'].tolist() == [2, 5]
+    assert TimeSlicer.month(df, 2026, 1)['Price'].tolist() == [2, 5, 1]
+    assert TimeSlicer.month(df, 2026, 2)['Price'].tolist() == [3, 0]
+    assert TimeSlicer.between(df, datetime(2026, 1, 31, 23, 59), datetime(2026, 2, 1))['Price'].tolist() == [1, 3]
+    assert TimeSlicer.since(df, datetime(2026, 2, 1, 9))['Price'].tolist() == [0, 4]
+    assert TimeSlicer.dates(df, [datetime(2026, 3, 1), datetime(2026, 1, 5, 23)])['Price'].tolist() == [2, 5, 4]
+    assert TimeSlicer.dates(df, []).empty
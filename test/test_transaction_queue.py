@@ -0,0 +1,95 @@
+"""
+Unit Tests for TransactionQueue (write-behind journal)
+"""
+import json
+from datetime import datetime
+
+from app.models.transaction import Transaction
+from app.services.sheets_service import SheetsService
+from app.services.transaction_queue import TransactionQueue
+
+
+class FakeSheets:
+    """Records append_transaction_rows calls instead of hitting Google Sheets."""
+
+    transaction_to_row = staticmethod(SheetsService.transaction_to_row)
+    _get_monthly_worksheet_name = SheetsService._get_monthly_worksheet_name
+
+    def __init__(self, fail_sheets=(), lost_responses=()):
+        self.calls = []
+        self.rows = {}
+        self.id_reads = 0
+        self.fail_sheets = set(fail_sheets)
+        # Sheets whose append is applied but reported as failed (e.g. a 5xx after the write)
+        self.lost_responses = set(lost_responses)
+
+    def append_transaction_rows(self, sheet_name, rows):
+        if sheet_name in self.fail_sheets:
+            return False
+        self.calls.append((sheet_name, rows))
+        self.rows.setdefault(sheet_name, []).extend(rows)
+        return sheet_name not in self.lost_responses
+
+    def get_entry_ids(self, sheet_name):
+        self.id_reads += 1
+        return {row[-1] for row in self.rows.get(sheet_name, [])}
+
+
+def _trans(month, day=1):
+    return Transaction(capster="John", service="Potong Rambut", price=25000,
+                       branch="Cabang A", date=datetime(2026, month, day, 10, 0, 0))
+
+
+def test_flush_groups_rows_per_sheet(tmp_path):
+    """One append_rows call per monthly sheet, journal emptied after flush"""
+    sheets = FakeSheets()
+    queue = TransactionQueue(sheets, journal_path=str(tmp_path / "journal.jsonl"))
+    for day in (1, 2, 3):
+        assert queue.enqueue(_trans(1, day))
+    assert queue.enqueue(_trans(2))
+
+    assert queue.flush() == 4
+    assert [(name, len(rows)) for name, rows in sheets.calls] == [("Januari 2026", 3), ("Februari 2026", 1)]
+    assert queue.pending_count() == 0
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+
+
+def test_unflushed_rows_are_replayed(tmp_path):
+    """Rows whose sheet write failed survive a restart"""
+    journal = str(tmp_path / "journal.jsonl")
+    queue = TransactionQueue(FakeSheets(fail_sheets={"Februari 2026"}), journal_path=journal)
+    queue.enqueue(_trans(1))
+    queue.enqueue(_trans(2))
+    assert queue.flush() == 1
+
+    sheets = FakeSheets()
+    restarted = TransactionQueue(sheets, journal_path=journal)
+    assert restarted.pending_count() == 1
+    assert restarted.flush() == 1
+    assert sheets.calls[0][0] == "Februari 2026"
+
+
+def test_replay_does_not_duplicate_rows(tmp_path):
+    """A write that got through but was reported failed is not appended again"""
+    journal = str(tmp_path / "journal.jsonl")
+    sheets = FakeSheets(lost_responses={"Januari 2026"})
+    queue = TransactionQueue(sheets, journal_path=journal)
+    queue.enqueue(_trans(1))
+    queue.enqueue(_trans(2))
+    assert queue.flush() == 1
+    assert sheets.id_reads == 0   # first attempts are not checked
+
+    sheets.lost_responses.clear()
+    queue.enqueue(_trans(1, 2))
+    assert queue.flush() == 2
+    assert [len(rows) for name, rows in sheets.calls] == [1, 1, 1]
+    assert len(sheets.rows["Januari 2026"]) == 2
+
+    # Crash after the append, before the journal was trimmed: the restart checks the sheet first
+    with open(journal, "w") as f:
+        for row in sheets.rows["Januari 2026"]:
+            f.write(json.dumps({"id": row[-1], "sheet": "Januari 2026", "row": row[:-1]}) + "\n")
+    restarted = TransactionQueue(sheets, journal_path=journal)
+    assert restarted.flush() == 2
+    assert len(sheets.rows["Januari 2026"]) == 2
+    assert restarted.pending_count() == 0
@@ -0,0 +1,37 @@
+"""
+Unit Tests for WarmupService (startup cache and report warm-up)
+"""
+from datetime import datetime
+
+from app.models.capster import Capster
+from app.services.mirror_service import MirrorService
+from app.services.query_parser_service import QueryParserService
+from app.services.report_service import ReportService
+from app.services.warmup_service import WarmupService
+
+
+def test_warmup_fills_partitions_and_rendered_reports(header, make_spreadsheet, make_sheets_service):
+    """After a warm-up the day's first reports are render-cache hits and the parser knows all capsters"""
+    now = datetime.now()
+    current = MirrorService._sheet_name(now.year, now.month)
+    spreadsheet = make_spreadsheet({current: [header, [now.strftime('%Y-%m-01 10:00:00'), 'Budi', 'Potong Rambut',
+                                                      '25000', 'Cash', 'Cabang A']]})
+    reports = ReportService(make_sheets_service(spreadsheet))
+
+    class FakeCapsters:
+        def get_all_capsters(self):
+            return [Capster(name='Zidan', telegram_id=1, alias='timingemma')]
+
+        def get_name_alias_map(self, capsters):
+            return {'zidan': ['zidan', 'timingemma'], 'timingemma': ['zidan', 'timingemma']}
+
+    parser = QueryParserService(capster_list=[])
+    timings = WarmupService(reports, capster_service=FakeCapsters(), query_parser=parser).warm()
+
+    assert set(timings) == {'partitions', 'capsters', 'reports'}
+    assert (now.year, now.month) in reports.cache._partitions
+    assert parser._capster_list == ['Budi', 'Zidan', 'timingemma']
+    hits = reports.rendered.stats()['hits']
+    reports.generate_monthly_report()
+    reports.generate_monthly_profit_report()
+    assert reports.rendered.stats()['hits'] == hits + 2